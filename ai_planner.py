@@ -0,0 +1,192 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from tile_map import TileMap
+from pathfinding import PathFinder
+
+# Per-process state of a planning worker, set up once by init_worker
+worker_state = {}
+
+
+def init_worker(shm_name, cols, rows, tile_size):
+    """Attach a worker process to the shared map snapshot"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    cells = cols * rows
+    tile_map = TileMap(cols * tile_size, rows * tile_size, tile_size, shm.buf[:cells])
+    worker_state['shm'] = shm
+    worker_state['pathfinder'] = PathFinder(tile_map)
+    worker_state['occupancy'] = np.ndarray((rows, cols), dtype=np.uint8,
+                                           buffer=shm.buf, offset=cells)
+
+
+def plan_paths(requests):
+    """Plan a batch of (start, goal, avoid_tanks) requests in a worker
+
+    Returns one path (or None) per request.
+    """
+    pathfinder = worker_state['pathfinder']
+    occupied = None
+    paths = []
+    for start, goal, avoid_tanks in requests:
+        avoid = ()
+        if avoid_tanks:
+            if occupied is None:
+                tile_ys, tile_xs = np.nonzero(worker_state['occupancy'])
+                occupied = set(zip(tile_xs.tolist(), tile_ys.tolist()))
+            avoid = occupied - {start, goal}
+        paths.append(pathfinder.find_path(start, goal, avoid))
+    return paths
+
+
+class PlanningPool:
+    """Plans A* paths for AI tanks in a process pool
+
+    The wall grid and a grid of tiles occupied by tanks are copied into one
+    shared memory block that workers attach to once, so requests only carry
+    tile coordinates. Requests queued during a frame are sent as one batch
+    per worker and their paths are collected on a later frame. Results carry
+    the wall epoch they were requested for; callers drop them if the walls
+    changed meanwhile. If the pool cannot start or breaks, available turns
+    False and callers plan in-process again.
+    """
+
+    def __init__(self, tile_map, workers=0):
+        self.tile_map = tile_map
+        self.cells = tile_map.cols * tile_map.rows
+        self.workers = workers or os.cpu_count() or 1
+        self.shm = None
+        self.snapshot_tiles = None
+        self.occupancy = None
+        self.executor = None
+        self.available = False
+        self.snapshot_epoch = None
+
+        self.queued = []  # (tank, start, goal, epoch, avoid_tanks)
+        self.in_flight = []  # (future, requests)
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'batches': 0,
+            'dropped': 0
+        }
+
+        try:
+            self.shm = shared_memory.SharedMemory(create=True, size=2 * self.cells)
+            self.snapshot_tiles = np.ndarray((self.cells,), dtype=np.uint8, buffer=self.shm.buf)
+            self.occupancy = np.ndarray((tile_map.rows, tile_map.cols), dtype=np.uint8,
+                                        buffer=self.shm.buf, offset=self.cells)
+            self.executor = ProcessPoolExecutor(
+                self.workers, initializer=init_worker,
+                initargs=(self.shm.name, tile_map.cols, tile_map.rows, tile_map.tile_size))
+            self.available = True
+        except (OSError, ImportError, NotImplementedError, ValueError) as e:
+            print(f"AI planning pool unavailable, planning in-process: {e}")
+            self.close()
+
+    def submit(self, tank, start, goal, avoid_tanks=False):
+        """Queue a path request, sent to the workers by flush"""
+        self.queued.append((tank, start, goal, self.tile_map.epoch, avoid_tanks))
+
+    def sync_snapshot(self, tanks):
+        """Copy walls (when changed) and tank positions into shared memory"""
+        if self.snapshot_epoch != self.tile_map.epoch:
+            self.snapshot_tiles[:] = self.tile_map.grid.ravel()
+            self.snapshot_epoch = self.tile_map.epoch
+
+        self.occupancy.fill(0)
+        tile_size = self.tile_map.tile_size
+        for tank in tanks:
+            if tank.is_alive:
+                tile_x = int((tank.x + tank.size // 2) // tile_size)
+                tile_y = int((tank.y + tank.size // 2) // tile_size)
+                if 0 <= tile_x < self.tile_map.cols and 0 <= tile_y < self.tile_map.rows:
+                    self.occupancy[tile_y, tile_x] = 1
+
+    def flush(self, tanks):
+        """Send queued requests to the workers, one batch per worker"""
+        if not self.queued or not self.available:
+            return
+
+        self.sync_snapshot(tanks)
+        requests = self.queued
+        self.queued = []
+        batch_size = -(-len(requests) // self.workers)
+        for index in range(0, len(requests), batch_size):
+            batch = requests[index:index + batch_size]
+            try:
+                future = self.executor.submit(
+                    plan_paths, [(start, goal, avoid_tanks)
+                                 for _, start, goal, _, avoid_tanks in batch])
+            except RuntimeError as e:
+                # Broken or shut down pool, hand the requests back
+                print(f"AI planning pool failed, planning in-process: {e}")
+                self.available = False
+                self.queued.extend(batch)
+                continue
+            self.in_flight.append((future, batch))
+            self.stats['batches'] += 1
+        self.stats['submitted'] += len(requests)
+
+    def collect(self):
+        """Collect finished batches
+
+        Returns (completed, dropped): completed holds
+        (tank, start, goal, epoch, avoid_tanks, path) tuples, dropped the
+        tanks whose requests were lost because the pool stopped working.
+        """
+        completed = []
+        dropped = []
+        still_running = []
+        for future, batch in self.in_flight:
+            if not self.available:
+                dropped.extend(request[0] for request in batch)
+                continue
+            if not future.done():
+                still_running.append((future, batch))
+                continue
+            try:
+                paths = future.result()
+            except Exception as e:
+                print(f"AI planning pool failed, planning in-process: {e}")
+                self.available = False
+                dropped.extend(request[0] for request in batch)
+                continue
+            completed.extend(request + (path,) for request, path in zip(batch, paths))
+        self.in_flight = still_running
+
+        if not self.available:
+            dropped.extend(request[0] for request in self.queued)
+            self.queued = []
+        self.stats['completed'] += len(completed)
+        self.stats['dropped'] += len(dropped)
+        return completed, dropped
+
+    def cancel(self):
+        """Forget queued and running requests"""
+        for future, _ in self.in_flight:
+            future.cancel()
+        self.queued = []
+        self.in_flight = []
+
+    def get_stats(self):
+        """Get planning pool counters"""
+        stats = dict(self.stats)
+        stats['workers'] = self.workers if self.available else 0
+        stats['pending'] = len(self.queued) + sum(len(batch) for _, batch in self.in_flight)
+        return stats
+
+    def close(self):
+        """Stop the workers and release the shared memory"""
+        self.available = False
+        self.cancel()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+        if self.shm is not None:
+            # Views must be released before the block can be closed
+            self.snapshot_tiles = None
+            self.occupancy = None
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
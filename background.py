@@ -0,0 +1,59 @@
+import pygame
+from game_objects import *
+
+
+class Background:
+    """Walls and base pre-rendered onto one surface
+
+    The surface is only redrawn when the wall layout is rebuilt (the tile
+    map's generation changes) or the base is replaced. Destroyed walls are
+    patched one tile at a time from the tile map's removed_tiles list.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert()
+        self.generation = None
+        self.removed_count = 0
+        self.base = None
+        self.stats = {
+            'redraws': 0,
+            'patched_tiles': 0
+        }
+
+    def redraw(self):
+        """Draw all walls and the base"""
+        self.surface.fill(BLACK)
+        for wall in self.game.walls:
+            wall.draw(self.surface)
+        if self.game.base:
+            self.game.base.draw(self.surface)
+
+        tile_map = self.game.tile_map
+        self.generation = tile_map.generation
+        self.removed_count = len(tile_map.removed_tiles)
+        self.base = self.game.base
+        self.stats['redraws'] += 1
+
+    def update(self, changed):
+        """Catch up with wall changes
+
+        Appends the rects of patched tiles to changed. Returns True if the
+        whole surface was redrawn.
+        """
+        tile_map = self.game.tile_map
+        if self.generation != tile_map.generation or self.base is not self.game.base:
+            self.redraw()
+            return True
+
+        size = tile_map.tile_size
+        while self.removed_count < len(tile_map.removed_tiles):
+            tile_x, tile_y = tile_map.removed_tiles[self.removed_count]
+            rect = pygame.Rect(tile_x * size, tile_y * size, size, size)
+            self.surface.fill(BLACK, rect)
+            changed.append(rect)
+            self.removed_count += 1
+            self.stats['patched_tiles'] += 1
+        return False
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Play headless bot-vs-AI matches in a process pool for difficulty sweeps
+Runs without a display window
+
+Every combination of the --set values is played --matches times; the n-th
+match of each combination uses seed + n, so all combinations are compared
+on the same maps. Results are streamed to a JSONL or CSV file (chosen by
+the file extension) as matches finish.
+
+Usage: python batch_runner.py [--matches N] [--workers N] [--seed N]
+                              [--max-steps N] [--output FILE]
+                              [--set KEY=VALUE[,VALUE...]]...
+
+Example:
+    python batch_runner.py --matches 20 --output sweep.csv \\
+        --set enemy_settings.normal_tank.attack_chance=0.1,0.2,0.4 \\
+        --set enemy_settings.normal_tank.vision_range=80,120
+"""
+
+import os
+import sys
+import csv
+import copy
+import json
+import time
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from game_objects import *
+from vision_ai import AIState
+from config_manager import config
+from simulation import Simulation
+
+# Config as loaded from config.json, restored before every match
+BASE_CONFIG = copy.deepcopy(config.config)
+
+SHOOT_RANGE = 300
+# Settings that change the speed of the whole game rather than its
+# difficulty (speeds and AI timers count steps), so they are not swept
+FIXED_SETTINGS = ('game_settings.tick_rate',)
+RESULT_FIELDS = ['match_id', 'seed', 'winner', 'steps', 'seconds',
+                 'player_shots', 'player_hits', 'enemy_shots', 'enemy_hits', 'wall_ms']
+
+
+class PlayerBot:
+    """Scripted player that hunts the nearest enemy tank
+
+    Shoots when an enemy is lined up with the barrel and its own base is
+    not in the line of fire, otherwise follows an A* path towards it with
+    the same movement code as the AI tanks.
+    """
+
+    def __init__(self, sim):
+        self.sim = sim
+        self.ai = sim.controller.ai_system
+        self.state = AIState(None, 0)
+
+    def update(self):
+        """Move or shoot for one step"""
+        player = self.sim.controller.get_player_tank()
+        if player is None or not player.is_alive:
+            return
+
+        enemies = [tank for tank in self.sim.tanks if tank.team != player.team and tank.is_alive]
+        if not enemies:
+            return
+        target = min(enemies, key=lambda tank: abs(tank.x - player.x) + abs(tank.y - player.y))
+
+        dx = target.x - player.x
+        dy = target.y - player.y
+        half = player.size // 2
+        if abs(dx) < half and abs(dy) < SHOOT_RANGE and not self.is_base_in_line(player, target):
+            player.direction = Direction.DOWN if dy > 0 else Direction.UP
+        elif abs(dy) < half and abs(dx) < SHOOT_RANGE and not self.is_base_in_line(player, target):
+            player.direction = Direction.RIGHT if dx > 0 else Direction.LEFT
+        else:
+            if self.ai.move_along_path(player, self.state, target.x, target.y) == 'no_path':
+                self.ai.move_towards(player, target.x, target.y)
+            return
+
+        bullet = player.shoot(self.sim.get_ticks())
+        if bullet:
+            self.sim.bullets.append(bullet)
+
+    def is_base_in_line(self, player, target):
+        """Check if the own base is between the player and a lined-up target"""
+        base = self.sim.base
+        if base is None:
+            return False
+        # The lane the bullet flies through, spanning both tanks
+        return player.rect.union(target.rect).colliderect(base.rect)
+
+
+def apply_overrides(overrides):
+    """Reset the config and apply dotted-key overrides
+
+    The key 'difficulty' applies a difficulty level from difficulty_levels.
+    """
+    config.config = copy.deepcopy(BASE_CONFIG)
+    for key, value in overrides.items():
+        if key == 'difficulty':
+            config.set_difficulty(value)
+        else:
+            config.set(key, value)
+
+
+def play_match(match_id, seed, overrides, max_steps):
+    """Play one match until it is over or max_steps ran out
+
+    Returns a flat result dict with the overrides as extra fields.
+    """
+    apply_overrides(overrides)
+    start = time.perf_counter()
+    sim = Simulation(seed)
+    sim.start()
+    bot = PlayerBot(sim)
+    while not sim.game_over and sim.frame < max_steps:
+        bot.update()
+        sim.step()
+    sim.close()
+
+    result = {'match_id': match_id, 'seed': seed}
+    result.update(overrides)
+    result.update({
+        'winner': sim.winner or 'timeout',
+        'steps': sim.frame,
+        'seconds': round(sim.get_ticks() / 1000, 2),
+        'player_shots': sim.bullets.shots.get('player', 0),
+        'player_hits': sim.hits.get('player', 0),
+        'enemy_shots': sim.bullets.shots.get('enemy', 0),
+        'enemy_hits': sim.hits.get('enemy', 0),
+        'wall_ms': round((time.perf_counter() - start) * 1000, 1)
+    })
+    return result
+
+
+def parse_value(text):
+    """Parse a --set value as JSON, falling back to a plain string"""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def parse_grid(settings):
+    """Parse KEY=VALUE[,VALUE...] strings into {key: [values]}"""
+    grid = {}
+    for setting in settings:
+        key, sep, values = setting.partition('=')
+        if not sep or not key:
+            raise ValueError(f"Expected KEY=VALUE[,VALUE...], got {setting!r}")
+        if key in FIXED_SETTINGS:
+            raise ValueError(f"{key} changes the game speed and cannot be swept")
+        grid[key] = [parse_value(value) for value in values.split(',')]
+    return grid
+
+
+def build_matches(grid, matches, seed=0):
+    """Get (match_id, seed, overrides) for every grid combination and repeat"""
+    keys = list(grid)
+    jobs = []
+    for values in itertools.product(*(grid[key] for key in keys)):
+        overrides = dict(zip(keys, values))
+        for repeat in range(matches):
+            jobs.append((len(jobs), seed + repeat, overrides))
+    return jobs
+
+
+class ResultWriter:
+    """Streams result dicts to a JSONL or CSV file, flushing every line"""
+
+    def __init__(self, path, fields):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.csv_writer = None
+        if path.endswith('.csv'):
+            self.csv_writer = csv.DictWriter(self.file, fields)
+            self.csv_writer.writeheader()
+
+    def write(self, result):
+        """Write one result"""
+        if self.csv_writer:
+            self.csv_writer.writerow(result)
+        else:
+            self.file.write(json.dumps(result) + '\n')
+        self.file.flush()
+
+    def close(self):
+        """Close the file"""
+        self.file.close()
+
+
+def run_batch(grid, matches, output, workers=0, seed=0, max_steps=3 * 60 * 60):
+    """Play all matches in a process pool, returns the results in finish order"""
+    jobs = build_matches(grid, matches, seed)
+    writer = ResultWriter(output, RESULT_FIELDS[:2] + list(grid) + RESULT_FIELDS[2:])
+    results = []
+    try:
+        with ProcessPoolExecutor(workers or os.cpu_count() or 1) as executor:
+            futures = [executor.submit(play_match, match_id, match_seed, overrides, max_steps)
+                       for match_id, match_seed, overrides in jobs]
+            for future in as_completed(futures):
+                result = future.result()
+                writer.write(result)
+                results.append(result)
+    finally:
+        writer.close()
+    return results
+
+
+def summarize(results, keys):
+    """Get player win rate, mean duration and hit rates per grid combination"""
+    groups = {}
+    for result in results:
+        groups.setdefault(tuple(result[key] for key in keys), []).append(result)
+
+    summary = []
+    for values, group in sorted(groups.items(), key=lambda item: repr(item[0])):
+        shots = sum(result['player_shots'] for result in group)
+        enemy_shots = sum(result['enemy_shots'] for result in group)
+        summary.append({
+            'overrides': dict(zip(keys, values)),
+            'matches': len(group),
+            'player_win_rate': sum(result['winner'] == 'player' for result in group) / len(group),
+            'mean_seconds': sum(result['seconds'] for result in group) / len(group),
+            'player_accuracy': sum(result['player_hits'] for result in group) / shots if shots else 0.0,
+            'enemy_accuracy': sum(result['enemy_hits'] for result in group) / enemy_shots if enemy_shots else 0.0
+        })
+    return summary
+
+
+def main():
+    """Main batch runner function"""
+    parser = argparse.ArgumentParser(description="Play headless bot-vs-AI matches")
+    parser.add_argument('--matches', type=int, default=10, help="matches per setting combination")
+    parser.add_argument('--workers', type=int, default=0, help="worker processes (0: all cores)")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first match")
+    parser.add_argument('--max-steps', type=int, default=3 * 60 * 60,
+                        help="steps before a match ends as a timeout")
+    parser.add_argument('--output', default='results.jsonl', help="result file (.jsonl or .csv)")
+    parser.add_argument('--set', action='append', default=[], dest='settings',
+                        metavar='KEY=VALUE[,VALUE...]', help="config override to sweep")
+    args = parser.parse_args()
+
+    try:
+        grid = parse_grid(args.settings)
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    results = run_batch(grid, args.matches, args.output, args.workers, args.seed, args.max_steps)
+    elapsed = time.perf_counter() - start
+    steps = sum(result['steps'] for result in results)
+    print(f"{len(results)} matches, {steps} steps in {elapsed:.1f}s "
+          f"({steps / elapsed:.0f} steps/s), results in {args.output}")
+
+    for row in summarize(results, list(grid)):
+        print(f"{json.dumps(row['overrides'])}: {row['matches']} matches, "
+              f"player wins {row['player_win_rate']:.0%}, "
+              f"mean {row['mean_seconds']:.1f}s, "
+              f"accuracy {row['player_accuracy']:.0%} vs {row['enemy_accuracy']:.0%}")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark AI frame times with in-process and process pool planning
+Runs without a display window
+
+Usage: python benchmark_ai.py [frames]
+"""
+
+import os
+import sys
+import time
+import random
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from types import SimpleNamespace
+from game_objects import *
+from tile_map import TileMap
+from spatial_grid import SpatialGrid
+from game_controller import GameController
+from ai_planner import PlanningPool
+
+ENEMY_COUNTS = (20, 100, 500)
+
+def make_game(enemy_count, seed=1):
+    """Create a headless game with random walls and enemy tanks
+
+    Tanks are placed on random free tiles; with many enemies several
+    tanks share a tile, which keeps them blocked and replanning.
+    """
+    rng = random.Random(seed)
+    tile_map = TileMap()
+    walls = []
+    for tile_y in range(1, tile_map.rows - 1):
+        for tile_x in range(tile_map.cols):
+            if rng.random() < 0.2:
+                wall_type = WallType.METAL if rng.random() < 0.3 else WallType.SOIL
+                walls.append(Wall(tile_x * WALL_SIZE, tile_y * WALL_SIZE, wall_type))
+    tile_map.rebuild(walls)
+    free_tiles = [(tile_x, tile_y) for tile_y in range(tile_map.rows)
+                  for tile_x in range(tile_map.cols) if not tile_map.is_blocked(tile_x, tile_y)]
+
+    player_x, player_y = free_tiles[-1]
+    tanks = [Tank(player_x * WALL_SIZE, player_y * WALL_SIZE, TankType.PLAYER, (255, 0, 0), Direction.UP)]
+    for _ in range(enemy_count):
+        tile_x, tile_y = rng.choice(free_tiles)
+        tanks.append(Tank(tile_x * WALL_SIZE, tile_y * WALL_SIZE, TankType.ENEMY_NORMAL,
+                          (0, 0, 255), rng.choice(list(Direction))))
+
+    game = SimpleNamespace(walls=tile_map.walls, tanks=tanks, bullets=[], base=None,
+                           game_over=False, winner=None, tile_map=tile_map)
+    game.spatial_grid = SpatialGrid(tile_map)
+    game.spatial_grid.rebuild(tanks)
+    game.controller = GameController(game)
+    return game
+
+def run_benchmark(enemy_count, mode, frames):
+    """Run AI and vision updates, returns frame time statistics in ms"""
+    random.seed(enemy_count)
+    game = make_game(enemy_count)
+    ai = game.controller.ai_system
+    if mode == 'process':
+        ai.planner = PlanningPool(game.tile_map)
+        if not ai.planner.available:
+            return None
+
+    frame_times = []
+    try:
+        for _ in range(frames):
+            frame_start = time.perf_counter()
+            game.controller.vision_system.update_vision(ai.get_attacking_tanks())
+            ai.update_ai()
+            game.bullets.clear()
+            frame_times.append((time.perf_counter() - frame_start) * 1000)
+    finally:
+        ai.close()
+
+    frame_times.sort()
+    return {
+        'mean': sum(frame_times) / len(frame_times),
+        'p95': frame_times[int(len(frame_times) * 0.95)],
+        'max': frame_times[-1]
+    }
+
+def main():
+    """Main benchmark function"""
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    pygame.init()
+
+    print(f"AI frame times over {frames} frames (ms)")
+    print(f"{'enemies':>8} {'mode':>8} {'mean':>8} {'p95':>8} {'max':>8}")
+    for enemy_count in ENEMY_COUNTS:
+        for mode in ('inline', 'process'):
+            result = run_benchmark(enemy_count, mode, frames)
+            if result is None:
+                print(f"{enemy_count:>8} {mode:>8}  process pool unavailable")
+                continue
+            print(f"{enemy_count:>8} {mode:>8} {result['mean']:>8.2f} "
+                  f"{result['p95']:>8.2f} {result['max']:>8.2f}")
+
+    pygame.quit()
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark collision and removal frame time against bullet count
+Compares the old list handling (iterating list copies and calling
+list.remove inside the loop) with entity lists (iterating in place,
+kill() inside the loop and one compact() per frame). Both use the same
+Bullet objects and collision tests, so only the containers differ
+Runs without a display window
+
+Usage: python benchmark_entities.py [frames]
+"""
+
+import os
+import sys
+import time
+import random
+from types import SimpleNamespace
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from game_objects import *
+from entity_list import EntityList
+
+BULLET_COUNTS = (100, 1000, 5000)
+TANK_COUNT = 20
+
+def make_level(game, seed):
+    """Fill a game with random walls and enemy tanks"""
+    rng = random.Random(seed)
+    for _ in range(80):
+        wall_type = WallType.SOIL if rng.random() < 0.8 else WallType.METAL
+        game.walls.append(Wall(rng.randint(0, 19) * WALL_SIZE, rng.randint(0, 14) * WALL_SIZE, wall_type))
+    for _ in range(TANK_COUNT):
+        game.tanks.append(Tank(rng.randint(0, 760), rng.randint(0, 560), TankType.ENEMY_NORMAL,
+                               (0, 0, 255), rng.choice(list(Direction))))
+
+def new_bullet(rng, owner):
+    """Create a bullet at a random position"""
+    return Bullet(rng.randint(0, 792), rng.randint(0, 592), rng.choice(list(Direction)), owner)
+
+def run_lists(bullet_count, frames):
+    """Old handling: plain lists, copies while iterating and list.remove"""
+    rng = random.Random(bullet_count)
+    walls = []
+    tanks = []
+    make_level(SimpleNamespace(walls=walls, tanks=tanks), 1)
+    owner = Tank(0, 0, TankType.PLAYER, (255, 0, 0))
+    bullets = [new_bullet(rng, owner) for _ in range(bullet_count)]
+
+    frame_times = []
+    for _ in range(frames):
+        frame_start = time.perf_counter()
+        for bullet in bullets[:]:
+            bullet.update()
+            if bullet.is_off_screen():
+                bullets.remove(bullet)
+        for bullet in bullets[:]:
+            for wall in walls[:]:
+                if bullet.rect.colliderect(wall.rect):
+                    if wall.wall_type == WallType.SOIL:
+                        walls.remove(wall)
+                    if bullet in bullets:
+                        bullets.remove(bullet)
+                    break
+        for bullet in bullets[:]:
+            for tank in tanks[:]:
+                if bullet.rect.colliderect(tank.rect):
+                    if bullet in bullets:
+                        bullets.remove(bullet)
+                    break
+        frame_times.append((time.perf_counter() - frame_start) * 1000)
+        bullets.extend(new_bullet(rng, owner) for _ in range(bullet_count - len(bullets)))
+    return sum(frame_times) / len(frame_times)
+
+def run_entity_lists(bullet_count, frames):
+    """Current handling: entity lists, kill() while iterating, compact() once"""
+    rng = random.Random(bullet_count)
+    walls = EntityList()
+    tanks = EntityList()
+    make_level(SimpleNamespace(walls=walls, tanks=tanks), 1)
+    owner = Tank(0, 0, TankType.PLAYER, (255, 0, 0))
+    bullets = EntityList(new_bullet(rng, owner) for _ in range(bullet_count))
+
+    frame_times = []
+    for _ in range(frames):
+        frame_start = time.perf_counter()
+        for bullet in bullets:
+            bullet.update()
+            if bullet.is_off_screen():
+                bullets.kill(bullet)
+        for bullet in bullets:
+            if bullets.is_dead(bullet):
+                continue
+            for wall in walls:
+                if bullet.rect.colliderect(wall.rect) and not walls.is_dead(wall):
+                    if wall.wall_type == WallType.SOIL:
+                        walls.kill(wall)
+                    bullets.kill(bullet)
+                    break
+        for bullet in bullets:
+            if bullets.is_dead(bullet):
+                continue
+            for tank in tanks:
+                if bullet.rect.colliderect(tank.rect):
+                    bullets.kill(bullet)
+                    break
+        walls.compact()
+        bullets.compact()
+        frame_times.append((time.perf_counter() - frame_start) * 1000)
+        for _ in range(bullet_count - len(bullets)):
+            bullets.append(new_bullet(rng, owner))
+    return sum(frame_times) / len(frame_times)
+
+def main():
+    """Main benchmark function"""
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    pygame.init()
+
+    print(f"Mean collision and removal time over {frames} frames (ms)")
+    print(f"{'bullets':>8} {'lists':>10} {'entity lists':>14}")
+    for bullet_count in BULLET_COUNTS:
+        before = run_lists(bullet_count, frames)
+        after = run_entity_lists(bullet_count, frames)
+        print(f"{bullet_count:>8} {before:>10.2f} {after:>14.2f}")
+
+    pygame.quit()
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
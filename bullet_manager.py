@@ -0,0 +1,241 @@
+import numpy as np
+from game_objects import *
+from tile_map import IS_WALL, BASE
+
+# Unit steps of each direction, indexed by Direction.value
+DIRECTION_STEPS = np.array([(0, -1), (1, 0), (0, 1), (-1, 0)], dtype=np.float64)
+
+
+class BulletPool:
+    """Bounded free list of pre-allocated Bullet objects
+
+    acquire() reuses a free bullet instead of allocating a Bullet and its
+    Rect; when the pool is exhausted it allocates a new one and counts it.
+    release() drops the owner reference, so pooled bullets do not keep
+    destroyed tanks alive, and keeps at most capacity free bullets.
+    A bullet must not be used after it was released.
+
+    Shots are copied into the BulletManager arrays and released right away,
+    and collision views are released before the next one is taken, so only
+    a few pooled bullets are out at once; a small capacity is enough.
+    """
+
+    def __init__(self, capacity=8):
+        self.capacity = capacity
+        self.free = []
+        for _ in range(capacity):
+            bullet = Bullet(0, 0, Direction.UP, None)
+            bullet.pooled = True
+            self.free.append(bullet)
+        self.stats = {
+            'acquired': 0,
+            'released': 0,
+            'exhausted': 0
+        }
+
+    def acquire(self, x, y, direction, owner):
+        """Get a bullet from the pool"""
+        self.stats['acquired'] += 1
+        if self.free:
+            bullet = self.free.pop()
+            bullet.reset(x, y, direction, owner)
+            return bullet
+        self.stats['exhausted'] += 1
+        bullet = Bullet(x, y, direction, owner)
+        bullet.pooled = True
+        return bullet
+
+    def release(self, bullet):
+        """Return a pooled bullet, other bullets are ignored"""
+        if not bullet.pooled:
+            return
+        self.stats['released'] += 1
+        bullet.owner = None
+        if len(self.free) < self.capacity:
+            self.free.append(bullet)
+
+    def get_stats(self):
+        """Get pool counters"""
+        stats = dict(self.stats)
+        stats['capacity'] = self.capacity
+        stats['free'] = len(self.free)
+        return stats
+
+
+class BulletManager:
+    """All bullets of a game stored as NumPy arrays (structure of arrays)
+
+    Positions, directions, speeds and owners live in parallel arrays so a
+    frame moves every bullet in one vectorized step. Bullets are removed by
+    marking them dead and compacting the arrays once per frame. Tank.shoot
+    still returns a Bullet; append copies it into the arrays and releases
+    it to the pool, and iterating yields read-only Bullet views.
+    """
+
+    def __init__(self, capacity=256, pool_size=8):
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)
+        self.speed = np.zeros(capacity)
+        self.direction = np.zeros(capacity, dtype=np.int8)
+        self.owner = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.size = BULLET_SIZE
+        self.pool = BulletPool(pool_size)  # Bullets handed out by Tank.shoot and get_bullet
+
+        # Owner ids index into owners; ids stay valid until clear()
+        self.owners = []
+        self.owner_ids = {}
+        self.shots = {}  # Team -> bullets fired, kept across clear()
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self.get_bullet(index)
+
+    def grow(self):
+        """Double the array capacity"""
+        capacity = len(self.x) * 2
+        for name in ('x', 'y', 'prev_x', 'prev_y', 'speed', 'direction', 'owner', 'alive'):
+            array = getattr(self, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:self.count] = array[:self.count]
+            setattr(self, name, grown)
+
+    def get_owner_id(self, owner):
+        """Get the id of a bullet owner, registering new owners"""
+        owner_id = self.owner_ids.get(owner)
+        if owner_id is None:
+            owner_id = self.owner_ids[owner] = len(self.owners)
+            self.owners.append(owner)
+        return owner_id
+
+    def append(self, bullet):
+        """Add a bullet created by Tank.shoot"""
+        if self.count == len(self.x):
+            self.grow()
+        index = self.count
+        self.x[index] = self.prev_x[index] = bullet.x
+        self.y[index] = self.prev_y[index] = bullet.y
+        self.speed[index] = bullet.speed
+        self.direction[index] = bullet.direction.value
+        self.owner[index] = self.get_owner_id(bullet.owner)
+        self.alive[index] = True
+        self.count += 1
+        team = bullet.owner.team
+        self.shots[team] = self.shots.get(team, 0) + 1
+        self.pool.release(bullet)
+
+    def get_bullet(self, index, pooled=False):
+        """Get a Bullet view of the bullet at an index
+
+        Pooled views come from the pool and should be released after use.
+        """
+        x = self.x[index].item()
+        y = self.y[index].item()
+        direction = DIRECTIONS[self.direction[index]]
+        owner = self.owners[self.owner[index]]
+        if pooled:
+            bullet = self.pool.acquire(x, y, direction, owner)
+        else:
+            bullet = Bullet(x, y, direction, owner)
+        bullet.speed = self.speed[index].item()
+        bullet.prev_x = self.prev_x[index].item()
+        bullet.prev_y = self.prev_y[index].item()
+        return bullet
+
+    def clear(self):
+        """Remove all bullets"""
+        self.count = 0
+        self.owners = []
+        self.owner_ids = {}
+
+    def update(self):
+        """Move all bullets one frame"""
+        n = self.count
+        steps = DIRECTION_STEPS[self.direction[:n]]
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        self.x[:n] += steps[:, 0] * self.speed[:n]
+        self.y[:n] += steps[:, 1] * self.speed[:n]
+
+    def kill(self, index):
+        """Mark a bullet for removal at the next compact()"""
+        self.alive[index] = False
+
+    def kill_off_screen(self):
+        """Mark bullets that left the screen for removal"""
+        n = self.count
+        x = self.x[:n]
+        y = self.y[:n]
+        self.alive[:n] &= (x >= 0) & (x <= SCREEN_WIDTH) & (y >= 0) & (y <= SCREEN_HEIGHT)
+
+    def compact(self):
+        """Drop dead bullets, keeping the order of the others"""
+        n = self.count
+        keep = np.flatnonzero(self.alive[:n])
+        if len(keep) == n:
+            return
+        for array in (self.x, self.y, self.prev_x, self.prev_y,
+                      self.speed, self.direction, self.owner, self.alive):
+            array[:len(keep)] = array[keep]
+        self.count = len(keep)
+
+    def broad_phase(self, tile_map, spatial_grid, base=None):
+        """Get indices of bullets whose last move touched a wall, tank or base cell
+
+        Each bullet's swept rect is converted to a range of tiles, and a
+        summed-area table of occupied tiles answers "is anything in this
+        range" for all bullets at once. Only these bullets need an exact
+        swept test.
+        """
+        n = self.count
+        if n == 0:
+            return []
+
+        # Tiles holding walls, the base or part of a tank
+        occupied = (IS_WALL[tile_map.grid] | (tile_map.grid == BASE)).astype(np.int32)
+        cells = list(spatial_grid.layers['tanks'])
+        if base is not None:
+            cells.append(tile_map.tile_at(base.x, base.y))
+        for cell_x, cell_y in cells:
+            if 0 <= cell_x < tile_map.cols and 0 <= cell_y < tile_map.rows:
+                occupied[cell_y, cell_x] = 1
+        table = np.zeros((tile_map.rows + 1, tile_map.cols + 1), dtype=np.int32)
+        table[1:, 1:] = occupied.cumsum(axis=0).cumsum(axis=1)
+
+        # Tile range of each swept rect, clipped to the map
+        size = tile_map.tile_size
+        left = np.minimum(self.x[:n], self.prev_x[:n])
+        top = np.minimum(self.y[:n], self.prev_y[:n])
+        right = np.maximum(self.x[:n], self.prev_x[:n]) + self.size - 1
+        bottom = np.maximum(self.y[:n], self.prev_y[:n]) + self.size - 1
+        min_x = np.clip(np.floor_divide(left, size), 0, tile_map.cols).astype(np.int64)
+        min_y = np.clip(np.floor_divide(top, size), 0, tile_map.rows).astype(np.int64)
+        max_x = np.clip(np.floor_divide(right, size), -1, tile_map.cols - 1).astype(np.int64)
+        max_y = np.clip(np.floor_divide(bottom, size), -1, tile_map.rows - 1).astype(np.int64)
+
+        inside = (min_x <= max_x) & (min_y <= max_y)
+        max_x = np.maximum(max_x, min_x - 1)
+        max_y = np.maximum(max_y, min_y - 1)
+        counts = (table[max_y + 1, max_x + 1] - table[min_y, max_x + 1]
+                  - table[max_y + 1, min_x] + table[min_y, min_x])
+        return np.flatnonzero(inside & (counts > 0)).tolist()
+
+    def draw(self, screen, alpha=1.0, dirty=None):
+        """Draw all bullets, interpolated between their previous and current position
+
+        The drawn screen areas are appended to dirty if given.
+        """
+        half = self.size // 2
+        n = self.count
+        xs = self.prev_x[:n] + (self.x[:n] - self.prev_x[:n]) * alpha
+        ys = self.prev_y[:n] + (self.y[:n] - self.prev_y[:n]) * alpha
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            area = pygame.draw.circle(screen, YELLOW, (x + half, y + half), half)
+            if dirty is not None:
+                dirty.append(area)
@@ -0,0 +1,67 @@
+class EntityList:
+    """List of entities with O(1) membership, swap-removal and deferred removal
+
+    remove() moves the last entity into the freed slot instead of shifting
+    the rest, so it does not keep the order. kill() only marks an entity;
+    compact() removes all marked entities once at the end of a tick, so
+    loops never need to iterate over a copy.
+    """
+
+    def __init__(self, entities=()):
+        self.items = []
+        self.indices = {}  # Entity -> position in items
+        self.dead = {}  # Entities marked by kill(), in kill order
+        for entity in entities:
+            self.append(entity)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __contains__(self, entity):
+        return entity in self.indices
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def append(self, entity):
+        """Add an entity at the end"""
+        if entity in self.indices:
+            return
+        self.indices[entity] = len(self.items)
+        self.items.append(entity)
+
+    def remove(self, entity):
+        """Remove an entity in O(1) by swapping the last entity into its slot"""
+        index = self.indices.pop(entity, None)
+        if index is None:
+            raise ValueError("entity is not in the list")
+        last = self.items.pop()
+        if last is not entity:
+            self.items[index] = last
+            self.indices[last] = index
+        self.dead.pop(entity, None)
+
+    def kill(self, entity):
+        """Mark an entity for removal at the next compact()"""
+        if entity in self.indices:
+            self.dead[entity] = None
+
+    def is_dead(self, entity):
+        """Check if an entity is marked for removal"""
+        return entity in self.dead
+
+    def compact(self):
+        """Remove all marked entities, returns them"""
+        removed = list(self.dead)
+        for entity in removed:
+            self.remove(entity)
+        return removed
+
+    def clear(self):
+        """Remove all entities"""
+        self.items.clear()
+        self.indices.clear()
+        self.dead.clear()
@@ -4,6 +4,7 @@ import os
 from game_objects import *
 from game_level import *
 from vision_ai import *
+from text_cache import text_cache
 
 # Game constants
 SCREEN_WIDTH = 800
@@ -14,10 +15,13 @@ BULLET_SIZE = 8
 class GameController:
     def __init__(self, game):
         self.game = game
+        self.get_ticks = getattr(game, 'get_ticks', pygame.time.get_ticks)
+        self.probe_rect = pygame.Rect(0, 0, 0, 0)  # Reused by collision checks
         self.level = GameLevel(game)
         self.keys_pressed = set()
         self.game_started = False
         self.show_menu = True
+        self.menu_surface = None  # Menu rendered once by render_menu
         self.vision_system = VisionSystem(game)
         self.ai_system = AdvancedAI(game, self.vision_system)
         
@@ -35,6 +39,7 @@ class GameController:
     
     def start_new_game(self, use_random_map=True):
         """Start new game"""
+        self.ai_system.reset()
         self.level.start_level(use_random_map)
         self.game_started = True
         self.show_menu = False
@@ -54,6 +59,7 @@ class GameController:
         else:
             # Select first map file
             map_file = os.path.join('maps', map_files[0])
+            self.ai_system.reset()
             self.level.load_map_from_file(map_file)
             self.game_started = True
             self.show_menu = False
@@ -75,7 +81,7 @@ class GameController:
                 elif event.key == pygame.K_d:
                     player_tank.rotate(Direction.RIGHT)
                 elif event.key == pygame.K_j:
-                    bullet = player_tank.shoot()
+                    bullet = player_tank.shoot(self.get_ticks())
                     if bullet:
                         self.game.bullets.append(bullet)
                 
@@ -116,29 +122,26 @@ class GameController:
     
     def check_tank_wall_collision(self, tank, dx, dy):
         """Check tank-wall collision"""
-        future_rect = tank.rect.copy()
+        future_rect = self.probe_rect
+        future_rect.update(tank.rect)
         future_rect.x += dx * tank.speed
         future_rect.y += dy * tank.speed
         
-        for wall in self.game.walls:
-            if future_rect.colliderect(wall.rect):
-                return True
+        # Only walls and tanks in the grid cells around the move are tested
+        spatial_grid = self.game.spatial_grid
+        if spatial_grid.collides(future_rect, 'walls'):
+            return True
         
-        # Check collision with other tanks
-        for other_tank in self.game.tanks:
-            if other_tank != tank and other_tank.is_alive:
-                if future_rect.colliderect(other_tank.rect):
-                    return True
-        
-        return False
+        # Check collision with other tanks (destroyed tanks leave the grid)
+        return spatial_grid.collides(future_rect, 'tanks', exclude=tank)
     
     def update(self):
         """Update game controller"""
         if not self.game_started:
             return
         
-        # Update vision system
-        self.vision_system.update_vision()
+        # Update vision system, refreshing attacking tanks every frame
+        self.vision_system.update_vision(self.ai_system.get_attacking_tanks())
         
         # Update AI system
         self.ai_system.update_ai()
@@ -174,24 +177,26 @@ class GameController:
     
     def check_bullet_wall_collision(self, bullet):
         """Check bullet-wall collision"""
-        bullet_rect = pygame.Rect(bullet.x, bullet.y, bullet.size, bullet.size)
-        
-        for wall in self.game.walls:
-            if bullet_rect.colliderect(wall.rect):
-                return True
-        
-        return False
+        bullet_rect = self.probe_rect
+        bullet_rect.update(bullet.x, bullet.y, bullet.size, bullet.size)
+        return self.game.spatial_grid.collides(bullet_rect, 'walls')
     
     def draw_menu(self):
-        """Draw menu"""
-        self.game.screen.fill(BLACK)
+        """Draw menu from the cached menu surface"""
+        if self.menu_surface is None:
+            self.menu_surface = self.render_menu()
+        self.game.screen.blit(self.menu_surface, (0, 0))
+        pygame.display.flip()
+    
+    def render_menu(self):
+        """Render the static menu once, returns its surface"""
+        surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        surface.fill(BLACK)
         
-        font = pygame.font.Font(None, 74)
-        title = font.render("Tank Battle", True, WHITE)
+        title = text_cache.render("Tank Battle", 74, WHITE)
         title_rect = title.get_rect(center=(SCREEN_WIDTH//2, 100))
-        self.game.screen.blit(title, title_rect)
+        surface.blit(title, title_rect)
         
-        font = pygame.font.Font(None, 36)
         options = [
             "1. Start New Game (Random Map)",
             "2. Load Map Game",
@@ -200,13 +205,12 @@ class GameController:
         
         y_offset = 250
         for option in options:
-            text = font.render(option, True, WHITE)
+            text = text_cache.render(option, 36, WHITE)
             text_rect = text.get_rect(center=(SCREEN_WIDTH//2, y_offset))
-            self.game.screen.blit(text, text_rect)
+            surface.blit(text, text_rect)
             y_offset += 50
         
         # Show controls
-        font = pygame.font.Font(None, 24)
         controls = [
             "Controls:",
             "WASD - Move Tank",
@@ -217,9 +221,9 @@ class GameController:
         
         y_offset = 450
         for control in controls:
-            text = font.render(control, True, GRAY)
+            text = text_cache.render(control, 24, GRAY)
             text_rect = text.get_rect(center=(SCREEN_WIDTH//2, y_offset))
-            self.game.screen.blit(text, text_rect)
+            surface.blit(text, text_rect)
             y_offset += 30
         
-        pygame.display.flip()
\ No newline at end of file
+        return surface
@@ -12,6 +12,7 @@ WALL_SIZE = config.get('game_settings.wall_size', 40)
 class GameLevel:
     def __init__(self, game):
         self.game = game
+        self.rng = getattr(game, 'rng', random)  # Seeded RNG of a Simulation
         self.level = 1
         self.player_count = 1
         
@@ -30,24 +31,30 @@ class GameLevel:
             self.game.walls.append(Wall(0, y, WallType.METAL))
             self.game.walls.append(Wall(SCREEN_WIDTH - WALL_SIZE, y, WallType.METAL))
         
+        # Base position, its tile and protective ring are kept free of random walls
+        base_x = (SCREEN_WIDTH // WALL_SIZE // 2 - 1) * WALL_SIZE
+        base_y = (SCREEN_HEIGHT - WALL_SIZE * 3)
+        base_tiles = {(base_x + dx * WALL_SIZE, base_y + dy * WALL_SIZE)
+                      for dx in [-1, 0, 1] for dy in [-1, 0]}
+        
         # Generate random soil walls
         map_settings = config.get_map_settings()
         soil_wall_count = map_settings.get('random_soil_walls', 15)
         for _ in range(soil_wall_count):
-            x = random.randint(2, (SCREEN_WIDTH // WALL_SIZE) - 3) * WALL_SIZE
-            y = random.randint(2, (SCREEN_HEIGHT // WALL_SIZE) - 3) * WALL_SIZE
-            self.game.walls.append(Wall(x, y, WallType.SOIL))
+            x = self.rng.randint(2, (SCREEN_WIDTH // WALL_SIZE) - 3) * WALL_SIZE
+            y = self.rng.randint(2, (SCREEN_HEIGHT // WALL_SIZE) - 3) * WALL_SIZE
+            if (x, y) not in base_tiles:
+                self.game.walls.append(Wall(x, y, WallType.SOIL))
         
         # Generate random metal walls
         metal_wall_count = map_settings.get('random_metal_walls', 8)
         for _ in range(metal_wall_count):
-            x = random.randint(2, (SCREEN_WIDTH // WALL_SIZE) - 3) * WALL_SIZE
-            y = random.randint(2, (SCREEN_HEIGHT // WALL_SIZE) - 3) * WALL_SIZE
-            self.game.walls.append(Wall(x, y, WallType.METAL))
+            x = self.rng.randint(2, (SCREEN_WIDTH // WALL_SIZE) - 3) * WALL_SIZE
+            y = self.rng.randint(2, (SCREEN_HEIGHT // WALL_SIZE) - 3) * WALL_SIZE
+            if (x, y) not in base_tiles:
+                self.game.walls.append(Wall(x, y, WallType.METAL))
         
         # Place base
-        base_x = (SCREEN_WIDTH // WALL_SIZE // 2 - 1) * WALL_SIZE
-        base_y = (SCREEN_HEIGHT - WALL_SIZE * 3)
         self.game.base = Base(base_x, base_y)
         
         # Place protective walls around base
@@ -58,13 +65,14 @@ class GameLevel:
                 if dx == 0 and dy == 0:
                     continue  # Skip base position
                 self.game.walls.append(Wall(wall_x, wall_y, WallType.SOIL))
+        self.game.tile_map.set_base(self.game.base)
     
     def spawn_tanks(self):
         """Spawn tanks"""
         # Generate player tank
         player_settings = config.get_player_settings()
         player_colors = player_settings.get('colors', ['red', 'yellow'])
-        player_color = self.get_color_by_name(random.choice(player_colors))
+        player_color = self.get_color_by_name(self.rng.choice(player_colors))
         player_x = SCREEN_WIDTH // 2 - TANK_SIZE // 2
         player_y = SCREEN_HEIGHT - TANK_SIZE * 2
         
@@ -75,6 +83,7 @@ class GameLevel:
         player_tank.shot_cooldown = player_settings.get('shot_cooldown', 500)
         player_tank.vision_range = player_settings.get('vision_range', 150)
         player_tank.hit_points = player_settings.get('hit_points', 1)
+        player_tank.bullet_speed = config.get_bullet_settings().get('speed', 5)
         
         self.game.tanks.append(player_tank)
         
@@ -99,8 +108,8 @@ class GameLevel:
         # Find valid position
         max_attempts = 50
         for attempt in range(max_attempts):
-            x = random.randint(1, (SCREEN_WIDTH // WALL_SIZE) - 3) * WALL_SIZE
-            y = random.randint(1, 8) * WALL_SIZE
+            x = self.rng.randint(1, (SCREEN_WIDTH // WALL_SIZE) - 3) * WALL_SIZE
+            y = self.rng.randint(1, 8) * WALL_SIZE
             
             # Ensure no overlap with other tanks
             valid_position = True
@@ -118,6 +127,7 @@ class GameLevel:
                 enemy_tank.shot_cooldown = tank_config.get('shot_cooldown', 800)
                 enemy_tank.vision_range = tank_config.get('vision_range', 120)
                 enemy_tank.hit_points = tank_config.get('hit_points', 1)
+                enemy_tank.bullet_speed = config.get_bullet_settings().get('speed', 5)
                 
                 # Set AI parameters
                 enemy_tank.ai_decision_interval = tank_config.get('ai_decision_interval', 1000)
@@ -160,6 +170,7 @@ class GameLevel:
                         self.game.walls.append(Wall(x * WALL_SIZE, y * WALL_SIZE, WallType.METAL))
                     elif char == 'B':  # Base
                         self.game.base = Base(x * WALL_SIZE, y * WALL_SIZE)
+                        self.game.tile_map.set_base(self.game.base)
                     elif char == 'P':  # Player
                         player_tank = Tank(x * WALL_SIZE, y * WALL_SIZE, TankType.PLAYER, RED)
                         self.game.tanks.append(player_tank)
@@ -174,23 +185,35 @@ class GameLevel:
             print(f"Map file {filename} does not exist, using random map")
             self.generate_random_map()
             self.spawn_tanks()
+        
+        self.register_tanks()
+    
+    def register_tanks(self):
+        """Register tanks for collision queries and give them the bullet pool
+
+        Enemy tanks get their AI state here when the game has an AI.
+        """
+        for tank in self.game.tanks:
+            tank.bullet_pool = self.game.bullets.pool
+        self.game.spatial_grid.rebuild(self.game.tanks)
+
+        controller = getattr(self.game, 'controller', None)
+        if controller is not None:
+            ai_system = controller.ai_system
+            current_time = ai_system.get_ticks()
+            for tank in self.game.tanks:
+                if tank.tank_type != TankType.PLAYER and tank.ai_state is None:
+                    ai_system.on_tank_spawned(tank, current_time)
     
     def save_map_to_file(self, filename):
         """Save map to file"""
+        tile_chars = {WallType.SOIL.value: '#', WallType.METAL.value: '@'}
         map_data = []
         for y in range(0, SCREEN_HEIGHT, WALL_SIZE):
             row = []
             for x in range(0, SCREEN_WIDTH, WALL_SIZE):
-                char = '.'
-                
                 # Check if there is a wall
-                for wall in self.game.walls:
-                    if wall.x == x and wall.y == y:
-                        if wall.wall_type == WallType.SOIL:
-                            char = '#'
-                        elif wall.wall_type == WallType.METAL:
-                            char = '@'
-                        break
+                char = tile_chars.get(self.game.tile_map.get_tile(x // WALL_SIZE, y // WALL_SIZE), '.')
                 
                 # Check if there is a base
                 if self.game.base and self.game.base.x == x and self.game.base.y == y:
@@ -219,6 +242,7 @@ class GameLevel:
         self.game.tanks.clear()
         self.game.bullets.clear()
         self.game.walls.clear()
+        self.game.spatial_grid.clear()
         self.game.base = None
         
         if use_random_map:
@@ -228,5 +252,6 @@ class GameLevel:
             self.generate_random_map()
         
         self.spawn_tanks()
+        self.register_tanks()
         self.game.game_over = False
         self.game.winner = None
\ No newline at end of file
@@ -39,7 +39,18 @@ class WallType(Enum):
     METAL = 2  # Metal wall
     BASE = 3   # Base
 
+# Shared tuple of directions, so random turns do not build list(Direction)
+DIRECTIONS = tuple(Direction)
+
 class Tank:
+    __slots__ = ('x', 'y', 'prev_x', 'prev_y', 'tank_type', 'color', 'direction',
+                 'speed', 'size', 'rect', 'last_shot_time', 'shot_cooldown',
+                 'bullet_speed', 'bullet_pool', 'vision_range', 'is_alive',
+                 'hit_points', 'team', 'ai_state', 'spatial_grid',
+                 # Enemy tanks only
+                 'ai_timer', 'ai_decision_interval', 'attack_chance',
+                 'direction_change_chance', 'target', 'patrol_direction')
+    
     def __init__(self, x, y, tank_type, color, direction=Direction.UP):
         self.x = x
         self.y = y
@@ -49,11 +60,19 @@ class Tank:
         self.speed = 2
         self.size = TANK_SIZE
         self.rect = pygame.Rect(x, y, self.size, self.size)
+        # Position before the last simulation step, drawing interpolates from here
+        self.prev_x = x
+        self.prev_y = y
         self.last_shot_time = 0
         self.shot_cooldown = 500  # milliseconds
+        self.bullet_speed = 5
+        self.bullet_pool = None  # BulletPool that shoot() takes bullets from
         self.vision_range = 150
         self.is_alive = True
         self.hit_points = 2 if tank_type == TankType.ENEMY_COMMANDER else 1
+        self.team = 'player' if tank_type == TankType.PLAYER else 'enemy'
+        self.ai_state = None  # Set by AdvancedAI for AI controlled tanks
+        self.spatial_grid = None  # Set by SpatialGrid when registered
         
         # Add AI-related properties for enemy tanks
         if tank_type != TankType.PLAYER:
@@ -62,19 +81,25 @@ class Tank:
             self.attack_chance = 0.2  # probability of attacking when player is in range
             self.direction_change_chance = 0.3  # probability of changing direction during patrol
             self.target = None
-            self.patrol_direction = random.choice(list(Direction))
+            self.patrol_direction = random.choice(DIRECTIONS)
     
-    def update(self):
-        """Update tank state"""
+    def update(self, current_time=None, rng=random):
+        """Update tank state
+
+        current_time and rng default to the pygame clock and the global
+        random module; a Simulation passes its own tick clock and RNG.
+        """
         if not self.is_alive:
             return
         
         self.rect.x = self.x
         self.rect.y = self.y
         
-        # AI update
+        # AI update, its bullets are not fired into the game
         if self.tank_type != TankType.PLAYER:
-            self.update_ai()
+            bullet = self.update_ai(current_time, rng)
+            if bullet is not None and self.bullet_pool is not None:
+                self.bullet_pool.release(bullet)
     
     def move(self, dx, dy):
         """Move tank"""
@@ -90,14 +115,26 @@ class Tank:
         # Update rect position
         self.rect.x = self.x
         self.rect.y = self.y
+        if self.spatial_grid is not None:
+            self.spatial_grid.update(self)
+    
+    def set_position(self, x, y):
+        """Place tank at a position"""
+        self.x = x
+        self.y = y
+        self.rect.x = self.x
+        self.rect.y = self.y
+        if self.spatial_grid is not None:
+            self.spatial_grid.update(self)
     
     def rotate(self, direction):
         """Rotate tank direction"""
         self.direction = direction
     
-    def shoot(self):
+    def shoot(self, current_time=None):
         """Shoot bullet"""
-        current_time = pygame.time.get_ticks()
+        if current_time is None:
+            current_time = pygame.time.get_ticks()
         if current_time - self.last_shot_time < self.shot_cooldown:
             return None
         
@@ -117,7 +154,12 @@ class Tank:
         elif self.direction == Direction.RIGHT:
             bullet_x = self.x + self.size + 5
         
-        return Bullet(bullet_x, bullet_y, self.direction, self)
+        if self.bullet_pool is not None:
+            bullet = self.bullet_pool.acquire(bullet_x, bullet_y, self.direction, self)
+        else:
+            bullet = Bullet(bullet_x, bullet_y, self.direction, self)
+        bullet.speed = self.bullet_speed
+        return bullet
     
     def hit(self):
         """Tank is hit"""
@@ -125,30 +167,39 @@ class Tank:
         if self.hit_points <= 0:
             self.is_alive = False
     
-    def draw(self, screen):
-        """Draw tank"""
+    def draw(self, screen, alpha=1.0):
+        """Draw tank
+
+        alpha interpolates between the previous (0) and current (1)
+        position, for drawing between two simulation steps.
+        Returns the screen area drawn, None if nothing was drawn.
+        """
         if not self.is_alive:
-            return
+            return None
+        
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
         
         # Draw tank body
-        pygame.draw.rect(screen, self.color, self.rect)
+        area = pygame.draw.rect(screen, self.color, (x, y, self.size, self.size))
         
         # Draw tank barrel
-        center_x = self.x + self.size // 2
-        center_y = self.y + self.size // 2
+        center_x = x + self.size // 2
+        center_y = y + self.size // 2
         
         if self.direction == Direction.UP:
-            pygame.draw.rect(screen, self.color, 
-                           (center_x - 3, self.y - 10, 6, 15))
+            barrel = pygame.draw.rect(screen, self.color, 
+                           (center_x - 3, y - 10, 6, 15))
         elif self.direction == Direction.DOWN:
-            pygame.draw.rect(screen, self.color, 
-                           (center_x - 3, self.y + self.size - 5, 6, 15))
+            barrel = pygame.draw.rect(screen, self.color, 
+                           (center_x - 3, y + self.size - 5, 6, 15))
         elif self.direction == Direction.LEFT:
-            pygame.draw.rect(screen, self.color, 
-                           (self.x - 10, center_y - 3, 15, 6))
-        elif self.direction == Direction.RIGHT:
-            pygame.draw.rect(screen, self.color, 
-                           (self.x + self.size - 5, center_y - 3, 15, 6))
+            barrel = pygame.draw.rect(screen, self.color, 
+                           (x - 10, center_y - 3, 15, 6))
+        else:
+            barrel = pygame.draw.rect(screen, self.color, 
+                           (x + self.size - 5, center_y - 3, 15, 6))
+        area.union_ip(barrel)
         
         # Draw commander tank indicator
         if self.tank_type == TankType.ENEMY_COMMANDER:
@@ -156,18 +207,20 @@ class Tank:
                              (center_x, center_y), 8)
             pygame.draw.circle(screen, RED, 
                              (center_x, center_y), 5)
+        return area
     
-    def update_ai(self):
+    def update_ai(self, current_time=None, rng=random):
         """Update AI behavior"""
-        current_time = pygame.time.get_ticks()
+        if current_time is None:
+            current_time = pygame.time.get_ticks()
         if current_time - self.ai_timer < self.ai_decision_interval:
             return
         
         self.ai_timer = current_time
         
         # Simple AI logic
-        if random.random() < 0.3:  # 30% chance to change direction
-            self.direction = random.choice(list(Direction))
+        if rng.random() < 0.3:  # 30% chance to change direction
+            self.direction = rng.choice(DIRECTIONS)
         
         # Movement
         if self.direction == Direction.UP:
@@ -180,12 +233,15 @@ class Tank:
             self.move(1, 0)
         
         # Random shooting
-        if random.random() < 0.2:  # 20% chance to shoot
-            return self.shoot()
+        if rng.random() < 0.2:  # 20% chance to shoot
+            return self.shoot(current_time)
         
         return None
 
 class Bullet:
+    __slots__ = ('x', 'y', 'direction', 'owner', 'speed', 'size', 'rect',
+                 'prev_x', 'prev_y', 'pooled')
+    
     def __init__(self, x, y, direction, owner):
         self.x = x
         self.y = y
@@ -194,9 +250,24 @@ class Bullet:
         self.speed = 5
         self.size = BULLET_SIZE
         self.rect = pygame.Rect(x, y, self.size, self.size)
+        # Position before the last update, collisions are swept from here
+        self.prev_x = x
+        self.prev_y = y
+        self.pooled = False  # Taken from a BulletPool, release it after use
+    
+    def reset(self, x, y, direction, owner):
+        """Reinitialize a reused bullet"""
+        self.x = self.prev_x = x
+        self.y = self.prev_y = y
+        self.direction = direction
+        self.owner = owner
+        self.speed = 5
+        self.rect.update(x, y, self.size, self.size)
     
     def update(self):
         """Update bullet position"""
+        self.prev_x = self.x
+        self.prev_y = self.y
         if self.direction == Direction.UP:
             self.y -= self.speed
         elif self.direction == Direction.DOWN:
@@ -221,12 +292,25 @@ class Bullet:
                          self.size // 2)
 
 class Wall:
+    """Lightweight wall, walls on the map are views of TileMap tiles"""
+    __slots__ = ('x', 'y', 'wall_type')
+    size = WALL_SIZE
+    
     def __init__(self, x, y, wall_type):
         self.x = x
         self.y = y
         self.wall_type = wall_type
-        self.size = WALL_SIZE
-        self.rect = pygame.Rect(x, y, self.size, self.size)
+    
+    @property
+    def rect(self):
+        return pygame.Rect(self.x, self.y, self.size, self.size)
+    
+    def __eq__(self, other):
+        return (isinstance(other, Wall) and self.x == other.x and self.y == other.y
+                and self.wall_type == other.wall_type)
+    
+    def __hash__(self):
+        return hash((self.x, self.y))
     
     def draw(self, screen):
         """Draw wall"""
@@ -238,6 +322,8 @@ class Wall:
             pygame.draw.rect(screen, DARK_GRAY, self.rect, 3)
 
 class Base:
+    __slots__ = ('x', 'y', 'size', 'rect')
+    
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -1,5 +1,10 @@
 import pygame
 import sys
+import time
+from config_manager import config
+from simulation import Simulation, FixedTimestep
+from background import Background
+from text_cache import text_cache
 
 # 初始化Pygame
 pygame.init()
@@ -10,7 +15,7 @@ SCREEN_HEIGHT = 600
 TANK_SIZE = 40
 BULLET_SIZE = 8
 WALL_SIZE = 40
-FPS = 60
+FPS = config.get('game_settings.fps', 60)  # Drawing rate
 
 # 颜色定义
 BLACK = (0, 0, 0)
@@ -23,28 +28,45 @@ GRAY = (128, 128, 128)
 BROWN = (139, 69, 19)
 DARK_GRAY = (64, 64, 64)
 
-class Game:
-    def __init__(self):
+class Game(Simulation):
+    """Window, input and drawing on top of the headless simulation"""
+
+    def __init__(self, seed=None):
+        super().__init__(seed, deterministic=False)
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Tank Battle - Python Tutorial")
         self.clock = pygame.time.Clock()
-        self.running = True
-        self.tanks = []
-        self.bullets = []
-        self.walls = []
-        self.base = None
-        self.game_over = False
-        self.winner = None
-        self.controller: GameController | None = None    # Will be set to GameController instance at runtime
+        self.timestep = FixedTimestep(
+            self.step_ms,
+            config.get('game_settings.max_catch_up_steps', 5),
+            config.get('game_settings.frame_skip', False),
+            config.get('game_settings.max_frame_skip', 5))
+        self.background = Background(self)  # Cached walls and base
+        self.dirty_rects = []  # Screen areas of the sprites drawn last frame
+        self.full_redraw = True
+        self.menu_drawn = False  # The menu is on screen, idle frames draw nothing
     
     def run(self):
-        """Game main loop"""
+        """Game main loop
+
+        The simulation runs one step every step_ms whatever the
+        drawing rate; frames are drawn at up to FPS, interpolated between
+        the last two steps.
+        """
+        last_time = time.perf_counter()
         while self.running:
+            now = time.perf_counter()
+            steps, draw = self.timestep.tick((now - last_time) * 1000)
+            last_time = now
+            
             self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
+            for _ in range(steps):
+                self.update()
+            if draw:
+                self.draw(self.timestep.alpha)
+                self.clock.tick(FPS)
         
+        self.close()
         pygame.quit()
         sys.exit()
     
@@ -53,142 +75,85 @@ class Game:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type == pygame.WINDOWEXPOSED:
+                # The window contents were lost, draw everything again
+                self.menu_drawn = False
+                self.full_redraw = True
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
             
             # Use controller to handle input
-            if self.controller:
-                if self.controller.show_menu:
-                    self.controller.handle_menu_input(event)
-                else:
-                    self.controller.handle_game_input(event)
+            if self.controller.show_menu:
+                self.controller.handle_menu_input(event)
+            else:
+                self.controller.handle_game_input(event)
     
     def update(self):
-        """Update game state"""
-        if not self.game_over:
-            # Update controller
-            if self.controller:
-                self.controller.update()
-            
-            # Only update game logic if game has started
-            if self.controller and self.controller.game_started:
-                # Update tanks
-                for tank in self.tanks:
-                    tank.update()
-                
-                # Update bullets
-                for bullet in self.bullets[:]:
-                    bullet.update()
-                    if bullet.is_off_screen():
-                        self.bullets.remove(bullet)
-                
-                # Check collisions
-                self.check_collisions()
-                
-                # Check game over conditions
-                self.check_game_over()
+        """Update game state by one fixed simulation step"""
+        self.step()
     
-    def draw(self):
-        """Draw game screen"""
-        # If controller exists and shows menu, draw menu
-        if self.controller and self.controller.show_menu:
-            self.controller.draw_menu()
+    def draw(self, alpha=1.0):
+        """Draw game screen, alpha interpolates tanks and bullets between steps
+
+        Walls and base come from the cached background. Only the areas of
+        the sprites drawn last frame and this frame, and of destroyed walls,
+        are restored and sent to the display.
+        """
+        # If the menu is shown, draw menu once when it appears
+        if self.controller.show_menu:
+            if not self.menu_drawn:
+                self.controller.draw_menu()
+                self.menu_drawn = True
+            self.full_redraw = True
             return
+        self.menu_drawn = False
         
-        self.screen.fill(BLACK)
-        
-        # Draw walls
-        for wall in self.walls:
-            wall.draw(self.screen)
-        
-        # Draw base
-        if self.base:
-            self.base.draw(self.screen)
+        screen = self.screen
+        background = self.background.surface
+        changed = []
+        if self.background.update(changed) or self.full_redraw:
+            screen.blit(background, (0, 0))
+            full_redraw = True
+        else:
+            # Erase last frame's sprites and show destroyed walls
+            for rect in self.dirty_rects:
+                screen.blit(background, rect, rect)
+            for rect in changed:
+                screen.blit(background, rect, rect)
+            full_redraw = False
         
         # Draw tanks
+        dirty = []
         for tank in self.tanks:
-            tank.draw(self.screen)
+            area = tank.draw(screen, alpha)
+            if area:
+                dirty.append(area)
         
         # Draw bullets
-        for bullet in self.bullets:
-            bullet.draw(self.screen)
+        self.bullets.draw(screen, alpha, dirty)
         
         # Draw game over info
         if self.game_over:
-            self.draw_game_over()
+            dirty.append(self.draw_game_over())
         
-        pygame.display.flip()
+        if full_redraw:
+            pygame.display.flip()
+            self.full_redraw = False
+        else:
+            pygame.display.update(self.dirty_rects + changed + dirty)
+        self.dirty_rects = dirty
     
     def draw_game_over(self):
-        """Draw game over screen"""
-        font = pygame.font.Font(None, 74)
+        """Draw game over screen, returns the drawn area"""
         if self.winner == "player":
-            text = font.render("Player Wins!", True, GREEN)
+            text = text_cache.render("Player Wins!", 74, GREEN)
         else:
-            text = font.render("Game Over!", True, RED)
+            text = text_cache.render("Game Over!", 74, RED)
         
         text_rect = text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
-        self.screen.blit(text, text_rect)
-    
-    def check_collisions(self):
-        """Check collisions"""
-        from game_objects import WallType
-        
-        # Bullet-wall collisions
-        for bullet in self.bullets[:]:
-            for wall in self.walls[:]:
-                if bullet.rect.colliderect(wall.rect):
-                    if wall.wall_type == WallType.SOIL:
-                        self.walls.remove(wall)
-                    if bullet in self.bullets:
-                        self.bullets.remove(bullet)
-                    break
-        
-        # Bullet-tank collisions
-        for bullet in self.bullets[:]:
-            for tank in self.tanks[:]:
-                if bullet.rect.colliderect(tank.rect) and bullet.owner != tank:
-                    # Add a small delay to prevent immediate collision with owner
-                    tank.hit()
-                    # Remove tank from list if destroyed
-                    if not tank.is_alive and tank in self.tanks:
-                        self.tanks.remove(tank)
-                    if bullet in self.bullets:
-                        self.bullets.remove(bullet)
-                    break
-        
-        # Bullet-base collisions
-        for bullet in self.bullets[:]:
-            if self.base and bullet.rect.colliderect(self.base.rect):
-                self.game_over = True
-                self.winner = "en玩家emy"
-                if bullet in self.bullets:
-                    self.bullets.remove(bullet)
-    
-    def check_game_over(self):
-        """Check game over conditions"""
-        # Only check game over if game has started
-        if not self.controller or not self.controller.game_started:
-            return
-        
-        # Import enums from game_objects
-        from game_objects import TankType
-        
-        # Check if all enemies are destroyed
-        enemy_tanks = [t for t in self.tanks if t.tank_type != TankType.PLAYER]
-        if not enemy_tanks:
-            self.game_over = True
-            self.winner = "player"
-        
-        # Check if all players are destroyed
-        player_tanks = [t for t in self.tanks if t.tank_type == TankType.PLAYER]
-        if not player_tanks:
-            self.game_over = True
-            self.winner = "enemy"
+        return self.screen.blit(text, text_rect)
 
 if __name__ == "__main__":
     game = Game()
-    from game_controller import GameController
-    game.controller = GameController(game)
-    game.run()
\ No newline at end of file
+    game.run()
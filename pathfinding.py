@@ -0,0 +1,212 @@
+import heapq
+from collections import OrderedDict
+
+# 4-connected neighbor offsets, tanks only move along axes.
+# Opposite offsets differ only in the lowest index bit (index ^ 1).
+NEIGHBOR_OFFSETS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+# Marks tiles without a step towards the goal in a flow field
+NO_STEP = 255
+
+
+def is_walkable(tile_map, tile):
+    """Check if a tank can occupy a tile"""
+    tile_x, tile_y = tile
+    return (0 <= tile_x < tile_map.cols and 0 <= tile_y < tile_map.rows
+            and not tile_map.is_blocked(tile_x, tile_y))
+
+
+class PathFinder:
+    """A* pathfinding on the wall tile grid with a shared path cache
+
+    Paths are tuples of tile coordinates from the start tile to the goal
+    tile. Results are cached by (start tile, goal tile, wall epoch), so all
+    tanks share plans and a plan is dropped as soon as a wall changes.
+    """
+
+    def __init__(self, tile_map, cache_capacity=512):
+        self.tile_map = tile_map
+        self.cache_capacity = cache_capacity
+        self.cache = OrderedDict()
+        self.cache_epoch = tile_map.epoch
+        self.hits = 0
+        self.misses = 0
+
+    def is_walkable(self, tile):
+        """Check if a tank can occupy a tile"""
+        return is_walkable(self.tile_map, tile)
+
+    def get_path(self, start, goal):
+        """Get a cached path between two tiles, planning it on a miss"""
+        found, path = self.lookup(start, goal)
+        if not found:
+            path = self.find_path(start, goal)
+            self.store(start, goal, path)
+        return path
+
+    def lookup(self, start, goal):
+        """Look up a cached path, returns (found, path)"""
+        self.check_epoch()
+        key = (start, goal)
+        if key in self.cache:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return True, self.cache[key]
+
+        self.misses += 1
+        return False, None
+
+    def store(self, start, goal, path):
+        """Cache a path planned for the current wall epoch"""
+        self.check_epoch()
+        key = (start, goal)
+        self.cache[key] = path
+        self.cache.move_to_end(key)
+        if len(self.cache) > self.cache_capacity:
+            self.cache.popitem(last=False)
+
+    def check_epoch(self):
+        """Drop cached paths once the walls changed"""
+        if self.cache_epoch != self.tile_map.epoch:
+            self.cache.clear()
+            self.cache_epoch = self.tile_map.epoch
+
+    def find_path(self, start, goal, avoid=()):
+        """Plan a path with A*, returns None if the goal is unreachable
+
+        Tiles in avoid are treated as blocked (e.g. tiles occupied by tanks).
+        """
+        if not self.is_walkable(goal) or goal in avoid:
+            return None
+        if start == goal:
+            return (start,)
+
+        open_heap = [(self.heuristic(start, goal), 0, start)]
+        came_from = {start: None}
+        cost_so_far = {start: 0}
+
+        while open_heap:
+            _, cost, current = heapq.heappop(open_heap)
+            if current == goal:
+                break
+            if cost > cost_so_far[current]:
+                continue  # Outdated heap entry
+
+            for offset_x, offset_y in NEIGHBOR_OFFSETS:
+                neighbor = (current[0] + offset_x, current[1] + offset_y)
+                if neighbor in avoid or not self.is_walkable(neighbor):
+                    continue
+                new_cost = cost + 1
+                if new_cost < cost_so_far.get(neighbor, new_cost + 1):
+                    cost_so_far[neighbor] = new_cost
+                    came_from[neighbor] = current
+                    heapq.heappush(open_heap,
+                                   (new_cost + self.heuristic(neighbor, goal), new_cost, neighbor))
+        else:
+            return None
+
+        # Walk back from goal to start
+        path = []
+        tile = goal
+        while tile is not None:
+            path.append(tile)
+            tile = came_from[tile]
+        path.reverse()
+        return tuple(path)
+
+    def heuristic(self, tile, goal):
+        """Manhattan distance between tiles"""
+        return abs(tile[0] - goal[0]) + abs(tile[1] - goal[1])
+
+    def get_stats(self):
+        """Get path cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.cache),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+class FlowField:
+    """Breadth-first distance field from every tile to one goal tile
+
+    Built once per goal and wall epoch; afterwards any number of tanks can
+    look up their next step towards the goal in O(1).
+    """
+
+    def __init__(self, tile_map, goal):
+        self.goal = goal
+        self.epoch = tile_map.epoch
+        self.cols = tile_map.cols
+        self.rows = tile_map.rows
+        self.distances = [-1] * (self.cols * self.rows)
+        # Index into NEIGHBOR_OFFSETS of the step towards the goal
+        self.next_steps = bytearray([NO_STEP]) * (self.cols * self.rows)
+
+        if not is_walkable(tile_map, goal):
+            return
+
+        # Breadth-first search outwards from the goal
+        self.distances[goal[1] * self.cols + goal[0]] = 0
+        frontier = [goal]
+        distance = 0
+        while frontier:
+            distance += 1
+            next_frontier = []
+            for tile_x, tile_y in frontier:
+                for index, (offset_x, offset_y) in enumerate(NEIGHBOR_OFFSETS):
+                    neighbor = (tile_x + offset_x, tile_y + offset_y)
+                    if not is_walkable(tile_map, neighbor):
+                        continue
+                    neighbor_index = neighbor[1] * self.cols + neighbor[0]
+                    if self.distances[neighbor_index] != -1:
+                        continue
+                    self.distances[neighbor_index] = distance
+                    self.next_steps[neighbor_index] = index ^ 1  # Step back towards tile
+                    next_frontier.append(neighbor)
+            frontier = next_frontier
+
+    def get_distance(self, tile):
+        """Get the number of steps from a tile to the goal, -1 if unreachable"""
+        tile_x, tile_y = tile
+        if 0 <= tile_x < self.cols and 0 <= tile_y < self.rows:
+            return self.distances[tile_y * self.cols + tile_x]
+        return -1
+
+    def next_tile(self, tile):
+        """Get the neighbor tile one step closer to the goal, None if there is none"""
+        tile_x, tile_y = tile
+        if not (0 <= tile_x < self.cols and 0 <= tile_y < self.rows):
+            return None
+        step = self.next_steps[tile_y * self.cols + tile_x]
+        if step == NO_STEP:
+            return None
+        offset_x, offset_y = NEIGHBOR_OFFSETS[step]
+        return (tile_x + offset_x, tile_y + offset_y)
+
+
+class FlowFieldCache:
+    """Flow fields shared by all tanks, kept per goal tile for the current wall epoch"""
+
+    def __init__(self, tile_map, capacity=8):
+        self.tile_map = tile_map
+        self.capacity = capacity
+        self.fields = OrderedDict()
+        self.fields_built = 0
+
+    def get_field(self, goal):
+        """Get the flow field towards a goal tile, building it if needed"""
+        field = self.fields.get(goal)
+        if field is not None and field.epoch == self.tile_map.epoch:
+            self.fields.move_to_end(goal)
+            return field
+
+        field = FlowField(self.tile_map, goal)
+        self.fields_built += 1
+        self.fields[goal] = field
+        self.fields.move_to_end(goal)
+        if len(self.fields) > self.capacity:
+            self.fields.popitem(last=False)
+        return field
@@ -0,0 +1,264 @@
+import random
+import pygame
+from game_objects import *
+from tile_map import TileMap
+from spatial_grid import SpatialGrid, get_entry_time
+from bullet_manager import BulletManager
+from entity_list import EntityList
+from config_manager import config
+from game_controller import GameController
+
+
+class Simulation:
+    """Headless game state advanced one fixed step per call
+
+    Owns the map, tanks, bullets and controller but no window. Time comes
+    from an injected tick clock (time_ms, advanced by step_ms per step) and
+    randomness from a seeded RNG, so two simulations with the same seed
+    and inputs end in the same state. In deterministic mode the wall-clock
+    vision and AI frame budgets and the process planning pool are turned
+    off, since their results depend on how fast the machine is.
+    step_ms defaults to one step of game_settings.tick_rate.
+    """
+
+    def __init__(self, seed=None, step_ms=None, deterministic=True):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        if step_ms is None:
+            # Read here so config overrides made after import apply
+            step_ms = 1000 / config.get('game_settings.tick_rate', 60)
+        self.step_ms = step_ms
+        self.time_ms = 0.0
+        self.frame = 0
+        self.deterministic = deterministic
+        self.running = True
+
+        self.tanks = EntityList()
+        # Bullet arrays, updated in one vectorized step
+        self.bullets = BulletManager(config.get('bullet_settings.capacity', 256),
+                                     config.get('bullet_settings.pool_size', 8))
+        self.tile_map = TileMap()  # Tile array holding the walls and base
+        self.walls = self.tile_map.walls  # Wall views of the tile map
+        self.spatial_grid = SpatialGrid(self.tile_map)  # Collision buckets for walls and tanks
+        self.sweep_rect = pygame.Rect(0, 0, 0, 0)  # Reused by find_bullet_hit
+        self.base = None
+        self.game_over = False
+        self.winner = None
+        self.base_hit_by = None  # Team of the bullet that destroyed the base
+        self.hits = {}  # Team -> enemy tanks hit by its bullets
+
+        self.controller = GameController(self)
+        if deterministic:
+            self.controller.vision_system.frame_budget_ms = 0
+            self.controller.ai_system.decision_budget_ms = 0
+            self.controller.ai_system.close()
+
+    def get_ticks(self):
+        """Get the simulated time in milliseconds, like pygame.time.get_ticks"""
+        return int(self.time_ms)
+
+    def start(self, use_random_map=True):
+        """Start a new game without going through the menu"""
+        self.game_over = False
+        self.winner = None
+        self.base_hit_by = None
+        self.controller.start_new_game(use_random_map)
+
+    def step(self):
+        """Advance the game by one fixed step"""
+        if not self.game_over and self.controller.game_started:
+            # Remember positions for interpolated drawing
+            for tank in self.tanks:
+                tank.prev_x = tank.x
+                tank.prev_y = tank.y
+
+            # Update controller
+            self.controller.update()
+
+            # Update tanks
+            current_time = self.get_ticks()
+            for tank in self.tanks:
+                tank.update(current_time, self.rng)
+
+            # Update bullets
+            self.bullets.update()
+
+            # Check collisions, then drop bullets that left the screen
+            self.check_collisions()
+            self.bullets.kill_off_screen()
+
+            # Drop destroyed entities once per tick
+            self.tanks.compact()
+            self.bullets.compact()
+
+            # Check game over conditions
+            self.check_game_over()
+        else:
+            self.hold_positions()
+
+        self.frame += 1
+        self.time_ms += self.step_ms
+
+    def hold_positions(self):
+        """Set previous positions to the current ones for a step nothing moves in
+
+        Otherwise drawing keeps interpolating between the last two real
+        steps and tanks and bullets jitter, e.g. on the game over screen.
+        """
+        for tank in self.tanks:
+            tank.prev_x = tank.x
+            tank.prev_y = tank.y
+        n = self.bullets.count
+        self.bullets.prev_x[:n] = self.bullets.x[:n]
+        self.bullets.prev_y[:n] = self.bullets.y[:n]
+
+    def run(self, steps):
+        """Advance the game by a number of steps or until it is over"""
+        for _ in range(steps):
+            if self.game_over:
+                break
+            self.step()
+        return self.winner
+
+    def close(self):
+        """Release the AI planning pool"""
+        self.controller.ai_system.close()
+
+    def find_bullet_hit(self, bullet):
+        """Find the first wall, tank or base a bullet hit during its last move
+
+        The bullet is swept from its previous to its current position, so
+        fast bullets cannot pass through walls or tanks between frames.
+        Walls win ties. Returns (entity, 'walls' | 'tanks' | 'base') or
+        (None, None).
+        """
+        start_rect = self.sweep_rect
+        start_rect.update(bullet.prev_x, bullet.prev_y, bullet.size, bullet.size)
+        dx = bullet.x - bullet.prev_x
+        dy = bullet.y - bullet.prev_y
+
+        hit, hit_time = self.spatial_grid.sweep(start_rect, dx, dy, 'walls')
+        hit_layer = 'walls' if hit is not None else None
+        tank, t = self.spatial_grid.sweep(start_rect, dx, dy, 'tanks', bullet.owner)
+        if tank is not None and (hit is None or t < hit_time):
+            hit, hit_layer, hit_time = tank, 'tanks', t
+
+        if self.base:
+            t = get_entry_time(start_rect, dx, dy, self.base.rect)
+            if t is not None and (hit is None or t < hit_time):
+                hit, hit_layer = self.base, 'base'
+        return hit, hit_layer
+
+    def check_collisions(self):
+        """Check collisions
+
+        The bullet manager's broad phase picks the bullets that came near a
+        wall, tank or base; only those get the exact swept test.
+        """
+        for index in self.bullets.broad_phase(self.tile_map, self.spatial_grid, self.base):
+            bullet = self.bullets.get_bullet(index, pooled=True)
+            hit, hit_layer = self.find_bullet_hit(bullet)
+            if hit is None:
+                self.bullets.pool.release(bullet)
+                continue
+
+            if hit_layer == 'walls':
+                # Bullet-wall collision
+                if hit.wall_type == WallType.SOIL:
+                    self.walls.remove(hit)
+            elif hit_layer == 'tanks':
+                # Bullet-tank collision
+                hit.hit()
+                team = bullet.owner.team
+                if hit.team != team:
+                    # Friendly fire does not count as a hit
+                    self.hits[team] = self.hits.get(team, 0) + 1
+                # Mark destroyed tank for removal at the end of the tick
+                if not hit.is_alive and hit in self.tanks:
+                    self.tanks.kill(hit)
+                    self.spatial_grid.remove(hit)
+                    self.controller.ai_system.on_tank_destroyed(hit)
+            else:
+                # Bullet-base collision
+                self.game_over = True
+                self.winner = "enemy"
+                self.base_hit_by = bullet.owner.team
+            self.bullets.kill(index)
+            self.bullets.pool.release(bullet)
+
+    def check_game_over(self):
+        """Check game over conditions"""
+        # Only check game over if game has started
+        if not self.controller.game_started:
+            return
+
+        player_count = 0
+        enemy_count = 0
+        for tank in self.tanks:
+            if tank.tank_type == TankType.PLAYER:
+                player_count += 1
+            else:
+                enemy_count += 1
+
+        # Check if all enemies are destroyed
+        if not enemy_count:
+            self.game_over = True
+            self.winner = "player"
+
+        # Check if all players are destroyed
+        if not player_count:
+            self.game_over = True
+            self.winner = "enemy"
+
+
+class FixedTimestep:
+    """Turns wall-clock frame times into fixed simulation steps
+
+    Frame time accumulates and is spent in whole steps of step_ms, at most
+    max_catch_up_steps per frame. When that is not enough the frame is
+    either skipped (frame_skip, at most max_frame_skip frames in a row) so
+    the backlog is caught up on the next frames, or the backlog is dropped
+    and the game slows down instead of falling further behind. alpha is
+    the fraction of a step left over, for interpolated drawing.
+    """
+
+    def __init__(self, step_ms, max_catch_up_steps=5, frame_skip=False, max_frame_skip=5):
+        self.step_ms = step_ms
+        self.max_catch_up_steps = max_catch_up_steps
+        self.frame_skip = frame_skip
+        self.max_frame_skip = max_frame_skip
+        self.accumulator = 0.0
+        self.skipped = 0  # Frames skipped in a row
+        self.stats = {
+            'steps': 0,
+            'frames': 0,
+            'skipped_frames': 0,
+            'dropped_ms': 0.0
+        }
+
+    @property
+    def alpha(self):
+        """Fraction of a step between the last step and now"""
+        return min(self.accumulator / self.step_ms, 1.0)
+
+    def tick(self, elapsed_ms):
+        """Add a frame time, returns (steps to run, whether to draw)"""
+        self.accumulator += elapsed_ms
+        steps = min(int(self.accumulator // self.step_ms), self.max_catch_up_steps)
+        self.accumulator -= steps * self.step_ms
+        self.stats['steps'] += steps
+
+        if self.accumulator >= self.step_ms:
+            if self.frame_skip and self.skipped < self.max_frame_skip:
+                # Keep the backlog for the next frame and skip drawing
+                self.skipped += 1
+                self.stats['skipped_frames'] += 1
+                return steps, False
+            # Drop the backlog, the game runs slower than real time
+            dropped = self.accumulator - self.accumulator % self.step_ms
+            self.accumulator -= dropped
+            self.stats['dropped_ms'] += dropped
+
+        self.skipped = 0
+        self.stats['frames'] += 1
+        return steps, True
@@ -0,0 +1,266 @@
+from game_objects import *
+from tile_map import SOIL, METAL
+
+# Layer of each registered entity type in the grid
+LAYERS = {Tank: 'tanks'}
+
+
+def get_entry_time(rect, dx, dy, target):
+    """Get the fraction (0..1) of a move by (dx, dy) after which rect first
+    overlaps target, None if it does not overlap it during the move"""
+    return get_entry_time_bounds(rect, dx, dy, target.left, target.top,
+                                 target.right, target.bottom)
+
+
+def get_entry_time_bounds(rect, dx, dy, left, top, right, bottom):
+    """Like get_entry_time, with the target given by its edges
+
+    Lets wall tiles be tested without building a Rect for each of them.
+    """
+    if rect.left < right and rect.right > left and rect.top < bottom and rect.bottom > top:
+        return 0.0
+
+    t_enter = 0.0
+    t_exit = 1.0
+    if dx == 0:
+        if rect.right <= left or rect.left >= right:
+            return None  # Never overlaps on this axis
+    elif dx > 0:
+        t_enter = max(t_enter, (left - rect.right) / dx)
+        t_exit = min(t_exit, (right - rect.left) / dx)
+    else:
+        t_enter = max(t_enter, (right - rect.left) / dx)
+        t_exit = min(t_exit, (left - rect.right) / dx)
+
+    if dy == 0:
+        if rect.bottom <= top or rect.top >= bottom:
+            return None
+    elif dy > 0:
+        t_enter = max(t_enter, (top - rect.bottom) / dy)
+        t_exit = min(t_exit, (bottom - rect.top) / dy)
+    else:
+        t_enter = max(t_enter, (bottom - rect.top) / dy)
+        t_exit = min(t_exit, (top - rect.bottom) / dy)
+
+    # Only touching edges (or overlapping after the move) is not a hit
+    if t_enter >= t_exit:
+        return None
+    return t_enter
+
+
+class SpatialGrid:
+    """Uniform grid of WALL_SIZE cells bucketing walls and tanks
+
+    Tanks are stored in every cell their rect overlaps and update their
+    cells when they move. Bullets live in the BulletManager arrays and are
+    not registered; they query the grid instead. The walls
+    layer is the tile map itself, whose tiles are the same cells. A
+    collision query only tests the entities in the cells it overlaps.
+    Buckets are insertion ordered dicts, which keeps query results in a
+    stable order from run to run.
+    """
+
+    def __init__(self, tile_map):
+        self.tile_map = tile_map
+        self.cell_size = tile_map.tile_size
+        # Layer name -> {(cell_x, cell_y): {entity: None}}
+        self.layers = {layer: {} for layer in LAYERS.values()}
+        # Entity -> cell range it is stored in
+        self.cell_ranges = {}
+
+    def __len__(self):
+        return len(self.cell_ranges)
+
+    def __contains__(self, entity):
+        return entity in self.cell_ranges
+
+    def get_cell_range(self, rect):
+        """Get (min_x, min_y, max_x, max_y) of the cells overlapped by a rect"""
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def insert(self, entity):
+        """Register an entity in the cells it overlaps"""
+        if entity in self.cell_ranges:
+            self.update(entity)
+            return
+        cell_range = self.get_cell_range(entity.rect)
+        self.add_to_cells(entity, cell_range)
+        self.cell_ranges[entity] = cell_range
+        entity.spatial_grid = self
+
+    def remove(self, entity):
+        """Unregister an entity, ignoring entities not in the grid"""
+        cell_range = self.cell_ranges.pop(entity, None)
+        if cell_range is None:
+            return
+        self.remove_from_cells(entity, cell_range)
+        entity.spatial_grid = None
+
+    def update(self, entity):
+        """Move an entity to the cells of its current rect"""
+        cell_range = self.get_cell_range(entity.rect)
+        old_range = self.cell_ranges[entity]
+        if cell_range == old_range:
+            return
+        self.remove_from_cells(entity, old_range)
+        self.add_to_cells(entity, cell_range)
+        self.cell_ranges[entity] = cell_range
+
+    def add_to_cells(self, entity, cell_range):
+        """Add an entity to the buckets of a cell range"""
+        cells = self.layers[LAYERS[type(entity)]]
+        min_x, min_y, max_x, max_y = cell_range
+        for cell_y in range(min_y, max_y + 1):
+            for cell_x in range(min_x, max_x + 1):
+                bucket = cells.get((cell_x, cell_y))
+                if bucket is None:
+                    bucket = cells[(cell_x, cell_y)] = {}
+                bucket[entity] = None
+
+    def remove_from_cells(self, entity, cell_range):
+        """Remove an entity from the buckets of a cell range"""
+        cells = self.layers[LAYERS[type(entity)]]
+        min_x, min_y, max_x, max_y = cell_range
+        for cell_y in range(min_y, max_y + 1):
+            for cell_x in range(min_x, max_x + 1):
+                bucket = cells[(cell_x, cell_y)]
+                del bucket[entity]
+                if not bucket:
+                    del cells[(cell_x, cell_y)]
+
+    def clear(self):
+        """Unregister all entities"""
+        for entity in self.cell_ranges:
+            entity.spatial_grid = None
+        for cells in self.layers.values():
+            cells.clear()
+        self.cell_ranges.clear()
+
+    def rebuild(self, tanks):
+        """Rebuild the grid from the tank list"""
+        self.clear()
+        for tank in tanks:
+            self.insert(tank)
+
+    def get_bucket(self, layer, cell):
+        """Get the entities of a layer stored in a cell"""
+        if layer == 'walls':
+            wall = self.tile_map.get_wall(*cell)
+            return (wall,) if wall is not None else ()
+        return self.layers[layer].get(cell, ())
+
+    def query(self, rect, layer, exclude=None):
+        """Get entities of a layer whose rects collide with a rect"""
+        min_x, min_y, max_x, max_y = self.get_cell_range(rect)
+        found = {}
+        for cell_y in range(min_y, max_y + 1):
+            for cell_x in range(min_x, max_x + 1):
+                for entity in self.get_bucket(layer, (cell_x, cell_y)):
+                    if entity is not exclude and entity not in found and rect.colliderect(entity.rect):
+                        found[entity] = None
+        return list(found)
+
+    def collides(self, rect, layer, exclude=None):
+        """Check if any entity of a layer collides with a rect
+
+        Like bool(query(...)) without building a result list or Wall views:
+        walls fill whole cells, so any wall tile in the rect's cells collides.
+        """
+        min_x, min_y, max_x, max_y = self.get_cell_range(rect)
+        if layer == 'walls':
+            is_blocked = self.tile_map.is_blocked
+            for cell_y in range(min_y, max_y + 1):
+                for cell_x in range(min_x, max_x + 1):
+                    if is_blocked(cell_x, cell_y):
+                        return True
+            return False
+
+        cells = self.layers[layer]
+        for cell_y in range(min_y, max_y + 1):
+            for cell_x in range(min_x, max_x + 1):
+                bucket = cells.get((cell_x, cell_y))
+                if bucket:
+                    for entity in bucket:
+                        if entity is not exclude and rect.colliderect(entity.rect):
+                            return True
+        return False
+
+    def sweep(self, rect, dx, dy, layer, exclude=None):
+        """Find the first entity of a layer hit by a rect moving by (dx, dy)
+
+        Walks the cells covered by the move in the order of motion and
+        returns (entity, t), where t is the fraction of the move done
+        before contact, or (None, None) if nothing is hit. Wall tiles are
+        tested by their codes; only a hit wall gets a Wall view.
+        """
+        size = self.cell_size
+        # Cells of the rect's union with its moved copy (Rect.move truncates)
+        move_x = int(dx)
+        move_y = int(dy)
+        min_x = (rect.left + min(move_x, 0)) // size
+        max_x = (rect.right + max(move_x, 0) - 1) // size
+        min_y = (rect.top + min(move_y, 0)) // size
+        max_y = (rect.bottom + max(move_y, 0) - 1) // size
+        xs = range(min_x, max_x + 1) if dx >= 0 else range(max_x, min_x - 1, -1)
+        ys = range(min_y, max_y + 1) if dy >= 0 else range(max_y, min_y - 1, -1)
+        # Slices across the main axis of motion, nearest first
+        horizontal = abs(dx) >= abs(dy)
+        outer, inner = (xs, ys) if horizontal else (ys, xs)
+
+        walls = layer == 'walls'
+        tile_map = self.tile_map
+        tiles = tile_map.tiles
+        cols = tile_map.cols
+        rows = tile_map.rows
+        cells = None if walls else self.layers[layer]
+        hit = None
+        hit_time = None
+        for a in outer:
+            for b in inner:
+                if horizontal:
+                    cell_x, cell_y = a, b
+                else:
+                    cell_x, cell_y = b, a
+                if walls:
+                    if not (0 <= cell_x < cols and 0 <= cell_y < rows):
+                        continue
+                    code = tiles[cell_y * cols + cell_x]
+                    if code != SOIL and code != METAL:
+                        continue
+                    left = cell_x * size
+                    top = cell_y * size
+                    t = get_entry_time_bounds(rect, dx, dy, left, top, left + size, top + size)
+                    if t is not None and (hit is None or t < hit_time):
+                        hit = (cell_x, cell_y)
+                        hit_time = t
+                else:
+                    bucket = cells.get((cell_x, cell_y))
+                    if not bucket:
+                        continue
+                    # Tanks spanning several cells are tested again with the
+                    # same result, which never replaces an earlier hit
+                    for entity in bucket:
+                        if entity is exclude:
+                            continue
+                        t = get_entry_time(rect, dx, dy, entity.rect)
+                        if t is not None and (hit is None or t < hit_time):
+                            hit = entity
+                            hit_time = t
+            # With straight moves later slices cannot be hit earlier
+            if hit is not None and (dx == 0 or dy == 0):
+                break
+
+        if walls and hit is not None:
+            hit = tile_map.get_wall(*hit)
+        return hit, hit_time
+
+    def get_stats(self):
+        """Get entity and occupied cell counts per layer"""
+        stats = {layer: 0 for layer in self.layers}
+        for entity in self.cell_ranges:
+            stats[LAYERS[type(entity)]] += 1
+        stats['walls'] = len(self.tile_map.walls)
+        stats['cells'] = sum(len(cells) for cells in self.layers.values())
+        return stats
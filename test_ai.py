@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test AI decision scheduling and AI state
+Runs without a display window
+"""
+
+import sys
+from types import SimpleNamespace
+from game_objects import Tank, Base, Wall, WallType, Direction, TankType
+from tile_map import TileMap
+from spatial_grid import SpatialGrid
+from game_controller import GameController
+from simulation import Simulation
+
+def make_game(tanks=()):
+    """Create a minimal game object with a controller"""
+    game = SimpleNamespace(walls=[], tanks=list(tanks), bullets=[], base=None,
+                           game_over=False, winner=None)
+    game.tile_map = TileMap()
+    game.spatial_grid = SpatialGrid(game.tile_map)
+    game.spatial_grid.rebuild(game.tanks)
+    game.controller = GameController(game)
+    return game
+
+def make_enemies(count):
+    """Create enemy tanks in a row"""
+    return [Tank(40 + (i % 15) * 45, 40 + (i // 15) * 45, TankType.ENEMY_NORMAL,
+                 (0, 0, 255), Direction.DOWN) for i in range(count)]
+
+def test_decision_phases():
+    """Test tanks spawned together get different decision phases"""
+    enemies = make_enemies(10)
+    game = make_game(enemies)
+    ai = game.controller.ai_system
+    ai.update_ai()
+
+    decision_times = {tank.ai_state.last_decision_time for tank in enemies}
+    assert len(decision_times) == len(enemies)
+    print("✓ Decisions are phase-offset per tank")
+
+def test_decision_budget():
+    """Test decisions beyond the frame budget are carried over"""
+    enemies = make_enemies(5)
+    game = make_game(enemies)
+    ai = game.controller.ai_system
+    ai.update_ai()
+
+    # Make every decision due and leave room for only one per frame
+    for tank in enemies:
+        tank.ai_state.last_decision_time = -10**9
+    ai.decision_budget_ms = 1e-9
+
+    ai.update_ai()
+    stats = ai.get_ai_stats()
+    assert stats['decisions'] == 1 and stats['deferred'] == 4
+
+    for _ in range(4):
+        ai.update_ai()
+    stats = ai.get_ai_stats()
+    assert stats['deferred'] == 0
+    assert stats['total_decisions'] >= 5
+    assert stats['worst_frame_ms'] >= stats['frame_ms']
+    print("✓ Decisions respect the frame budget")
+
+def test_ai_state_lifecycle():
+    """Test AI state is owned by the tank and released on death and reset"""
+    enemies = make_enemies(3)
+    game = make_game(enemies)
+    ai = game.controller.ai_system
+    ai.update_ai()
+    assert all(tank.ai_state is not None for tank in enemies)
+
+    # Slotted state rejects unknown attributes
+    try:
+        enemies[0].ai_state.unknown = 1
+        assert False, "AIState accepted an unknown attribute"
+    except AttributeError:
+        pass
+
+    ai.on_tank_destroyed(enemies[0])
+    assert enemies[0].ai_state is None
+
+    enemies[1].ai_state.decision_pending = True
+    ai.decision_queue.append(enemies[1])
+    ai.reset()
+    assert not ai.decision_queue and ai.tanks_seen == 0
+    print("✓ AI state lifecycle works")
+
+def test_spawn_hook():
+    """Test enemy tanks get their AI state when they are registered"""
+    sim = Simulation(4)
+    sim.start()
+    enemies = [tank for tank in sim.tanks if tank.tank_type != TankType.PLAYER]
+    assert all(tank.ai_state is not None for tank in enemies)
+    assert sim.controller.get_player_tank().ai_state is None
+    assert sim.controller.ai_system.tanks_seen == len(enemies)
+    sim.close()
+    print("✓ Spawned tanks are registered with the AI")
+
+def test_defend_unreachable_base():
+    """Test a defender walled off from the base patrols instead of stopping"""
+    commander = Tank(40, 40, TankType.ENEMY_COMMANDER, (0, 0, 255), Direction.DOWN)
+    game = make_game([commander])
+    game.base = Base(360, 480)
+    game.tile_map.set_base(game.base)
+    for tile_x in range(8, 11):
+        for tile_y in range(11, 14):
+            if (tile_x, tile_y) != (9, 12):
+                game.tile_map.add_wall(Wall(tile_x * 40, tile_y * 40, WallType.METAL))
+
+    ai = game.controller.ai_system
+    ai.update_ai()
+    state = commander.ai_state
+    state.state = 'defend'
+    start = (commander.x, commander.y)
+    for _ in range(30):
+        ai.execute_defend(commander, state)
+    assert state.state == 'defend' and state.defend_target is None
+    assert state.patrol_target is not None
+    assert (commander.x, commander.y) != start
+    print("✓ Walled-off defenders keep patrolling")
+
+def main():
+    """Main test function"""
+    print("Starting AI test...")
+    print("=" * 50)
+
+    test_decision_phases()
+    test_decision_budget()
+    test_ai_state_lifecycle()
+    test_spawn_hook()
+    test_defend_unreachable_base()
+
+    print("=" * 50)
+    print("✓ All AI tests passed!")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test memory allocations of game objects and simulated frames with tracemalloc
+Runs without a display window
+"""
+
+import sys
+import tracemalloc
+from game_objects import Tank, Bullet, Base, Direction, TankType
+from simulation import Simulation
+
+# Per-object bound as a multiple of the object and rect sizes, leaving
+# room for the GC headers and ints tracemalloc counts on top of them
+OBJECT_SIZE_MARGIN = 2
+# Upper bounds, about 1.5 times the measured values
+MAX_FRAME_PEAK_BYTES = 160 * 1024  # Measured about 104 KiB
+MAX_FRAME_GROWTH_BYTES = 1024
+MAX_COLLISION_CHECK_BYTES = 16
+MAX_BULLET_SWEEP_BYTES = 512  # Measured 320, the Wall view of a hit and floats
+
+def measure_growth(create, count):
+    """Get the traced bytes per object kept alive by create"""
+    start = tracemalloc.get_traced_memory()[0]
+    objects = [create(i) for i in range(count)]
+    size = (tracemalloc.get_traced_memory()[0] - start) / count
+    del objects
+    return size
+
+def test_slotted_objects():
+    """Test game objects have no per-instance dict"""
+    tank = Tank(0, 0, TankType.ENEMY_NORMAL, (0, 0, 255))
+    for obj in (tank, Bullet(0, 0, Direction.UP, tank), Base(0, 0)):
+        assert not hasattr(obj, '__dict__'), type(obj).__name__
+    try:
+        tank.unknown_attribute = 1
+        assert False, "Set an undeclared attribute"
+    except AttributeError:
+        pass
+
+    tracemalloc.start()
+    try:
+        tank_bytes = measure_growth(
+            lambda i: Tank(i, 0, TankType.ENEMY_NORMAL, (0, 0, 255)), 1000)
+        bullet_bytes = measure_growth(lambda i: Bullet(i, 0, Direction.UP, tank), 1000)
+    finally:
+        tracemalloc.stop()
+    bullet = Bullet(0, 0, Direction.UP, tank)
+    max_tank_bytes = (sys.getsizeof(tank) + sys.getsizeof(tank.rect)) * OBJECT_SIZE_MARGIN
+    max_bullet_bytes = (sys.getsizeof(bullet) + sys.getsizeof(bullet.rect)) * OBJECT_SIZE_MARGIN
+    assert tank_bytes < max_tank_bytes, (tank_bytes, max_tank_bytes)
+    assert bullet_bytes < max_bullet_bytes, (bullet_bytes, max_bullet_bytes)
+    print(f"✓ Objects are slotted ({tank_bytes:.0f} bytes per tank, {bullet_bytes:.0f} per bullet)")
+
+def test_collision_checks():
+    """Test collision checks keep no memory and reuse their probe rect"""
+    sim = Simulation(8)
+    sim.start()
+    controller = sim.controller
+    tank = controller.get_player_tank()
+    bullet = Bullet(100, 100, Direction.UP, tank)
+    probe = controller.probe_rect
+
+    tracemalloc.start()
+    try:
+        controller.check_tank_wall_collision(tank, 1, 0)
+        start = tracemalloc.get_traced_memory()[0]
+        for _ in range(1000):
+            controller.check_tank_wall_collision(tank, 1, 0)
+            controller.check_tank_wall_collision(tank, 0, -1)
+            controller.check_bullet_wall_collision(bullet)
+        growth = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+        sim.close()
+    assert controller.probe_rect is probe
+    assert growth < MAX_COLLISION_CHECK_BYTES * 1000, growth
+    print("✓ Collision checks do not allocate rects")
+
+def test_bullet_sweep():
+    """Test swept bullet checks build no per-cell Rects, Walls or lists"""
+    sim = Simulation(8)
+    sim.start()
+    tank = sim.controller.get_player_tank()
+    # One bullet crossing open cells, one hitting the left border wall
+    missing = Bullet(300, 300, Direction.UP, tank)
+    missing.prev_y = 330
+    hitting = Bullet(0, 300, Direction.LEFT, tank)
+    hitting.prev_x = 60
+    sweep_rect = sim.sweep_rect
+    assert sim.find_bullet_hit(missing) == (None, None)
+    assert sim.find_bullet_hit(hitting)[1] == 'walls'
+
+    tracemalloc.start()
+    try:
+        worst_peak = 0
+        for bullet in (missing, hitting) * 50:
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            sim.find_bullet_hit(bullet)
+            worst_peak = max(worst_peak, tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+        sim.close()
+    assert sim.sweep_rect is sweep_rect
+    assert worst_peak < MAX_BULLET_SWEEP_BYTES, worst_peak
+    print(f"✓ Bullet sweeps allocate at most {worst_peak} bytes at once")
+
+def fire_enemy_shots(sim):
+    """Make every enemy tank fire a bullet"""
+    for tank in sim.tanks:
+        if tank.tank_type != TankType.PLAYER:
+            tank.last_shot_time = -10**9
+            bullet = tank.shoot(sim.get_ticks())
+            if bullet:
+                sim.bullets.append(bullet)
+
+def test_frame_allocations():
+    """Test allocations per simulated frame stay bounded
+
+    Every frame the enemies fire, so the bullet update, broad phase,
+    sweep and pool paths run against walls and tanks.
+    """
+    sim = Simulation(8)
+    sim.start()
+    sim.base = None  # Keep the game running under fire
+    for tank in sim.tanks:
+        tank.hit_points = 10**9
+    # Warm up until the bullet arrays stop growing
+    for _ in range(300):
+        fire_enemy_shots(sim)
+        sim.step()
+    wall_count = len(sim.walls)
+    hit_points = sum(tank.hit_points for tank in sim.tanks)
+
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        worst_peak = 0
+        for _ in range(120):
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            fire_enemy_shots(sim)
+            sim.step()
+            worst_peak = max(worst_peak, tracemalloc.get_traced_memory()[1] - current)
+        growth = (tracemalloc.get_traced_memory()[0] - start) / 120
+    finally:
+        tracemalloc.stop()
+        sim.close()
+    assert len(sim.walls) < wall_count, "No wall was hit"
+    assert sum(tank.hit_points for tank in sim.tanks) < hit_points, "No tank was hit"
+    assert worst_peak < MAX_FRAME_PEAK_BYTES, worst_peak
+    assert growth < MAX_FRAME_GROWTH_BYTES, growth
+    print(f"✓ Frames allocate at most {worst_peak} bytes at once, keep {growth:.0f} bytes")
+
+def main():
+    """Main test function"""
+    print("Starting allocation test...")
+    print("=" * 50)
+
+    test_slotted_objects()
+    test_collision_checks()
+    test_bullet_sweep()
+    test_frame_allocations()
+
+    print("=" * 50)
+    print("✓ All allocation tests passed!")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test the headless batch match runner
+Runs without a display window
+"""
+
+import os
+import sys
+import csv
+import json
+import tempfile
+from batch_runner import (parse_grid, build_matches, play_match, run_batch, summarize,
+                          apply_overrides, PlayerBot, BASE_CONFIG)
+from simulation import Simulation
+from config_manager import config
+
+def test_grid():
+    """Test settings are parsed and expanded into matches"""
+    grid = parse_grid(['enemy_settings.normal_tank.speed=1,2.5', 'difficulty=easy,hard'])
+    assert grid == {'enemy_settings.normal_tank.speed': [1, 2.5], 'difficulty': ['easy', 'hard']}
+
+    jobs = build_matches(grid, 3, seed=10)
+    assert len(jobs) == 12
+    assert [match_id for match_id, _, _ in jobs] == list(range(12))
+    # Every combination is played on the same seeds
+    assert [seed for _, seed, _ in jobs[:3]] == [10, 11, 12] == [seed for _, seed, _ in jobs[3:6]]
+    assert jobs[0][2] == {'enemy_settings.normal_tank.speed': 1, 'difficulty': 'easy'}
+
+    for setting in ('no_value', 'game_settings.tick_rate=30,120'):
+        try:
+            parse_grid([setting])
+            assert False, f"Accepted {setting}"
+        except ValueError:
+            pass
+    print("✓ Setting grid expands into matches")
+
+def test_play_match():
+    """Test matches are reproducible and overrides are reset"""
+    overrides = {'player_settings.hit_points': 3}
+    first = play_match(0, 4, overrides, 300)
+    second = play_match(0, 4, overrides, 300)
+    first.pop('wall_ms')
+    second.pop('wall_ms')
+    assert first == second
+    assert first['player_settings.hit_points'] == 3
+    assert first['winner'] in ('player', 'enemy', 'timeout')
+    assert first['steps'] <= 300
+
+    play_match(1, 4, {}, 1)
+    assert config.get('player_settings.hit_points') == BASE_CONFIG['player_settings']['hit_points']
+    print("✓ Matches are reproducible")
+
+def test_attack_chance_override():
+    """Test the swept attack chance changes how often enemies fire"""
+    shots = []
+    for attack_chance in (0.0, 1.0):
+        overrides = {'enemy_settings.normal_tank.attack_chance': attack_chance,
+                     'enemy_settings.commander_tank.attack_chance': attack_chance}
+        shots.append(play_match(0, 0, overrides, 600)['enemy_shots'])
+    assert shots[0] == 0 and shots[1] > 0, shots
+    print("✓ Attack chance override changes enemy fire")
+
+def test_bot_spares_own_base():
+    """Test the player bot never ends a match by shooting its own base"""
+    apply_overrides({})
+    for seed in range(8):
+        sim = Simulation(seed)
+        sim.start()
+        bot = PlayerBot(sim)
+        while not sim.game_over and sim.frame < 1500:
+            bot.update()
+            sim.step()
+        sim.close()
+        assert sim.base_hit_by != 'player', seed
+    print("✓ Player bot does not shoot its own base")
+
+def test_run_batch():
+    """Test results are streamed to JSONL and CSV files"""
+    grid = {'enemy_settings.normal_tank.vision_range': [60, 200]}
+    with tempfile.TemporaryDirectory() as directory:
+        jsonl_path = os.path.join(directory, 'results.jsonl')
+        results = run_batch(grid, 2, jsonl_path, workers=2, max_steps=120)
+        with open(jsonl_path, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        assert sorted(line['match_id'] for line in lines) == [0, 1, 2, 3]
+        assert len(results) == 4
+
+        csv_path = os.path.join(directory, 'results.csv')
+        run_batch(grid, 1, csv_path, workers=2, max_steps=120)
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 2
+        assert sorted(row['enemy_settings.normal_tank.vision_range'] for row in rows) == ['200', '60']
+
+    summary = summarize(results, list(grid))
+    assert [row['matches'] for row in summary] == [2, 2]
+    print("✓ Results are streamed to JSONL and CSV")
+
+def main():
+    """Main test function"""
+    print("Starting batch runner test...")
+    print("=" * 50)
+
+    test_grid()
+    test_play_match()
+    test_attack_chance_override()
+    test_bot_spares_own_base()
+    test_run_batch()
+
+    print("=" * 50)
+    print("✓ All batch runner tests passed!")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test NumPy bullet manager
+Runs without a display window
+"""
+
+import sys
+import random
+import pygame
+from game_objects import Tank, Bullet, Wall, Direction, TankType, WallType
+from tile_map import TileMap
+from spatial_grid import SpatialGrid, get_entry_time
+from bullet_manager import BulletManager, BulletPool
+from simulation import Simulation
+
+def random_bullets(rng, count, owner):
+    """Create bullets at random positions"""
+    bullets = []
+    for _ in range(count):
+        bullet = Bullet(rng.randint(0, 792), rng.randint(0, 592), rng.choice(list(Direction)), owner)
+        bullet.speed = rng.choice([5, 12, 60])
+        bullets.append(bullet)
+    return bullets
+
+def test_vectorized_update():
+    """Test batch update matches per-bullet updates"""
+    rng = random.Random(5)
+    owner = Tank(0, 0, TankType.PLAYER, (255, 0, 0))
+    bullets = random_bullets(rng, 300, owner)
+    manager = BulletManager(capacity=4)
+    for bullet in bullets:
+        manager.append(bullet)
+    assert len(manager) == 300
+
+    for _ in range(3):
+        manager.update()
+        for bullet in bullets:
+            bullet.update()
+    for bullet, view in zip(bullets, manager):
+        assert (view.x, view.y) == (bullet.x, bullet.y)
+        assert (view.prev_x, view.prev_y) == (bullet.prev_x, bullet.prev_y)
+        assert view.direction == bullet.direction and view.owner is owner
+    print("✓ Batch update matches per-bullet update")
+
+def test_cull_and_compact():
+    """Test dead and off-screen bullets are compacted away in order"""
+    owner = Tank(0, 0, TankType.PLAYER, (255, 0, 0))
+    manager = BulletManager()
+    for x in (10, 798, 300, 400):
+        manager.append(Bullet(x, 100, Direction.RIGHT, owner))
+    manager.update()
+    manager.kill(2)
+    manager.kill_off_screen()
+    manager.compact()
+    assert [bullet.x for bullet in manager] == [15, 405]
+
+    manager.clear()
+    assert len(manager) == 0 and not manager.owners
+    print("✓ Dead bullets are compacted")
+
+def test_broad_phase():
+    """Test broad phase keeps every bullet with an exact hit"""
+    rng = random.Random(9)
+    walls = [Wall(rng.randint(0, 19) * 40, rng.randint(0, 14) * 40, WallType.SOIL)
+             for _ in range(50)]
+    tanks = [Tank(rng.randint(0, 760), rng.randint(0, 560), TankType.ENEMY_NORMAL, (0, 0, 255))
+             for _ in range(8)]
+    tile_map = TileMap()
+    tile_map.rebuild(walls)
+    grid = SpatialGrid(tile_map)
+    grid.rebuild(tanks)
+    shooter = Tank(0, 0, TankType.PLAYER, (255, 0, 0))
+
+    manager = BulletManager()
+    for bullet in random_bullets(rng, 500, shooter):
+        manager.append(bullet)
+    manager.update()
+    candidates = set(manager.broad_phase(tile_map, grid))
+
+    exact_hits = 0
+    for index, bullet in enumerate(manager):
+        start_rect = pygame.Rect(bullet.prev_x, bullet.prev_y, bullet.size, bullet.size)
+        dx = bullet.x - bullet.prev_x
+        dy = bullet.y - bullet.prev_y
+        hit = any(get_entry_time(start_rect, dx, dy, entity.rect) is not None
+                  for entity in list(tile_map.walls) + tanks)
+        if hit:
+            exact_hits += 1
+            assert index in candidates
+    assert exact_hits and len(candidates) < len(manager)
+    print("✓ Broad phase keeps every hit")
+
+def test_bullet_pool():
+    """Test shots reuse pooled bullets and exhaustion is counted"""
+    pool = BulletPool(2)
+    tank = Tank(100, 100, TankType.PLAYER, (255, 0, 0), Direction.RIGHT)
+    first = pool.acquire(1, 2, Direction.UP, tank)
+    second = pool.acquire(3, 4, Direction.DOWN, tank)
+    third = pool.acquire(5, 6, Direction.LEFT, tank)
+    assert (third.x, third.y, third.rect.topleft) == (5, 6, (5, 6))
+    assert pool.get_stats()['exhausted'] == 1 and not pool.free
+
+    for bullet in (first, second, third):
+        pool.release(bullet)
+    assert first.owner is None  # Does not keep the tank alive
+    assert len(pool.free) == 2  # Bounded by the capacity
+    assert pool.acquire(0, 0, Direction.UP, tank) in (first, second)
+    pool.release(Bullet(0, 0, Direction.UP, tank))  # Not pooled, ignored
+    assert len(pool.free) == 1
+
+    # Tank.shoot takes bullets from the pool and append gives them back
+    manager = BulletManager(capacity=4)
+    tank.bullet_pool = manager.pool
+    bullet = tank.shoot(10**6)
+    assert bullet.pooled and bullet.speed == tank.bullet_speed
+    manager.append(bullet)
+    assert manager.pool.free[-1] is bullet and len(manager) == 1
+    assert manager.get_bullet(0).x == tank.x + tank.size + 5
+    print("✓ Bullet pool reuses bullets")
+
+def test_pool_in_game():
+    """Test a running game releases every bullet it takes from the pool"""
+    sim = Simulation(11)
+    sim.start()
+    for tank in sim.tanks:
+        tank.hit_points = 10**9  # Keep the game running
+    for _ in range(1200):
+        sim.step()
+    sim.close()
+    stats = sim.bullets.pool.get_stats()
+    assert stats['acquired'] > 0 and stats['acquired'] == stats['released']
+    assert stats['exhausted'] == 0 and stats['free'] == stats['capacity']
+    # Only a few bullets are out at once, the pool is sized apart from the arrays
+    assert stats['capacity'] < len(sim.bullets.x)
+    print("✓ Game bullets return to the pool")
+
+def main():
+    """Main test function"""
+    print("Starting bullet test...")
+    print("=" * 50)
+
+    test_vectorized_update()
+    test_cull_and_compact()
+    test_broad_phase()
+    test_bullet_pool()
+    test_pool_in_game()
+
+    print("=" * 50)
+    print("✓ All bullet tests passed!")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
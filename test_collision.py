@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Test spatial grid and collision checks
+Runs without a display window
+"""
+
+import os
+import sys
+import random
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from types import SimpleNamespace
+from game_objects import Tank, Bullet, Wall, Direction, TankType, WallType
+from tile_map import TileMap
+from spatial_grid import SpatialGrid, get_entry_time
+from game_controller import GameController
+from simulation import Simulation
+
+def make_game(walls=(), tanks=(), bullets=()):
+    """Create a minimal game object with a controller"""
+    game = SimpleNamespace(tanks=list(tanks), bullets=list(bullets),
+                           base=None, game_over=False, winner=None)
+    game.tile_map = TileMap()
+    game.tile_map.rebuild(walls)
+    game.walls = game.tile_map.walls
+    game.spatial_grid = SpatialGrid(game.tile_map)
+    game.spatial_grid.rebuild(game.tanks)
+    game.controller = GameController(game)
+    return game
+
+def test_grid_query():
+    """Test grid queries match brute force collision tests"""
+    rng = random.Random(3)
+    walls = [Wall(rng.randint(0, 19) * 40, rng.randint(0, 14) * 40, WallType.SOIL)
+             for _ in range(60)]
+    tanks = [Tank(rng.uniform(0, 760), rng.uniform(0, 560), TankType.ENEMY_NORMAL,
+                  (0, 0, 255)) for _ in range(30)]
+    tile_map = TileMap()
+    tile_map.rebuild(walls)
+    grid = SpatialGrid(tile_map)
+    grid.rebuild(tanks)
+
+    for _ in range(200):
+        rect = pygame.Rect(rng.randint(-20, 800), rng.randint(-20, 600),
+                           rng.randint(1, 60), rng.randint(1, 60))
+        expected_walls = {wall for wall in walls if rect.colliderect(wall.rect)}
+        expected_tanks = {id(tank) for tank in tanks if rect.colliderect(tank.rect)}
+        assert set(grid.query(rect, 'walls')) == expected_walls
+        assert {id(tank) for tank in grid.query(rect, 'tanks')} == expected_tanks
+    print("✓ Grid queries match brute force")
+
+def test_grid_tracks_moves():
+    """Test entities update their cells when they move"""
+    tank = Tank(100, 100, TankType.PLAYER, (255, 0, 0), Direction.RIGHT)
+    grid = SpatialGrid(TileMap())
+    grid.rebuild([tank])
+
+    tank.set_position(500, 300)
+    assert grid.query(pygame.Rect(100, 100, 40, 40), 'tanks') == []
+    assert grid.query(pygame.Rect(510, 310, 10, 10), 'tanks') == [tank]
+
+    for _ in range(20):
+        tank.move(1, 0)
+    assert grid.query(tank.rect, 'tanks') == [tank]
+    assert grid.query(pygame.Rect(500, 300, 8, 8), 'tanks') == []
+
+    # Removed entities stop moving their cells
+    grid.remove(tank)
+    tank.move(1, 0)
+    assert tank not in grid and tank.spatial_grid is None
+    assert grid.get_stats()['tanks'] == 0
+    print("✓ Grid tracks moving entities")
+
+def test_tank_collision():
+    """Test tank movement is blocked by nearby walls and tanks"""
+    tank = Tank(80, 80, TankType.PLAYER, (255, 0, 0), Direction.RIGHT)
+    other = Tank(80, 121, TankType.ENEMY_NORMAL, (0, 0, 255), Direction.UP)
+    wall = Wall(120, 80, WallType.METAL)
+    game = make_game([wall], [tank, other])
+    controller = game.controller
+
+    assert controller.check_tank_wall_collision(tank, 1, 0)
+    assert controller.check_tank_wall_collision(tank, 0, 1)
+    assert not controller.check_tank_wall_collision(tank, -1, 0)
+    assert controller.check_bullet_wall_collision(Bullet(125, 90, Direction.UP, tank))
+    assert not controller.check_bullet_wall_collision(Bullet(60, 90, Direction.UP, tank))
+    print("✓ Tank collision uses the grid")
+
+def test_entry_time():
+    """Test swept rect entry times"""
+    bullet_rect = pygame.Rect(0, 16, 8, 8)
+    wall_rect = pygame.Rect(40, 0, 40, 40)
+
+    assert get_entry_time(bullet_rect, 64, 0, wall_rect) == 0.5
+    assert get_entry_time(bullet_rect, 200, 0, wall_rect) == 32 / 200
+    # Stopping right at the face is not a hit
+    assert get_entry_time(bullet_rect, 32, 0, wall_rect) is None
+    # Moving away or beside the wall
+    assert get_entry_time(bullet_rect, -50, 0, wall_rect) is None
+    assert get_entry_time(pygame.Rect(0, 50, 8, 8), 200, 0, wall_rect) is None
+    # Starting inside the wall
+    assert get_entry_time(pygame.Rect(50, 16, 8, 8), 10, 0, wall_rect) == 0.0
+    print("✓ Swept entry times are correct")
+
+def test_swept_bullets():
+    """Test fast bullets hit the first wall or tank on their way"""
+    game = Simulation()
+    shooter = Tank(0, 280, TankType.PLAYER, (255, 0, 0), Direction.RIGHT)
+    target = Tank(520, 280, TankType.ENEMY_NORMAL, (0, 0, 255), Direction.LEFT)
+    soil = Wall(200, 280, WallType.SOIL)
+    game.walls.append(soil)
+    game.tanks.append(shooter)
+    game.tanks.append(target)
+    game.spatial_grid.rebuild(game.tanks)
+
+    # A bullet moving 600px per frame would skip the wall with point checks
+    for expected_hit in (soil, target):
+        shooter.bullet_speed = 600
+        shooter.last_shot_time = -10**9
+        game.bullets.append(shooter.shoot())
+        game.bullets.update()
+        assert game.bullets.broad_phase(game.tile_map, game.spatial_grid) == [0]
+        assert game.find_bullet_hit(game.bullets.get_bullet(0))[0] == expected_hit
+        game.check_collisions()
+        game.tanks.compact()
+        game.bullets.compact()
+        assert not game.bullets
+
+    assert soil not in game.walls and not game.tile_map.is_blocked(5, 7)
+    assert target not in game.tanks and not target.is_alive
+    print("✓ Fast bullets do not tunnel")
+
+def test_hit_counts():
+    """Test only hits on the other team are counted"""
+    game = Simulation()
+    shooter = Tank(0, 280, TankType.ENEMY_NORMAL, (0, 0, 255), Direction.RIGHT)
+    ally = Tank(200, 280, TankType.ENEMY_NORMAL, (0, 0, 255), Direction.LEFT)
+    player = Tank(200, 280, TankType.PLAYER, (255, 0, 0), Direction.LEFT)
+    game.tanks.append(shooter)
+    game.tanks.append(ally)
+    game.spatial_grid.rebuild(game.tanks)
+
+    for target in (ally, player):
+        if target is player:
+            game.tanks.append(player)
+            game.spatial_grid.rebuild(game.tanks)
+        shooter.bullet_speed = 300
+        shooter.last_shot_time = -10**9
+        game.bullets.append(shooter.shoot())
+        game.bullets.update()
+        game.check_collisions()
+        game.tanks.compact()
+        game.bullets.compact()
+        assert not target.is_alive
+
+    assert game.hits == {'enemy': 1}
+    print("✓ Friendly fire is not counted as a hit")
+
+def main():
+    """Main test function"""
+    print("Starting collision test...")
+    print("=" * 50)
+
+    test_grid_query()
+    test_grid_tracks_moves()
+    test_tank_collision()
+    test_entry_time()
+    test_swept_bullets()
+    test_hit_counts()
+
+    print("=" * 50)
+    print("✓ All collision tests passed!")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test entity lists with swap-removal and deferred removal
+Runs without a display window
+"""
+
+import sys
+from game_objects import Tank, Direction, TankType
+from entity_list import EntityList
+
+def make_tanks(count):
+    """Create tanks in a row"""
+    return [Tank(i * 40, 0, TankType.ENEMY_NORMAL, (0, 0, 255), Direction.DOWN)
+            for i in range(count)]
+
+def test_swap_remove():
+    """Test removal swaps the last entity into the free slot"""
+    tanks = make_tanks(4)
+    entities = EntityList(tanks)
+    entities.remove(tanks[1])
+    assert list(entities) == [tanks[0], tanks[3], tanks[2]]
+    assert tanks[1] not in entities and tanks[3] in entities
+
+    entities.remove(tanks[2])
+    assert list(entities) == [tanks[0], tanks[3]]
+    try:
+        entities.remove(tanks[2])
+        assert False, "Removed an entity twice"
+    except ValueError:
+        pass
+    print("✓ Swap removal works")
+
+def test_deferred_removal():
+    """Test killed entities stay until compact"""
+    tanks = make_tanks(5)
+    entities = EntityList(tanks)
+
+    # Killing while iterating is safe, nothing moves until compact
+    for tank in entities:
+        if tank.x in (0, 80):
+            entities.kill(tank)
+    entities.kill(tanks[2])
+    assert len(entities) == 5 and entities.is_dead(tanks[0])
+
+    assert entities.compact() == [tanks[0], tanks[2]]
+    assert len(entities) == 3 and set(entities) == {tanks[1], tanks[3], tanks[4]}
+    assert entities.compact() == []
+
+    entities.kill(tanks[1])
+    entities.clear()
+    assert len(entities) == 0 and entities.compact() == []
+    print("✓ Deferred removal works")
+
+def main():
+    """Main test function"""
+    print("Starting entity list test...")
+    print("=" * 50)
+
+    test_swap_remove()
+    test_deferred_removal()
+
+    print("=" * 50)
+    print("✓ All entity list tests passed!")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
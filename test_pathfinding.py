@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Test A* pathfinding and AI path following
+Runs without a display window
+"""
+
+import sys
+import time
+from types import SimpleNamespace
+from game_objects import Tank, Wall, Direction, TankType, WallType
+from tile_map import TileMap
+from spatial_grid import SpatialGrid
+from pathfinding import PathFinder, FlowField, FlowFieldCache
+from game_controller import GameController
+from ai_planner import PlanningPool
+from vision_ai import PATH_PENDING
+
+def make_game(walls=(), tanks=()):
+    """Create a minimal game object with a controller"""
+    game = SimpleNamespace(walls=list(walls), tanks=list(tanks), bullets=[], base=None,
+                           game_over=False, winner=None)
+    game.tile_map = TileMap()
+    game.tile_map.rebuild(game.walls)
+    game.spatial_grid = SpatialGrid(game.tile_map)
+    game.spatial_grid.rebuild(game.tanks)
+    game.controller = GameController(game)
+    return game
+
+def wall_column(tile_x, tile_ys, wall_type=WallType.METAL):
+    """Create a vertical line of walls"""
+    return [Wall(tile_x * 40, tile_y * 40, wall_type) for tile_y in tile_ys]
+
+def test_astar_path():
+    """Test A* finds a path around walls"""
+    tile_map = TileMap()
+    tile_map.rebuild(wall_column(5, range(0, 10)))
+    pathfinder = PathFinder(tile_map)
+
+    path = pathfinder.find_path((2, 2), (8, 2))
+    assert path[0] == (2, 2) and path[-1] == (8, 2)
+    assert all(not tile_map.is_blocked(*tile) for tile in path)
+    # Every step moves to a neighboring tile
+    for (x1, y1), (x2, y2) in zip(path, path[1:]):
+        assert abs(x1 - x2) + abs(y1 - y2) == 1
+    # Shortest path goes around the end of the wall at row 10
+    assert len(path) == 1 + 3 + 8 + 3 + 8
+
+    # Goal inside a wall is unreachable
+    assert pathfinder.find_path((2, 2), (5, 3)) is None
+    print("✓ A* finds paths around walls")
+
+def test_path_cache():
+    """Test path cache is shared and invalidated by wall changes"""
+    walls = wall_column(5, range(0, 15), WallType.SOIL)
+    tile_map = TileMap()
+    tile_map.rebuild(walls)
+    pathfinder = PathFinder(tile_map)
+
+    assert pathfinder.get_path((2, 2), (8, 2)) is None
+    assert pathfinder.get_path((2, 2), (8, 2)) is None
+    assert pathfinder.get_stats()['hits'] == 1
+
+    # Destroying a soil wall opens a path
+    tile_map.remove_wall(walls[2])
+    path = pathfinder.get_path((2, 2), (8, 2))
+    assert path is not None and (5, 2) in path
+    assert pathfinder.get_stats()['misses'] == 2
+    print("✓ Path cache is invalidated by wall changes")
+
+def test_ai_follows_path():
+    """Test an AI tank reaches a patrol target behind a wall"""
+    enemy = Tank(80, 80, TankType.ENEMY_NORMAL, (0, 0, 255), Direction.UP)
+    enemy.speed = 2
+    enemy.direction_change_chance = 0
+    game = make_game(wall_column(5, range(0, 10)), [enemy])
+    ai = game.controller.ai_system
+
+    ai.update_tank_ai(enemy)
+    state = enemy.ai_state
+    state.state = 'patrol'
+    state.patrol_target = (320, 80)
+
+    for _ in range(2000):
+        ai.execute_patrol(enemy, state)
+        if state.patrol_target != (320, 80):
+            break
+    assert (enemy.x, enemy.y) == (320, 80)
+    print("✓ AI tank follows waypoints around walls")
+
+def test_flow_field():
+    """Test flow field distances and steps towards the goal"""
+    tile_map = TileMap()
+    tile_map.rebuild(wall_column(5, range(0, 10)))
+    field = FlowField(tile_map, (8, 2))
+
+    assert field.get_distance((8, 2)) == 0
+    assert field.get_distance((5, 3)) == -1  # Wall tile
+    # Flow field distances agree with A* path lengths
+    path = PathFinder(tile_map).find_path((2, 2), (8, 2))
+    assert field.get_distance((2, 2)) == len(path) - 1
+
+    # Following next_tile walks a shortest path to the goal
+    tile = (2, 2)
+    steps = 0
+    while tile != (8, 2):
+        next_tile = field.next_tile(tile)
+        assert field.get_distance(next_tile) == field.get_distance(tile) - 1
+        tile = next_tile
+        steps += 1
+    assert steps == len(path) - 1
+
+    # Fields are shared per goal and rebuilt when walls change
+    fields = FlowFieldCache(tile_map)
+    assert fields.get_field((8, 2)) is fields.get_field((8, 2))
+    tile_map.remove_wall(Wall(200, 80, WallType.SOIL))
+    assert fields.get_field((8, 2)).get_distance((2, 2)) == 6
+    assert fields.fields_built == 2
+    print("✓ Flow fields lead to the goal")
+
+def test_ai_attacks_along_flow_field():
+    """Test attacking tanks reach the player around walls"""
+    player = Tank(320, 80, TankType.PLAYER, (255, 0, 0), Direction.UP)
+    enemies = [Tank(80, 80 + i * 80, TankType.ENEMY_NORMAL, (0, 0, 255), Direction.UP)
+               for i in range(3)]
+    game = make_game(wall_column(5, range(0, 10)), [player] + enemies)
+    ai = game.controller.ai_system
+
+    for _ in range(3000):
+        for enemy in enemies:
+            ai.move_along_flow_field(enemy, player.x, player.y)
+    for enemy in enemies:
+        assert abs(enemy.x - player.x) + abs(enemy.y - player.y) <= 200
+    assert ai.flow_fields.fields_built == 1
+    print("✓ AI tanks attack along the shared flow field")
+
+def wait_for_planner(ai):
+    """Apply planned paths until the planning pool is idle"""
+    deadline = time.time() + 30
+    while ai.planner and ai.planner.get_stats()['pending'] and time.time() < deadline:
+        time.sleep(0.01)
+        ai.apply_planned_paths()
+
+def test_process_planning():
+    """Test paths planned in the process pool match in-process planning"""
+    enemy = Tank(80, 80, TankType.ENEMY_NORMAL, (0, 0, 255), Direction.UP)
+    game = make_game(wall_column(5, range(0, 10)), [enemy])
+    ai = game.controller.ai_system
+    ai.planner = PlanningPool(game.tile_map, workers=1)
+    if not ai.planner.available:
+        print("✓ Process planning skipped (no process pool available)")
+        return
+
+    try:
+        ai.update_tank_ai(enemy)
+        state = enemy.ai_state
+        state.state = 'patrol'
+        state.patrol_target = (320, 80)
+
+        # The request is answered on a later frame
+        assert ai.move_along_path(enemy, state, 320, 80) == 'moving'
+        assert state.path is PATH_PENDING
+        ai.planner.flush(game.tanks)
+        wait_for_planner(ai)
+        assert state.path == ai.pathfinder.find_path((2, 2), (8, 2))
+
+        # Planned paths are shared through the path cache
+        assert ai.request_path(enemy, (2, 2), (8, 2)) == state.path
+
+        # Paths planned for an outdated wall layout are dropped
+        ai.request_path(enemy, (2, 2), (8, 3))
+        ai.planner.flush(game.tanks)
+        game.tile_map.remove_wall(Wall(200, 80, WallType.SOIL))
+        wait_for_planner(ai)
+        assert ai.pathfinder.lookup((2, 2), (8, 3)) == (False, None)
+        assert ai.planner.get_stats()['pending'] == 0
+    finally:
+        ai.close()
+
+    # Without the pool paths are planned in-process again
+    assert ai.planner is None
+    assert ai.request_path(enemy, (2, 2), (8, 2)) is not None
+    print("✓ Process pool planning works")
+
+def test_planning_fallback():
+    """Test waiting tanks are replanned in-process when the pool breaks"""
+    enemy = Tank(80, 80, TankType.ENEMY_NORMAL, (0, 0, 255), Direction.UP)
+    game = make_game(wall_column(5, range(0, 10)), [enemy])
+    ai = game.controller.ai_system
+    ai.planner = PlanningPool(game.tile_map, workers=1)
+    ai.update_tank_ai(enemy)
+    state = enemy.ai_state
+
+    ai.move_along_path(enemy, state, 320, 80)
+    ai.planner.available = False
+    ai.apply_planned_paths()
+    assert ai.planner is None and state.path is None
+    assert ai.move_along_path(enemy, state, 320, 80) == 'moving'
+    assert state.path == ai.pathfinder.find_path((2, 2), (8, 2))
+    print("✓ Planning falls back to in-process")
+
+def main():
+    """Main test function"""
+    print("Starting pathfinding test...")
+    print("=" * 50)
+
+    test_astar_path()
+    test_path_cache()
+    test_ai_follows_path()
+    test_flow_field()
+    test_ai_attacks_along_flow_field()
+    test_process_planning()
+    test_planning_fallback()
+
+    print("=" * 50)
+    print("✓ All pathfinding tests passed!")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
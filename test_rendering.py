@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test cached background and dirty-rect drawing against full redraws
+Runs with a dummy display driver
+"""
+
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from main import Game, BLACK
+from game_objects import WallType
+
+def draw_reference(game, alpha):
+    """Draw a frame from scratch, returns its pixels"""
+    surface = pygame.Surface(game.screen.get_size())
+    surface.fill(BLACK)
+    for wall in game.walls:
+        wall.draw(surface)
+    if game.base:
+        game.base.draw(surface)
+    for tank in game.tanks:
+        tank.draw(surface, alpha)
+    game.bullets.draw(surface, alpha)
+    return pygame.image.tostring(surface, 'RGB')
+
+def test_dirty_rect_frames():
+    """Test incremental frames look like full redraws"""
+    game = Game(7)
+    game.start()
+    for tank in game.tanks:
+        tank.hit_points = 10**9  # Keep the game running
+    soil_walls = [wall for wall in game.walls if wall.wall_type == WallType.SOIL]
+
+    for frame in range(300):
+        game.update()
+        if frame % 60 == 30:
+            game.walls.remove(soil_walls.pop())
+        game.draw(0.5)
+        if frame % 20 == 0 or frame % 60 == 30:
+            assert pygame.image.tostring(game.screen, 'RGB') == draw_reference(game, 0.5), frame
+    game.close()
+    pygame.display.quit()
+
+    # Only the first frame drew the whole background
+    assert game.background.stats['redraws'] == 1
+    assert game.background.stats['patched_tiles'] >= 5
+    print("✓ Dirty-rect frames match full redraws")
+
+def test_background_invalidation():
+    """Test a new map redraws the cached background"""
+    game = Game(3)
+    game.start()
+    game.draw()
+    assert not game.full_redraw and game.dirty_rects
+    first_map = pygame.image.tostring(game.background.surface, 'RGB')
+
+    game.start()
+    game.draw()
+    assert game.background.stats['redraws'] == 2
+    assert pygame.image.tostring(game.background.surface, 'RGB') != first_map
+    game.close()
+    pygame.display.quit()
+    print("✓ New maps redraw the background")
+
+def main():
+    """Main test function"""
+    print("Starting rendering test...")
+    print("=" * 50)
+
+    test_dirty_rect_frames()
+    test_background_invalidation()
+
+    print("=" * 50)
+    print("✓ All rendering tests passed!")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
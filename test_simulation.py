@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test the headless simulation steps deterministically
+Runs without a display window
+"""
+
+import sys
+import pygame
+from simulation import Simulation, FixedTimestep
+from config_manager import config
+from game_objects import WallType
+from tile_map import BASE
+
+def get_state(sim):
+    """Get a comparable snapshot of a simulation"""
+    tanks = [(tank.tank_type, tank.x, tank.y, tank.direction, tank.hit_points)
+             for tank in sim.tanks]
+    bullets = (sim.bullets.x[:len(sim.bullets)].tolist(),
+               sim.bullets.y[:len(sim.bullets)].tolist())
+    return (sim.frame, sim.get_ticks(), sim.winner, tanks, bullets,
+            sim.tile_map.grid.tobytes())
+
+def run_simulation(seed, steps):
+    """Start a random map game and run it for a number of steps"""
+    sim = Simulation(seed)
+    sim.start()
+    for _ in range(steps):
+        sim.step()
+    sim.close()
+    return sim
+
+def test_same_seed():
+    """Test two runs with the same seed end in the same state"""
+    first = run_simulation(7, 300)
+    second = run_simulation(7, 300)
+    assert get_state(first) == get_state(second)
+    assert first.frame == 300
+    print("✓ Same seed gives the same state")
+
+def test_different_seed():
+    """Test different seeds give different games"""
+    first = run_simulation(1, 10)
+    second = run_simulation(2, 10)
+    assert get_state(first) != get_state(second)
+    print("✓ Different seeds give different games")
+
+def test_fixed_step_clock():
+    """Test the tick clock advances one fixed step per call"""
+    sim = Simulation(3, step_ms=20)
+    assert sim.get_ticks() == 0
+    sim.step()
+    sim.step()
+    assert sim.frame == 2 and sim.get_ticks() == 40
+    sim.close()
+    print("✓ Clock advances by step_ms")
+
+def test_tick_rate_config():
+    """Test the step length follows the tick rate set after import"""
+    tick_rate = config.get('game_settings.tick_rate')
+    config.set('game_settings.tick_rate', 30)
+    try:
+        sim = Simulation(3)
+        sim.close()
+    finally:
+        config.set('game_settings.tick_rate', tick_rate)
+    assert abs(sim.step_ms - 1000 / 30) < 1e-9
+    print("✓ Tick rate is read from the current config")
+
+def test_base_ring():
+    """Test random walls never land on the base or its protective ring"""
+    for seed in range(40):
+        sim = Simulation(seed)
+        tile_map = sim.tile_map
+        writes = {}
+        set_tile = tile_map.set_tile
+
+        def count_writes(tile_x, tile_y, code):
+            writes.setdefault((tile_x, tile_y), []).append(code)
+            set_tile(tile_x, tile_y, code)
+
+        tile_map.set_tile = count_writes
+        sim.start()
+        sim.close()
+
+        # Each tile of the base and its ring is written exactly once
+        base_x, base_y = tile_map.tile_at(sim.base.x, sim.base.y)
+        assert writes[(base_x, base_y)] == [BASE], seed
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0):
+                if dx or dy:
+                    assert writes[(base_x + dx, base_y + dy)] == [WallType.SOIL.value], seed
+    print("✓ Base and its ring are kept free of random walls")
+
+def test_headless():
+    """Test the simulation runs without opening a window"""
+    run_simulation(5, 30)
+    assert pygame.display.get_surface() is None
+    print("✓ Simulation runs without a display")
+
+def test_fixed_timestep():
+    """Test frame times are turned into bounded fixed steps"""
+    timestep = FixedTimestep(10, max_catch_up_steps=3)
+    assert timestep.tick(4) == (0, True) and timestep.alpha == 0.4
+    assert timestep.tick(21) == (2, True) and abs(timestep.alpha - 0.5) < 1e-9
+
+    # A long frame runs at most 3 steps and drops the rest of the backlog
+    assert timestep.tick(100) == (3, True)
+    assert timestep.stats['dropped_ms'] == 70 and timestep.alpha < 1
+
+    # With frame skip the backlog is kept and drawing skipped instead
+    timestep = FixedTimestep(10, max_catch_up_steps=3, frame_skip=True, max_frame_skip=2)
+    assert timestep.tick(55) == (3, False)
+    assert timestep.tick(0) == (2, True)
+    assert timestep.stats['steps'] == 5 and timestep.stats['dropped_ms'] == 0
+    # But only max_frame_skip frames in a row
+    assert timestep.tick(200) == (3, False)
+    assert timestep.tick(0) == (3, False)
+    assert timestep.tick(0) == (3, True)
+    assert timestep.stats['skipped_frames'] == 3
+    print("✓ Fixed timestep catches up within bounds")
+
+def test_interpolation_positions():
+    """Test each step keeps the previous tank positions for drawing"""
+    sim = Simulation(6)
+    sim.start()
+    moved = False
+    for _ in range(60):
+        before = {tank: (tank.x, tank.y) for tank in sim.tanks}
+        sim.step()
+        for tank in sim.tanks:
+            assert (tank.prev_x, tank.prev_y) == before[tank]
+            moved = moved or (tank.x, tank.y) != before[tank]
+    sim.close()
+    assert moved
+    print("✓ Steps keep previous positions")
+
+def test_game_over_holds_positions():
+    """Test steps after the game is over leave nothing to interpolate"""
+    sim = Simulation(6)
+    sim.start()
+    for _ in range(30):
+        sim.step()
+    sim.game_over = True
+    sim.step()
+    sim.close()
+    for tank in sim.tanks:
+        assert (tank.prev_x, tank.prev_y) == (tank.x, tank.y)
+    n = len(sim.bullets)
+    assert (sim.bullets.prev_x[:n] == sim.bullets.x[:n]).all()
+    assert (sim.bullets.prev_y[:n] == sim.bullets.y[:n]).all()
+    print("✓ Positions hold after the game is over")
+
+def main():
+    """Main test function"""
+    print("Starting simulation test...")
+    print("=" * 50)
+
+    test_same_seed()
+    test_different_seed()
+    test_fixed_step_clock()
+    test_tick_rate_config()
+    test_base_ring()
+    test_headless()
+    test_fixed_timestep()
+    test_interpolation_positions()
+    test_game_over_holds_positions()
+
+    print("=" * 50)
+    print("✓ All simulation tests passed!")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test cached fonts, text surfaces and the pre-rendered menu
+Runs with a dummy display driver
+"""
+
+import os
+import sys
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from main import Game, GREEN, RED
+from text_cache import TextCache, text_cache
+
+def test_text_cache():
+    """Test text is rendered once per size, text and color"""
+    cache = TextCache(max_entries=3)
+    first = cache.render("Score: 1", 24, (255, 255, 255))
+    assert cache.render("Score: 1", 24, [255, 255, 255]) is first
+    assert cache.render("Score: 1", 36, (255, 255, 255)) is not first
+    assert cache.render("Score: 1", 24, (128, 128, 128)) is not first
+    assert cache.get_font(24) is cache.get_font(24)
+    assert cache.stats == {'hits': 1, 'misses': 3, 'fonts': 2}
+
+    # Past max_entries the surfaces are dropped, fonts are kept
+    cache.render("Score: 2", 24, (255, 255, 255))
+    assert len(cache.surfaces) == 1 and len(cache.fonts) == 2
+    print("✓ Text surfaces are cached by size, text and color")
+
+def test_cached_menu():
+    """Test the menu is rendered once and only drawn when it appears"""
+    game = Game(1)
+    controller = game.controller
+    draws = []
+    draw_menu = controller.draw_menu
+
+    def count_draws():
+        draws.append(1)
+        draw_menu()
+
+    controller.draw_menu = count_draws
+    game.draw()
+    menu = controller.menu_surface
+    pixels = pygame.image.tostring(game.screen, 'RGB')
+
+    # Idle menu frames render and draw nothing
+    misses = text_cache.stats['misses']
+    for _ in range(10):
+        game.draw()
+    assert len(draws) == 1
+    assert controller.menu_surface is menu
+    assert text_cache.stats['misses'] == misses
+    assert pygame.image.tostring(game.screen, 'RGB') == pixels
+
+    # Coming back from a game or losing the window contents draws it again
+    game.start()
+    game.draw()
+    controller.show_menu = True
+    game.draw()
+    assert len(draws) == 2
+    assert pygame.image.tostring(game.screen, 'RGB') == pixels
+    pygame.event.post(pygame.event.Event(pygame.WINDOWEXPOSED))
+    game.handle_events()
+    game.draw()
+    game.draw()
+    assert len(draws) == 3
+
+    # Same pixels as rendering the menu from scratch
+    controller.menu_surface = None
+    text_cache.clear()
+    game.menu_drawn = False
+    game.draw()
+    assert pygame.image.tostring(game.screen, 'RGB') == pixels
+    game.close()
+    pygame.display.quit()
+    print("✓ Menu is rendered once and drawn when it appears")
+
+def test_game_over_text():
+    """Test game over frames reuse the rendered text"""
+    game = Game(2)
+    game.start()
+    game.game_over = True
+    game.winner = "enemy"
+    game.draw()
+    fonts = text_cache.stats['fonts']
+    misses = text_cache.stats['misses']
+    for _ in range(10):
+        game.draw()
+    assert text_cache.stats['fonts'] == fonts
+    assert text_cache.stats['misses'] == misses
+    assert text_cache.render("Game Over!", 74, RED).get_size() != \
+        text_cache.render("Player Wins!", 74, GREEN).get_size()
+    game.close()
+    pygame.display.quit()
+    print("✓ Game over text is rendered once")
+
+def main():
+    """Main test function"""
+    print("Starting text cache test...")
+    print("=" * 50)
+
+    test_text_cache()
+    test_cached_menu()
+    test_game_over_text()
+
+    print("=" * 50)
+    print("✓ All text cache tests passed!")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
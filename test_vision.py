@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Test vision system and wall occupancy grid
+Runs without a display window
+"""
+
+import sys
+import random
+import pygame
+from types import SimpleNamespace
+from game_objects import Tank, Wall, Base, Direction, TankType, WallType
+from tile_map import TileMap
+from vision_ai import VisionSystem
+
+def make_game(walls=(), tanks=()):
+    """Create a minimal game object for the vision system"""
+    game = SimpleNamespace(walls=list(walls), tanks=list(tanks), base=None, controller=None)
+    game.tile_map = TileMap()
+    game.tile_map.rebuild(game.walls)
+    return game
+
+def test_tile_map_raycast():
+    """Test grid traversal ray test"""
+    wall = Wall(200, 200, WallType.METAL)
+    tile_map = TileMap()
+    tile_map.rebuild([wall])
+
+    # Horizontal, vertical and diagonal rays through the wall
+    assert tile_map.is_ray_blocked(100, 220, 300, 220)
+    assert tile_map.is_ray_blocked(220, 100, 220, 300)
+    assert tile_map.first_blocking_tile(150, 150, 300, 300) == (5, 5)
+
+    # Rays passing beside the wall
+    assert not tile_map.is_ray_blocked(100, 180, 300, 180)
+    assert not tile_map.is_ray_blocked(260, 100, 260, 300)
+
+    # The face of a wall is visible
+    assert not tile_map.is_ray_blocked(100, 220, 210, 220)
+    print("✓ Tile map raycast works")
+
+def test_wall_destroyed():
+    """Test occupancy grid update when a soil wall is destroyed"""
+    wall = Wall(200, 200, WallType.SOIL)
+    tile_map = TileMap()
+    tile_map.rebuild([wall])
+    epoch = tile_map.epoch
+
+    tile_map.remove_wall(wall)
+    assert not tile_map.is_ray_blocked(100, 220, 300, 220)
+    assert tile_map.epoch > epoch
+    print("✓ Destroyed wall clears its tile")
+
+def test_tile_walls():
+    """Test walls are stored as tiles and read back as views"""
+    tile_map = TileMap()
+    walls = tile_map.walls
+    soil = Wall(200, 200, WallType.SOIL)
+    walls.append(soil)
+    walls.append(Wall(240, 200, WallType.METAL))
+    tile_map.set_base(Base(280, 200))
+
+    assert len(walls) == 2 and soil in walls
+    assert list(walls) == [soil, Wall(240, 200, WallType.METAL)]
+    assert tile_map.get_wall(6, 5).wall_type == WallType.METAL
+    assert tile_map.get_wall(7, 5) is None
+
+    # The base tile is stored but does not block
+    assert tile_map.get_tile(7, 5) == WallType.BASE.value
+    assert not tile_map.is_blocked(7, 5)
+    assert not tile_map.is_ray_blocked(300, 300, 300, 150)
+
+    walls.remove(Wall(200, 200, WallType.SOIL))
+    assert soil not in walls and len(walls) == 1
+    try:
+        walls.remove(soil)
+        assert False, "Removed a wall twice"
+    except ValueError:
+        pass
+    print("✓ Walls are views of the tile map")
+
+def test_vision_blocked_by_wall():
+    """Test tank vision stops at walls"""
+    tank = Tank(200, 300, TankType.PLAYER, (255, 0, 0), Direction.UP)
+    wall = Wall(200, 200, WallType.METAL)
+    vision = VisionSystem(make_game([wall], [tank]))
+    vision.update_vision()
+
+    # Cell just in front of the tank is visible, cell behind the wall is not
+    assert vision.is_in_vision(tank, 220, 290)
+    assert not vision.is_in_vision(tank, 220, 190)
+    print("✓ Vision is blocked by walls")
+
+def reference_vision_cells(game, tank, forward_range, side_range):
+    """Point-by-point vision cone, as calculated before batching"""
+    dir_x, dir_y = {Direction.UP: (0, -1), Direction.DOWN: (0, 1),
+                    Direction.LEFT: (-1, 0), Direction.RIGHT: (1, 0)}[tank.direction]
+    center_x = tank.x + tank.size // 2
+    center_y = tank.y + tank.size // 2
+    cells = set()
+    for distance in range(0, int(forward_range), 10):
+        for side_offset in range(-int(side_range), int(side_range), 10):
+            x = center_x + dir_x * distance - dir_y * side_offset
+            y = center_y + dir_y * distance + dir_x * side_offset
+            if 0 <= x <= 800 and 0 <= y <= 600:
+                if not game.tile_map.is_ray_blocked(center_x, center_y, x, y):
+                    cells.add((int(x // 20), int(y // 20)))
+    return cells
+
+def test_batched_vision_matches_reference():
+    """Test vectorized vision grids match the point-by-point cones"""
+    rng = random.Random(7)
+    walls = [Wall(rng.randint(0, 19) * 40, rng.randint(0, 14) * 40, WallType.SOIL)
+             for _ in range(40)]
+    tanks = []
+    for i in range(12):
+        tank_type = TankType.PLAYER if i == 0 else TankType.ENEMY_NORMAL
+        tank = Tank(rng.uniform(0, 760), rng.uniform(0, 560), tank_type, (0, 0, 255),
+                    rng.choice(list(Direction)))
+        tank.vision_range = rng.choice([120, 150, 180])
+        tanks.append(tank)
+    game = make_game(walls, tanks)
+    vision = VisionSystem(game)
+    vision.update_vision()
+
+    for tank in tanks:
+        forward_range, side_range = vision.get_vision_ranges(tank)
+        expected = reference_vision_cells(game, tank, forward_range, side_range)
+        grid = vision.vision_map[id(tank)]['grid']
+        actual = {(int(x), int(y)) for y, x in zip(*grid.nonzero())}
+        assert actual == expected
+    print("✓ Batched vision matches reference cones")
+
+def test_incremental_vision():
+    """Test cached cones are reused until a tank or the wall layout changes"""
+    player = Tank(200, 300, TankType.PLAYER, (255, 0, 0), Direction.UP)
+    enemy = Tank(400, 100, TankType.ENEMY_NORMAL, (0, 0, 255), Direction.DOWN)
+    wall = Wall(200, 200, WallType.SOIL)
+    game = make_game([wall], [player, enemy])
+    vision = VisionSystem(game)
+    vision.bucket_count = 1  # Refresh every tank every frame
+
+    vision.update_vision()
+    assert vision.stats['recomputed'] == 2
+
+    # Nothing changed
+    vision.update_vision()
+    assert vision.stats['recomputed'] == 0 and vision.stats['reused'] == 2
+
+    # Rotating one tank only recomputes that tank
+    enemy.rotate(Direction.LEFT)
+    vision.update_vision()
+    assert vision.stats['recomputed'] == 1 and vision.stats['reused'] == 1
+
+    # Destroying a wall invalidates every cone
+    game.walls.remove(wall)
+    game.tile_map.remove_wall(wall)
+    vision.update_vision()
+    assert vision.stats['recomputed'] == 2
+    assert vision.is_in_vision(player, 220, 190)
+
+    # Dead tanks are dropped from the cache
+    enemy.is_alive = False
+    vision.update_vision()
+    assert id(enemy) not in vision.vision_map
+    assert vision.get_vision_stats()['total_reused'] == 4
+    print("✓ Incremental vision reuses cached cones")
+
+def test_shared_team_vision():
+    """Test commander-enabled shared vision per team"""
+    commander = Tank(100, 100, TankType.ENEMY_COMMANDER, (0, 255, 0), Direction.DOWN)
+    scout = Tank(600, 100, TankType.ENEMY_NORMAL, (0, 0, 255), Direction.DOWN)
+    ally_commander = Tank(100, 400, TankType.ENEMY_COMMANDER, (0, 255, 0), Direction.UP)
+    ally_scout = Tank(600, 400, TankType.ENEMY_NORMAL, (0, 0, 255), Direction.UP)
+    ally_commander.team = ally_scout.team = 'allies'
+    game = make_game([], [commander, scout, ally_commander, ally_scout])
+    vision = VisionSystem(game)
+    vision.update_vision()
+
+    # Scout sees what the commander sees, but not what the other team sees
+    assert vision.is_in_vision(scout, 120, 200)
+    assert not vision.is_in_vision(scout, 620, 360)
+    assert vision.is_in_vision(ally_scout, 120, 360)
+    assert not vision.is_in_vision(ally_scout, 120, 200)
+
+    # Without a commander the team stops sharing vision
+    commander.is_alive = False
+    vision.update_vision()
+    assert vision.shared_teams == {'allies'}
+    assert not vision.is_in_vision(scout, 120, 200)
+    assert vision.is_in_vision(scout, 620, 200)
+    print("✓ Shared vision works per team")
+
+def test_line_of_sight_cache():
+    """Test cell-to-cell line of sight cache and selective invalidation"""
+    soil = Wall(200, 200, WallType.SOIL)
+    metal = Wall(200, 400, WallType.METAL)
+    game = make_game([soil, metal])
+    vision = VisionSystem(game)
+    vision.los_cache.capacity = 3
+
+    assert not vision.has_line_of_sight(150, 210, 300, 210)
+    assert not vision.has_line_of_sight(150, 410, 300, 410)
+    assert vision.has_line_of_sight(150, 310, 300, 310)
+    assert not vision.has_line_of_sight(150, 210, 300, 210)
+    stats = vision.get_los_stats()
+    assert stats['hits'] == 1 and stats['misses'] == 3 and stats['size'] == 3
+
+    # Destroying the soil wall only drops the ray it blocked
+    game.walls.remove(soil)
+    game.tile_map.remove_wall(soil)
+    assert vision.has_line_of_sight(150, 210, 300, 210)
+    stats = vision.get_los_stats()
+    assert stats['invalidations'] == 1 and stats['size'] == 3
+
+    # Cache is bounded
+    vision.has_line_of_sight(0, 0, 100, 100)
+    assert vision.get_los_stats()['evictions'] == 1
+    assert len(vision.los_cache) == 3
+
+    # Rebuilding the map flushes everything
+    game.tile_map.rebuild(game.walls)
+    vision.has_line_of_sight(0, 0, 100, 100)
+    assert len(vision.los_cache) == 1
+    print("✓ Line of sight cache works")
+
+def test_vision_scheduler():
+    """Test staggered vision refreshes"""
+    player = Tank(380, 500, TankType.PLAYER, (255, 0, 0), Direction.UP)
+    enemies = [Tank(x * 80, 40, TankType.ENEMY_NORMAL, (0, 0, 255), Direction.DOWN)
+               for x in range(8)]
+    game = make_game([], [player] + enemies)
+    vision = VisionSystem(game)
+    vision.bucket_count = 4
+    vision.frame_budget_ms = 0
+
+    # First update computes everything
+    vision.update_vision()
+    assert vision.stats['recomputed'] == 9
+
+    # Afterwards enemies are refreshed in round-robin buckets
+    for enemy in enemies:
+        enemy.rotate(Direction.LEFT)
+    refreshed = []
+    for _ in range(4):
+        vision.update_vision()
+        refreshed.append(vision.stats['recomputed'])
+    assert refreshed == [2, 2, 2, 2]
+    assert vision.stats['max_staleness'] <= 4
+
+    # Priority tanks are refreshed every frame
+    enemies[0].rotate(Direction.RIGHT)
+    enemies[1].rotate(Direction.RIGHT)
+    vision.update_vision([enemies[0], enemies[1]])
+    assert vision.get_vision_staleness(enemies[0]) == 0
+    assert vision.get_vision_staleness(enemies[1]) == 0
+    print("✓ Vision scheduler staggers refreshes")
+
+def test_vision_overlay():
+    """Test cached vision debug overlay"""
+    enemy = Tank(400, 100, TankType.ENEMY_NORMAL, (0, 0, 255), Direction.DOWN)
+    game = make_game([], [enemy])
+    vision = VisionSystem(game)
+    vision.update_vision()
+
+    screen = pygame.Surface((800, 600))
+    vision.draw_vision(screen)
+    assert screen.get_at((420, 200))[0] > 0
+    assert screen.get_at((100, 500))[:3] == (0, 0, 0)
+
+    # Overlay is only redrawn when vision changes
+    surface = vision.overlay_surfaces['enemy']
+    vision.update_vision()
+    assert vision.overlay_version == vision.vision_version
+    vision.draw_vision(screen)
+    assert vision.overlay_surfaces['enemy'] is surface
+    print("✓ Vision overlay is cached")
+
+def main():
+    """Main test function"""
+    print("Starting vision test...")
+    print("=" * 50)
+
+    test_tile_map_raycast()
+    test_wall_destroyed()
+    test_tile_walls()
+    test_vision_blocked_by_wall()
+    test_batched_vision_matches_reference()
+    test_incremental_vision()
+    test_shared_team_vision()
+    test_line_of_sight_cache()
+    test_vision_scheduler()
+    test_vision_overlay()
+
+    print("=" * 50)
+    print("✓ All vision tests passed!")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,58 @@
+import pygame
+
+
+class TextCache:
+    """Fonts and rendered text surfaces, shared by menu, game over and HUD
+
+    Fonts are kept per size and rendered surfaces per (size, text, color),
+    so text that does not change is only rendered once. The text cache is
+    cleared when it grows past max_entries, which bounds memory for text
+    that changes often such as scores.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.fonts = {}
+        self.surfaces = {}
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'fonts': 0
+        }
+
+    def get_font(self, size):
+        """Get the default font in the given size"""
+        if not pygame.font.get_init():
+            # Fonts from before pygame.font.quit() can't be used anymore
+            pygame.font.init()
+            self.fonts.clear()
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            self.fonts[size] = font
+            self.stats['fonts'] += 1
+        return font
+
+    def render(self, text, size, color):
+        """Get the antialiased surface of a text, rendered on first use"""
+        key = (size, text, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.stats['hits'] += 1
+            return surface
+
+        self.stats['misses'] += 1
+        if len(self.surfaces) >= self.max_entries:
+            self.surfaces.clear()
+        surface = self.get_font(size).render(text, True, color)
+        self.surfaces[key] = surface
+        return surface
+
+    def clear(self):
+        """Drop all fonts and surfaces"""
+        self.fonts.clear()
+        self.surfaces.clear()
+
+
+# Global text cache instance
+text_cache = TextCache()
@@ -0,0 +1,259 @@
+import numpy as np
+from game_objects import *
+
+# Tile codes stored in the occupancy grid (0 means empty)
+EMPTY = 0
+SOIL = WallType.SOIL.value
+METAL = WallType.METAL.value
+BASE = WallType.BASE.value
+
+# Wall type of each wall code; the base tile does not block movement or sight
+WALL_TYPES = {SOIL: WallType.SOIL, METAL: WallType.METAL}
+IS_WALL = np.zeros(256, dtype=bool)
+IS_WALL[list(WALL_TYPES)] = True
+
+
+class TileWalls:
+    """List-like view of the walls stored in a TileMap
+
+    Walls are not kept as objects: iterating creates lightweight Wall
+    views from the tile codes, and append/remove write a single tile.
+    """
+
+    def __init__(self, tile_map):
+        self.tile_map = tile_map
+
+    def __iter__(self):
+        tile_map = self.tile_map
+        size = tile_map.tile_size
+        tile_ys, tile_xs = np.nonzero(IS_WALL[tile_map.grid])
+        for tile_y, tile_x in zip(tile_ys.tolist(), tile_xs.tolist()):
+            yield Wall(tile_x * size, tile_y * size,
+                       WALL_TYPES[tile_map.tiles[tile_y * tile_map.cols + tile_x]])
+
+    def __len__(self):
+        return int(np.count_nonzero(IS_WALL[self.tile_map.grid]))
+
+    def __contains__(self, wall):
+        size = self.tile_map.tile_size
+        return self.tile_map.get_tile(wall.x // size, wall.y // size) == wall.wall_type.value
+
+    def append(self, wall):
+        """Add a wall to the map"""
+        self.tile_map.add_wall(wall)
+
+    def remove(self, wall):
+        """Remove a wall from the map in O(1)"""
+        if wall not in self:
+            raise ValueError("wall is not on the map")
+        self.tile_map.remove_wall(wall)
+
+    def clear(self):
+        """Remove all walls (and the base) from the map"""
+        self.tile_map.clear()
+
+
+class TileMap:
+    """Tile array holding the walls and base, one byte per WALL_SIZE tile
+
+    This is the authoritative wall store; game.walls is a TileWalls view
+    of it.
+    """
+
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, tile_size=WALL_SIZE, tiles=None):
+        self.tile_size = tile_size
+        self.cols = (width + tile_size - 1) // tile_size
+        self.rows = (height + tile_size - 1) // tile_size
+        # An existing buffer (e.g. shared memory) can be wrapped instead of a new one
+        self.tiles = bytearray(self.cols * self.rows) if tiles is None else tiles
+        # NumPy view sharing memory with self.tiles, indexed [tile_y, tile_x]
+        self.grid = np.frombuffer(self.tiles, dtype=np.uint8).reshape(self.rows, self.cols)
+
+        # Bumped on every wall layout change so caches can detect stale data
+        self.epoch = 0
+
+        # Bumped when walls are added or the map is rebuilt; tiles destroyed since then
+        self.generation = 0
+        self.removed_tiles = []
+
+        self.walls = TileWalls(self)
+
+    def clear(self):
+        """Remove all walls from the grid"""
+        self.tiles[:] = bytes(len(self.tiles))
+        self.epoch += 1
+        self.generation += 1
+        self.removed_tiles.clear()
+
+    def rebuild(self, walls):
+        """Rebuild the grid from a list of walls"""
+        walls = list(walls)
+        self.tiles[:] = bytes(len(self.tiles))
+        for wall in walls:
+            self.set_tile(wall.x // self.tile_size, wall.y // self.tile_size,
+                          wall.wall_type.value)
+        self.epoch += 1
+        self.generation += 1
+        self.removed_tiles.clear()
+
+    def set_tile(self, tile_x, tile_y, code):
+        """Set the code of a single tile, ignoring tiles outside the map"""
+        if 0 <= tile_x < self.cols and 0 <= tile_y < self.rows:
+            self.tiles[tile_y * self.cols + tile_x] = code
+
+    def get_tile(self, tile_x, tile_y):
+        """Get the code of a tile (tiles outside the map are empty)"""
+        if 0 <= tile_x < self.cols and 0 <= tile_y < self.rows:
+            return self.tiles[tile_y * self.cols + tile_x]
+        return EMPTY
+
+    def tile_at(self, x, y):
+        """Convert a pixel position to tile coordinates"""
+        return int(x // self.tile_size), int(y // self.tile_size)
+
+    def get_wall(self, tile_x, tile_y):
+        """Get a Wall view of a tile, None if the tile holds no wall"""
+        wall_type = WALL_TYPES.get(self.get_tile(tile_x, tile_y))
+        if wall_type is None:
+            return None
+        return Wall(tile_x * self.tile_size, tile_y * self.tile_size, wall_type)
+
+    def add_wall(self, wall):
+        """Store a wall in its tile"""
+        self.set_tile(wall.x // self.tile_size, wall.y // self.tile_size, wall.wall_type.value)
+        self.epoch += 1
+        self.generation += 1
+        self.removed_tiles.clear()
+
+    def set_base(self, base):
+        """Mark the tile of the base"""
+        self.set_tile(base.x // self.tile_size, base.y // self.tile_size, BASE)
+        self.epoch += 1
+
+    def remove_wall(self, wall):
+        """Clear the tile of a destroyed wall"""
+        tile_x = wall.x // self.tile_size
+        tile_y = wall.y // self.tile_size
+        self.set_tile(tile_x, tile_y, EMPTY)
+        self.removed_tiles.append((tile_x, tile_y))
+        self.epoch += 1
+
+    def is_blocked(self, tile_x, tile_y):
+        """Check if a tile contains a wall"""
+        code = self.get_tile(tile_x, tile_y)
+        return code == SOIL or code == METAL
+
+    def first_blocking_tile(self, start_x, start_y, end_x, end_y):
+        """Walk the tiles crossed by a ray (DDA) and return the first wall tile
+
+        The tile containing the end point is not tested, so the face of a
+        wall is still visible. Returns None if the ray is clear.
+        """
+        size = self.tile_size
+        tile_x = int(start_x // size)
+        tile_y = int(start_y // size)
+        end_tile_x = int(end_x // size)
+        end_tile_y = int(end_y // size)
+
+        dx = end_x - start_x
+        dy = end_y - start_y
+
+        # Distance along the ray (0..1) to the next vertical/horizontal tile edge
+        if dx > 0:
+            step_x = 1
+            t_delta_x = size / dx
+            t_max_x = ((tile_x + 1) * size - start_x) / dx
+        elif dx < 0:
+            step_x = -1
+            t_delta_x = size / -dx
+            t_max_x = (tile_x * size - start_x) / dx
+        else:
+            step_x = 0
+            t_delta_x = t_max_x = float('inf')
+
+        if dy > 0:
+            step_y = 1
+            t_delta_y = size / dy
+            t_max_y = ((tile_y + 1) * size - start_y) / dy
+        elif dy < 0:
+            step_y = -1
+            t_delta_y = size / -dy
+            t_max_y = (tile_y * size - start_y) / dy
+        else:
+            step_y = 0
+            t_delta_y = t_max_y = float('inf')
+
+        while tile_x != end_tile_x or tile_y != end_tile_y:
+            if self.is_blocked(tile_x, tile_y):
+                return (tile_x, tile_y)
+
+            if t_max_x < t_max_y:
+                tile_x += step_x
+                t_max_x += t_delta_x
+            else:
+                tile_y += step_y
+                t_max_y += t_delta_y
+
+            # Floating point drift can step past the end tile; stop there
+            if min(t_max_x, t_max_y) > 1.0 + 1e-9 and (tile_x != end_tile_x or tile_y != end_tile_y):
+                break
+
+        return None
+
+    def is_ray_blocked(self, start_x, start_y, end_x, end_y):
+        """Check if a wall lies between two pixel positions"""
+        return self.first_blocking_tile(start_x, start_y, end_x, end_y) is not None
+
+    def blocked_rays(self, start_x, start_y, end_x, end_y):
+        """Vectorized first_blocking_tile test for arrays of rays
+
+        Steps every ray through the grid in lockstep and returns a boolean
+        array that is True where the ray is blocked.
+        """
+        size = self.tile_size
+        start_x = np.asarray(start_x, dtype=np.float64)
+        start_y = np.asarray(start_y, dtype=np.float64)
+        end_x = np.asarray(end_x, dtype=np.float64)
+        end_y = np.asarray(end_y, dtype=np.float64)
+
+        tile_x = np.floor_divide(start_x, size).astype(np.int64)
+        tile_y = np.floor_divide(start_y, size).astype(np.int64)
+        end_tile_x = np.floor_divide(end_x, size).astype(np.int64)
+        end_tile_y = np.floor_divide(end_y, size).astype(np.int64)
+
+        dx = end_x - start_x
+        dy = end_y - start_y
+        step_x = np.sign(dx).astype(np.int64)
+        step_y = np.sign(dy).astype(np.int64)
+
+        # Same edge distances as the scalar version, inf on axes with no motion
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_delta_x = np.where(dx != 0, size / np.abs(dx), np.inf)
+            t_delta_y = np.where(dy != 0, size / np.abs(dy), np.inf)
+            t_max_x = np.where(dx > 0, ((tile_x + 1) * size - start_x) / dx,
+                               np.where(dx < 0, (tile_x * size - start_x) / dx, np.inf))
+            t_max_y = np.where(dy > 0, ((tile_y + 1) * size - start_y) / dy,
+                               np.where(dy < 0, (tile_y * size - start_y) / dy, np.inf))
+
+        blocked = np.zeros(start_x.shape, dtype=bool)
+        active = (tile_x != end_tile_x) | (tile_y != end_tile_y)
+
+        while active.any():
+            inside = (tile_x >= 0) & (tile_x < self.cols) & (tile_y >= 0) & (tile_y < self.rows)
+            codes = self.grid[np.clip(tile_y, 0, self.rows - 1), np.clip(tile_x, 0, self.cols - 1)]
+            hit = active & inside & IS_WALL[codes]
+            blocked |= hit
+            active &= ~hit
+
+            move_x = active & (t_max_x < t_max_y)
+            move_y = active & ~move_x
+            tile_x = np.where(move_x, tile_x + step_x, tile_x)
+            t_max_x = np.where(move_x, t_max_x + t_delta_x, t_max_x)
+            tile_y = np.where(move_y, tile_y + step_y, tile_y)
+            t_max_y = np.where(move_y, t_max_y + t_delta_y, t_max_y)
+
+            at_end = (tile_x == end_tile_x) & (tile_y == end_tile_y)
+            drifted = np.minimum(t_max_x, t_max_y) > 1.0 + 1e-9
+            active &= ~at_end & ~drifted
+
+        return blocked
@@ -0,0 +1,318 @@
+import random
+import numpy as np
+import multiprocessing
+from multiprocessing import shared_memory
+from game_objects import *
+from tile_map import TileMap
+from config_manager import config
+from simulation import Simulation
+
+# Player actions
+NOOP, UP, RIGHT, DOWN, LEFT, SHOOT = range(6)
+ACTION_COUNT = 6
+ACTION_DIRECTIONS = {UP: Direction.UP, RIGHT: Direction.RIGHT,
+                     DOWN: Direction.DOWN, LEFT: Direction.LEFT}
+MOVE_KEYS = {Direction.UP: pygame.K_w, Direction.RIGHT: pygame.K_d,
+             Direction.DOWN: pygame.K_s, Direction.LEFT: pygame.K_a}
+
+# Rows of the tank and bullet observation tables
+MAX_TANKS = 16
+MAX_BULLETS = 64
+TANK_FIELDS = 6  # x, y, direction, is_enemy, hit_points, tank_type
+BULLET_FIELDS = 4  # x, y, direction, is_enemy
+
+# Rewards for the player
+HIT_REWARD = 0.1
+DAMAGE_REWARD = -0.1
+WIN_REWARD = 1.0
+LOSS_REWARD = -1.0
+
+
+def get_observation_spec(max_tanks=MAX_TANKS, max_bullets=MAX_BULLETS):
+    """Get {name: (shape, dtype)} of one environment's observation"""
+    tile_map = TileMap()
+    grid_size = config.get('vision_settings.vision_grid_size', 20)
+    return {
+        'tiles': ((tile_map.rows, tile_map.cols), np.uint8),
+        'tanks': ((max_tanks, TANK_FIELDS), np.float32),
+        'tank_count': ((), np.int32),
+        'bullets': ((max_bullets, BULLET_FIELDS), np.float32),
+        'bullet_count': ((), np.int32),
+        'vision': ((SCREEN_HEIGHT // grid_size + 1, SCREEN_WIDTH // grid_size + 1), np.bool_)
+    }
+
+
+def get_buffer_spec(num_envs, spec):
+    """Get {name: (shape, dtype)} of the stacked observations and step results"""
+    buffer_spec = {name: ((num_envs,) + shape, dtype) for name, (shape, dtype) in spec.items()}
+    buffer_spec['actions'] = ((num_envs,), np.int64)
+    buffer_spec['rewards'] = ((num_envs,), np.float32)
+    buffer_spec['dones'] = ((num_envs,), np.bool_)
+    return buffer_spec
+
+
+def get_buffer_size(buffer_spec):
+    """Get the bytes needed to lay out all arrays of a buffer spec"""
+    size = 0
+    for shape, dtype in buffer_spec.values():
+        size += -(-int(np.prod(shape)) * np.dtype(dtype).itemsize // 8) * 8
+    return size
+
+
+def make_arrays(buffer, buffer_spec):
+    """Lay out the arrays of a buffer spec in one buffer, 8 byte aligned"""
+    arrays = {}
+    offset = 0
+    for name, (shape, dtype) in buffer_spec.items():
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+        offset += -(-arrays[name].nbytes // 8) * 8
+    return arrays
+
+
+class GameEnv:
+    """One headless game driven by player actions
+
+    Writes its observation into row index of the stacked arrays, so
+    stepping allocates no per-step observation objects. Finished games
+    are reset right away with the next seed of the environment.
+    """
+
+    def __init__(self, arrays, index, seed, max_steps):
+        self.arrays = arrays
+        self.index = index
+        self.seeds = random.Random(seed)
+        self.max_steps = max_steps
+        self.sim = None
+        self.player = None
+        self.last_hits = 0
+        self.last_hit_points = 0
+
+        # Views of this environment's rows
+        self.tiles = arrays['tiles'][index]
+        self.tanks = arrays['tanks'][index]
+        self.bullets = arrays['bullets'][index]
+        self.vision = arrays['vision'][index]
+
+    def reset(self):
+        """Start a new game and write its first observation"""
+        if self.sim:
+            self.sim.close()
+        self.sim = Simulation(self.seeds.getrandbits(32))
+        self.sim.start()
+        self.player = self.sim.controller.get_player_tank()
+        self.last_hits = 0
+        self.last_hit_points = self.player.hit_points
+        self.write_observation()
+
+    def apply_action(self, action):
+        """Turn, drive or shoot the player tank"""
+        keys = self.sim.controller.keys_pressed
+        keys.clear()
+        if not self.player.is_alive:
+            return
+        direction = ACTION_DIRECTIONS.get(action)
+        if direction is not None:
+            # Driven through the controller, which checks collisions
+            self.player.direction = direction
+            keys.add(MOVE_KEYS[direction])
+        elif action == SHOOT:
+            bullet = self.player.shoot(self.sim.get_ticks())
+            if bullet:
+                self.sim.bullets.append(bullet)
+
+    def step(self, action):
+        """Play one step, returns (reward, done)"""
+        sim = self.sim
+        self.apply_action(action)
+        sim.step()
+
+        hits = sim.hits.get(self.player.team, 0)
+        reward = (hits - self.last_hits) * HIT_REWARD
+        reward += (self.last_hit_points - self.player.hit_points) * DAMAGE_REWARD
+        self.last_hits = hits
+        self.last_hit_points = self.player.hit_points
+        if sim.game_over:
+            reward += WIN_REWARD if sim.winner == 'player' else LOSS_REWARD
+
+        done = sim.game_over or sim.frame >= self.max_steps
+        if done:
+            self.reset()
+        else:
+            self.write_observation()
+        return reward, done
+
+    def write_observation(self):
+        """Copy the game state into this environment's rows"""
+        sim = self.sim
+        np.copyto(self.tiles, sim.tile_map.grid)
+
+        tanks = self.tanks
+        count = 0
+        for tank in sim.tanks:
+            if count == len(tanks):
+                break
+            row = tanks[count]
+            row[0] = tank.x
+            row[1] = tank.y
+            row[2] = tank.direction.value
+            row[3] = tank.team != self.player.team
+            row[4] = tank.hit_points
+            row[5] = tank.tank_type.value
+            count += 1
+        tanks[count:] = 0
+        self.arrays['tank_count'][self.index] = count
+
+        manager = sim.bullets
+        bullets = self.bullets
+        count = min(len(manager), len(bullets))
+        bullets[:count, 0] = manager.x[:count]
+        bullets[:count, 1] = manager.y[:count]
+        bullets[:count, 2] = manager.direction[:count]
+        bullets[:count, 3] = manager.owner[:count] != manager.owner_ids.get(self.player, -1)
+        bullets[count:] = 0
+        self.arrays['bullet_count'][self.index] = count
+
+        vision = sim.controller.vision_system.team_vision.get(self.player.team)
+        if vision is None:
+            self.vision.fill(False)
+        else:
+            np.copyto(self.vision, vision)
+
+    def close(self):
+        """Release the game"""
+        if self.sim:
+            self.sim.close()
+            self.sim = None
+
+
+def run_worker(conn, shm_name, buffer_spec, indices, seeds, max_steps):
+    """Step a group of environments in a worker process on command"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    arrays = make_arrays(shm.buf, buffer_spec)
+    envs = [GameEnv(arrays, index, seed, max_steps) for index, seed in zip(indices, seeds)]
+    try:
+        while True:
+            command = conn.recv()
+            if command == 'reset':
+                for env in envs:
+                    env.reset()
+            elif command == 'step':
+                step_envs(envs, arrays)
+            else:
+                break
+            conn.send(True)
+    finally:
+        for env in envs:
+            env.close()
+        # Views must be released before the block can be closed
+        envs = arrays = None
+        shm.close()
+
+
+def step_envs(envs, arrays):
+    """Step environments with their actions, storing rewards and dones"""
+    actions = arrays['actions']
+    rewards = arrays['rewards']
+    dones = arrays['dones']
+    for env in envs:
+        rewards[env.index], dones[env.index] = env.step(int(actions[env.index]))
+
+
+class VecEnv:
+    """K independent games stepped in lockstep with one call
+
+    Observations are stacked NumPy arrays (first axis is the environment)
+    that are overwritten in place on every reset and step; copy them to
+    keep them. Environment i plays its n-th game with the n-th random seed
+    drawn from seed + i, and games that end are reset within the step that
+    ended them.
+
+    With workers > 0 the environments are split between worker processes
+    that write into one shared memory block, so only the commands go
+    through pipes.
+    """
+
+    def __init__(self, num_envs, seed=0, workers=0, max_steps=3 * 60 * 60,
+                 max_tanks=MAX_TANKS, max_bullets=MAX_BULLETS):
+        self.num_envs = num_envs
+        self.spec = get_observation_spec(max_tanks, max_bullets)
+        self.buffer_spec = get_buffer_spec(num_envs, self.spec)
+        self.shm = None
+        self.envs = []
+        self.workers = []  # (process, conn)
+
+        seeds = [seed + index for index in range(num_envs)]
+        size = get_buffer_size(self.buffer_spec)
+        if workers:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.arrays = make_arrays(self.shm.buf, self.buffer_spec)
+            groups = np.array_split(np.arange(num_envs), min(workers, num_envs))
+            for group in groups:
+                indices = group.tolist()
+                conn, worker_conn = multiprocessing.Pipe()
+                process = multiprocessing.Process(
+                    target=run_worker, daemon=True,
+                    args=(worker_conn, self.shm.name, self.buffer_spec, indices,
+                          [seeds[index] for index in indices], max_steps))
+                process.start()
+                worker_conn.close()
+                self.workers.append((process, conn))
+        else:
+            self.arrays = make_arrays(bytearray(size), self.buffer_spec)
+            self.envs = [GameEnv(self.arrays, index, seeds[index], max_steps)
+                         for index in range(num_envs)]
+
+        self.observations = {name: self.arrays[name] for name in self.spec}
+
+    def send(self, command):
+        """Run a command in all workers and wait until they are done"""
+        for _, conn in self.workers:
+            conn.send(command)
+        for _, conn in self.workers:
+            conn.recv()
+
+    def reset(self):
+        """Start new games in all environments, returns the observations"""
+        if self.workers:
+            self.send('reset')
+        else:
+            for env in self.envs:
+                env.reset()
+        return self.observations
+
+    def step(self, actions):
+        """Play one step in every environment
+
+        Returns (observations, rewards, dones); the arrays are reused by
+        the next call.
+        """
+        self.arrays['actions'][:] = actions
+        if self.workers:
+            self.send('step')
+        else:
+            step_envs(self.envs, self.arrays)
+        return self.observations, self.arrays['rewards'], self.arrays['dones']
+
+    def close(self):
+        """Stop the workers and release the shared memory"""
+        for process, conn in self.workers:
+            try:
+                conn.send('close')
+            except (BrokenPipeError, OSError):
+                pass
+        for process, conn in self.workers:
+            process.join()
+            conn.close()
+        self.workers = []
+        for env in self.envs:
+            env.close()
+        self.envs = []
+        if self.shm is not None:
+            self.arrays = None
+            self.observations = None
+            self.shm.unlink()
+            try:
+                self.shm.close()
+            except BufferError:
+                pass  # Callers still hold views, freed with the last one
+            self.shm = None
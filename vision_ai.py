@@ -1,132 +1,489 @@
 import pygame
 import math
 import random
+import time
+import numpy as np
+from collections import OrderedDict, deque
 from game_objects import *
+from config_manager import config
+from pathfinding import PathFinder, FlowFieldCache
+from ai_planner import PlanningPool
 
 # Game constants
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 TANK_SIZE = 40
 
+# Unit vectors for each facing direction
+DIRECTION_VECTORS = {
+    Direction.UP: (0, -1),
+    Direction.DOWN: (0, 1),
+    Direction.LEFT: (-1, 0),
+    Direction.RIGHT: (1, 0)
+}
+
+# Spacing of vision sample points in pixels
+VISION_SAMPLE_STEP = 10
+
+# Frames a tank may be blocked by another tank before it replans around it
+REPLAN_BLOCKED_FRAMES = 30
+
+# Spreads decision phases of new tanks evenly over the decision interval
+PHASE_STEP = 0.6180339887
+
+# Commanders follow the base flow field until they are this many tiles away
+DEFEND_RANGE_TILES = 3
+
+# Marks a path that is being planned by the planning pool
+PATH_PENDING = 'pending'
+
+class LineOfSightCache:
+    """Bounded LRU cache of cell-to-cell line of sight results
+
+    Each entry stores the first wall tile blocking the ray (or None). Walls
+    are only ever removed during a match, so destroying a tile can only
+    change entries blocked by that tile; those are found through an index
+    and dropped without flushing the rest of the cache.
+    """
+    
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.entries = OrderedDict()  # (from_cell, to_cell) -> blocking tile
+        self.blocked_by = {}          # blocking tile -> set of keys
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def __contains__(self, key):
+        return key in self.entries
+    
+    def get(self, key):
+        """Get the cached blocking tile of a ray and mark it recently used"""
+        blocking_tile = self.entries[key]
+        self.entries.move_to_end(key)
+        return blocking_tile
+    
+    def put(self, key, blocking_tile):
+        """Store a ray result, evicting the least recently used entry if full"""
+        if key in self.entries:
+            self.discard(key)
+        elif len(self.entries) >= self.capacity:
+            old_key = next(iter(self.entries))
+            self.discard(old_key)
+            self.evictions += 1
+        
+        self.entries[key] = blocking_tile
+        if blocking_tile is not None:
+            self.blocked_by.setdefault(blocking_tile, set()).add(key)
+    
+    def discard(self, key):
+        """Remove a single entry"""
+        blocking_tile = self.entries.pop(key)
+        if blocking_tile is not None:
+            keys = self.blocked_by[blocking_tile]
+            keys.discard(key)
+            if not keys:
+                del self.blocked_by[blocking_tile]
+    
+    def invalidate_tile(self, tile):
+        """Drop every entry whose ray was blocked by a destroyed tile"""
+        keys = self.blocked_by.pop(tile, ())
+        for key in keys:
+            del self.entries[key]
+        self.invalidations += len(keys)
+    
+    def clear(self):
+        """Drop every entry"""
+        self.invalidations += len(self.entries)
+        self.entries.clear()
+        self.blocked_by.clear()
+    
+    def get_stats(self):
+        """Get cache size, hit rate and eviction counters"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations
+        }
+
 class VisionSystem:
     def __init__(self, game):
         self.game = game
         self.vision_map = {}
-        self.shared_vision_enabled = True
         
-    def update_vision(self):
-        """Update vision for all tanks"""
-        self.vision_map.clear()
+        # Vision settings from config
+        vision_settings = config.get('vision_settings', {})
+        self.shared_vision_enabled = vision_settings.get('shared_vision_enabled', True)
+        self.grid_size = vision_settings.get('vision_grid_size', 20)
+        self.player_forward_multiplier = vision_settings.get('player_forward_vision_multiplier', 1.0)
+        self.player_side_multiplier = vision_settings.get('player_side_vision_multiplier', 0.7)
+        self.enemy_forward_multiplier = vision_settings.get('enemy_forward_vision_multiplier', 0.8)
+        self.enemy_side_multiplier = vision_settings.get('enemy_side_vision_multiplier', 0.5)
+        
+        # Vision grid covers every sample point with 0 <= x <= SCREEN_WIDTH
+        self.grid_cols = SCREEN_WIDTH // self.grid_size + 1
+        self.grid_rows = SCREEN_HEIGHT // self.grid_size + 1
+        
+        # Cone sample offsets keyed by (forward_range, side_range, direction)
+        self.stencils = {}
+        
+        # Union of all tank vision grids per team, rebuilt once per update
+        self.team_vision = {}
+        
+        # Teams whose members share vision (teams with a living commander)
+        self.shared_teams = set()
+        
+        # Debug overlay surfaces per team, redrawn when vision_version changes
+        self.vision_version = 0
+        self.overlay_version = -1
+        self.overlay_surfaces = {}
+        self.overlay_cells = pygame.Surface((self.grid_cols, self.grid_rows))
         
-        # First check if commander tank is alive
-        commander_alive = any(tank.tank_type == TankType.ENEMY_COMMANDER and tank.is_alive 
-                            for tank in self.game.tanks)
+        # Cell-to-cell line of sight cache and the wall changes it has seen
+        self.los_cache = LineOfSightCache(vision_settings.get('los_cache_capacity', 4096))
+        self.los_generation = None
+        self.los_removed_count = 0
         
-        # If commander tank is alive, enable shared vision
-        self.shared_vision_enabled = commander_alive
+        # Refresh scheduling: about one bucket per frame, so each tank is
+        # refreshed once per vision_check_interval
+        tick_rate = config.get('game_settings.tick_rate', 60)
+        check_interval = config.get('ai_settings.vision_check_interval', 100)
+        self.bucket_count = max(1, round(check_interval * tick_rate / 1000))
+        self.next_bucket = 0
+        self.frame = 0
+        self.frame_budget_ms = vision_settings.get('vision_frame_budget_ms', 2.0)
+        self.priority_range = vision_settings.get('vision_priority_range', 200)
+        self.refresh_chunk_size = 8
         
-        for tank in self.game.tanks:
-            if tank.is_alive:
-                self.update_tank_vision(tank)
+        # Cone cache and scheduling counters
+        self.stats = {
+            'recomputed': 0,
+            'reused': 0,
+            'total_recomputed': 0,
+            'total_reused': 0,
+            'refreshed': 0,
+            'deferred': 0,
+            'max_staleness': 0
+        }
+        
+    def update_vision(self, priority_tanks=()):
+        """Update vision for all tanks
+
+        Cones are cached per tank and only recomputed when the tank's vision
+        key (center cell, direction, vision range) or the wall layout epoch
+        changed since the cone was built.
+        
+        Refreshes are staggered: each tank belongs to one of bucket_count
+        round-robin buckets and is refreshed when its bucket comes up, so
+        every tank is refreshed about once per vision_check_interval. New
+        tanks, player tanks, tanks near a player and priority_tanks (e.g.
+        attacking tanks) are refreshed every frame. Work beyond the frame
+        budget is deferred to later frames, stalest tanks first.
+        """
+        self.frame += 1
+        
+        # Teams with a living commander tank share vision
+        self.shared_teams.clear()
+        if self.shared_vision_enabled:
+            for tank in self.game.tanks:
+                if tank.tank_type == TankType.ENEMY_COMMANDER and tank.is_alive:
+                    self.shared_teams.add(tank.team)
+        
+        epoch = self.game.tile_map.epoch
+        tanks = [tank for tank in self.game.tanks if tank.is_alive]
+        
+        # Drop cached cones of tanks that died or left the game
+        alive_ids = {id(tank) for tank in tanks}
+        removed = [tank_id for tank_id in self.vision_map if tank_id not in alive_ids]
+        for tank_id in removed:
+            del self.vision_map[tank_id]
+        
+        # Sort tanks into new, urgent and scheduled refreshes
+        players = [tank for tank in tanks if tank.tank_type == TankType.PLAYER]
+        priority_ids = {id(tank) for tank in priority_tanks}
+        bucket = self.frame % self.bucket_count
+        new_tanks, urgent, scheduled = [], [], []
+        for tank in tanks:
+            vision_data = self.vision_map.get(id(tank))
+            if vision_data is None or vision_data['tank'] is not tank:
+                new_tanks.append(tank)
+            elif (id(tank) in priority_ids or tank.tank_type == TankType.PLAYER
+                    or self.is_near_player(tank, players)):
+                urgent.append(tank)
+            elif (vision_data['bucket'] == bucket
+                    or self.frame - vision_data['updated_frame'] > self.bucket_count):
+                scheduled.append(tank)
+        scheduled.sort(key=lambda tank: self.vision_map[id(tank)]['updated_frame'])
+        
+        # New tanks have no vision yet and are always computed
+        recomputed = self.refresh_tanks(new_tanks, epoch)
+        
+        # Refresh the rest in chunks until the frame budget is spent
+        queue = urgent + scheduled
+        deferred = 0
+        start_time = time.perf_counter()
+        for index in range(0, len(queue), self.refresh_chunk_size):
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            if index > 0 and self.frame_budget_ms and elapsed_ms >= self.frame_budget_ms:
+                deferred = len(queue) - index
+                break
+            recomputed += self.refresh_tanks(queue[index:index + self.refresh_chunk_size], epoch)
+        
+        # Update counters
+        self.stats['recomputed'] = recomputed
+        self.stats['reused'] = len(tanks) - recomputed
+        self.stats['total_recomputed'] += recomputed
+        self.stats['total_reused'] += self.stats['reused']
+        self.stats['refreshed'] = len(new_tanks) + len(queue) - deferred
+        self.stats['deferred'] = deferred
+        self.stats['max_staleness'] = max(
+            (self.frame - vision_data['updated_frame'] for vision_data in self.vision_map.values()),
+            default=0
+        )
+        
+        # Rebuild team-wide union of vision only when a cone changed
+        if recomputed or removed or not self.team_vision:
+            self.update_team_vision()
     
-    def update_tank_vision(self, tank):
-        """Update vision for single tank"""
-        vision_cells = set()
+    def refresh_tanks(self, tanks, epoch):
+        """Refresh vision of several tanks, recomputing only stale cones
+
+        Returns the number of recomputed cones.
+        """
+        dirty = []
+        for tank in tanks:
+            vision_data = self.vision_map.get(id(tank))
+            if (vision_data is None or vision_data['tank'] is not tank
+                    or vision_data['epoch'] != epoch
+                    or vision_data['key'] != self.get_vision_key(tank)):
+                dirty.append(tank)
+            else:
+                vision_data['updated_frame'] = self.frame
         
-        # Calculate vision based on tank type and direction
-        if tank.tank_type == TankType.PLAYER:
-            # Player tanks have better vision
-            forward_range = tank.vision_range
-            side_range = tank.vision_range * 0.7
+        # Recompute dirty cones in one batch
+        grids = self.compute_vision_grids(dirty)
+        for index, tank in enumerate(dirty):
+            self.store_vision(tank, grids[index], epoch)
+        
+        return len(dirty)
+    
+    def store_vision(self, tank, grid, epoch):
+        """Store a freshly computed cone, assigning new tanks a refresh bucket"""
+        vision_data = self.vision_map.get(id(tank))
+        if vision_data is None or vision_data['tank'] is not tank:
+            bucket = self.next_bucket
+            self.next_bucket = (self.next_bucket + 1) % self.bucket_count
         else:
-            # Enemy tanks have smaller vision
-            forward_range = tank.vision_range * 0.8
-            side_range = tank.vision_range * 0.5
+            bucket = vision_data['bucket']
         
-        # Calculate vision range
+        self.vision_map[id(tank)] = {
+            'grid': grid,
+            'tank': tank,
+            'key': self.get_vision_key(tank),
+            'epoch': epoch,
+            'bucket': bucket,
+            'updated_frame': self.frame
+        }
+    
+    def is_near_player(self, tank, players):
+        """Check if a tank is within priority range of any player tank"""
+        max_distance = self.priority_range ** 2
+        for player in players:
+            if (tank.x - player.x) ** 2 + (tank.y - player.y) ** 2 <= max_distance:
+                return True
+        return False
+    
+    def get_vision_staleness(self, tank):
+        """Get the number of frames since a tank's vision was refreshed"""
+        vision_data = self.vision_map.get(id(tank))
+        if vision_data is None:
+            return None
+        return self.frame - vision_data['updated_frame']
+    
+    def update_team_vision(self):
+        """Build team-wide union of vision"""
+        self.vision_version += 1
+        self.team_vision.clear()
+        for vision_data in self.vision_map.values():
+            team = vision_data['tank'].team
+            if team not in self.team_vision:
+                self.team_vision[team] = vision_data['grid'].copy()
+            else:
+                self.team_vision[team] |= vision_data['grid']
+    
+    def update_tank_vision(self, tank):
+        """Update vision for single tank"""
+        epoch = self.game.tile_map.epoch
+        self.store_vision(tank, self.compute_vision_grids([tank])[0], epoch)
+        self.update_team_vision()
+    
+    def get_vision_key(self, tank):
+        """Get the cache key of a tank's vision cone
+
+        Positions are quantized to the vision grid, so a tank moving inside
+        one cell keeps the cone built when it entered the cell.
+        """
         center_x = tank.x + tank.size // 2
         center_y = tank.y + tank.size // 2
+        return (int(center_x // self.grid_size), int(center_y // self.grid_size),
+                tank.direction, tank.vision_range)
+    
+    def get_vision_stats(self):
+        """Get cone cache counters (last frame and totals)"""
+        total = self.stats['total_recomputed'] + self.stats['total_reused']
+        stats = dict(self.stats)
+        stats['hit_rate'] = self.stats['total_reused'] / total if total else 0.0
+        return stats
+    
+    def empty_grid(self):
+        """Create an empty vision grid"""
+        return np.zeros((self.grid_rows, self.grid_cols), dtype=bool)
+    
+    def get_vision_ranges(self, tank):
+        """Get forward and side vision range based on tank type"""
+        if tank.tank_type == TankType.PLAYER:
+            # Player tanks have better vision
+            return (tank.vision_range * self.player_forward_multiplier,
+                    tank.vision_range * self.player_side_multiplier)
+        # Enemy tanks have smaller vision
+        return (tank.vision_range * self.enemy_forward_multiplier,
+                tank.vision_range * self.enemy_side_multiplier)
+    
+    def get_vision_stencil(self, forward_range, side_range, direction):
+        """Get sample point offsets of a vision cone relative to the tank center"""
+        key = (int(forward_range), int(side_range), direction)
+        stencil = self.stencils.get(key)
+        if stencil is None:
+            dir_x, dir_y = DIRECTION_VECTORS[direction]
+            
+            # Perpendicular direction
+            perp_x = -dir_y
+            perp_y = dir_x
+            
+            distances = np.arange(0, key[0], VISION_SAMPLE_STEP)
+            side_offsets = np.arange(-key[1], key[1], VISION_SAMPLE_STEP)
+            distance, side_offset = np.meshgrid(distances, side_offsets, indexing='ij')
+            
+            offsets_x = (dir_x * distance + perp_x * side_offset).ravel().astype(np.float64)
+            offsets_y = (dir_y * distance + perp_y * side_offset).ravel().astype(np.float64)
+            stencil = (offsets_x, offsets_y)
+            self.stencils[key] = stencil
         
-        # Adjust vision based on direction
-        if tank.direction == Direction.UP:
-            vision_cells = self.calculate_vision_area(
-                center_x, center_y, forward_range, side_range, 0, -1
-            )
-        elif tank.direction == Direction.DOWN:
-            vision_cells = self.calculate_vision_area(
-                center_x, center_y, forward_range, side_range, 0, 1
-            )
-        elif tank.direction == Direction.LEFT:
-            vision_cells = self.calculate_vision_area(
-                center_x, center_y, forward_range, side_range, -1, 0
-            )
-        elif tank.direction == Direction.RIGHT:
-            vision_cells = self.calculate_vision_area(
-                center_x, center_y, forward_range, side_range, 1, 0
-            )
-        
-        # Store vision information
-        tank_id = id(tank)
-        self.vision_map[tank_id] = {
-            'cells': vision_cells,
-            'tank': tank
-        }
+        return stencil
     
-    def calculate_vision_area(self, center_x, center_y, forward_range, side_range, dir_x, dir_y):
-        """Calculate vision area"""
-        vision_cells = set()
+    def compute_vision_grids(self, tanks):
+        """Calculate vision grids of several tanks in one vectorized pass"""
+        grids = np.zeros((len(tanks), self.grid_rows, self.grid_cols), dtype=bool)
+        if not tanks:
+            return grids
         
-        # Calculate perpendicular direction
-        perp_x = -dir_y
-        perp_y = dir_x
+        offsets_x, offsets_y, centers_x, centers_y, counts = [], [], [], [], []
+        for tank in tanks:
+            forward_range, side_range = self.get_vision_ranges(tank)
+            stencil_x, stencil_y = self.get_vision_stencil(forward_range, side_range, tank.direction)
+            offsets_x.append(stencil_x)
+            offsets_y.append(stencil_y)
+            centers_x.append(tank.x + tank.size // 2)
+            centers_y.append(tank.y + tank.size // 2)
+            counts.append(len(stencil_x))
         
-        # Sample points within vision area
-        for distance in range(0, int(forward_range), 10):
-            for side_offset in range(-int(side_range), int(side_range), 10):
-                x = center_x + dir_x * distance + perp_x * side_offset
-                y = center_y + dir_y * distance + perp_y * side_offset
-                
-                # Check if within screen bounds
-                if 0 <= x <= SCREEN_WIDTH and 0 <= y <= SCREEN_HEIGHT:
-                    # Check if blocked by walls
-                    if not self.is_vision_blocked(center_x, center_y, x, y):
-                        vision_cells.add((int(x // 20), int(y // 20)))  # Grid
+        # Sample points of all cones, each tagged with its owner index
+        owners = np.repeat(np.arange(len(tanks)), counts)
+        start_x = np.repeat(np.array(centers_x, dtype=np.float64), counts)
+        start_y = np.repeat(np.array(centers_y, dtype=np.float64), counts)
+        end_x = start_x + np.concatenate(offsets_x)
+        end_y = start_y + np.concatenate(offsets_y)
+        
+        # Keep points within screen bounds
+        inside = (end_x >= 0) & (end_x <= SCREEN_WIDTH) & (end_y >= 0) & (end_y <= SCREEN_HEIGHT)
+        owners = owners[inside]
+        start_x, start_y = start_x[inside], start_y[inside]
+        end_x, end_y = end_x[inside], end_y[inside]
+        
+        # Drop points blocked by walls
+        visible = ~self.game.tile_map.blocked_rays(start_x, start_y, end_x, end_y)
+        
+        cell_x = np.floor_divide(end_x[visible], self.grid_size).astype(np.intp)
+        cell_y = np.floor_divide(end_y[visible], self.grid_size).astype(np.intp)
+        grids[owners[visible], cell_y, cell_x] = True
         
-        return vision_cells
+        return grids
     
     def is_vision_blocked(self, start_x, start_y, end_x, end_y):
         """Check if vision is blocked by walls"""
-        # Simple ray detection
-        steps = int(max(abs(end_x - start_x), abs(end_y - start_y)) // 10)
-        if steps == 0:
-            return False
+        # Grid traversal over the wall occupancy map, O(tiles crossed)
+        return self.game.tile_map.is_ray_blocked(start_x, start_y, end_x, end_y)
+    
+    def sync_los_cache(self):
+        """Invalidate line of sight entries affected by wall changes"""
+        tile_map = self.game.tile_map
+        if self.los_generation != tile_map.generation:
+            # Whole map was rebuilt
+            self.los_cache.clear()
+            self.los_generation = tile_map.generation
+            self.los_removed_count = len(tile_map.removed_tiles)
+            return
         
-        dx = (end_x - start_x) / steps
-        dy = (end_y - start_y) / steps
+        while self.los_removed_count < len(tile_map.removed_tiles):
+            self.los_cache.invalidate_tile(tile_map.removed_tiles[self.los_removed_count])
+            self.los_removed_count += 1
+    
+    def is_cell_visible(self, from_cell, to_cell):
+        """Check line of sight between the centers of two vision grid cells"""
+        self.sync_los_cache()
         
-        for i in range(steps):
-            check_x = start_x + dx * i
-            check_y = start_y + dy * i
-            
-            # Check if hit wall
-            for wall in self.game.walls:
-                if (wall.x <= check_x <= wall.x + wall.size and 
-                    wall.y <= check_y <= wall.y + wall.size):
-                    return True
+        key = (from_cell, to_cell)
+        if key in self.los_cache:
+            self.los_cache.hits += 1
+            return self.los_cache.get(key) is None
         
-        return False
+        self.los_cache.misses += 1
+        half = self.grid_size / 2
+        blocking_tile = self.game.tile_map.first_blocking_tile(
+            from_cell[0] * self.grid_size + half, from_cell[1] * self.grid_size + half,
+            to_cell[0] * self.grid_size + half, to_cell[1] * self.grid_size + half
+        )
+        self.los_cache.put(key, blocking_tile)
+        return blocking_tile is None
     
-    def get_shared_vision(self):
-        """Get shared vision"""
-        if not self.shared_vision_enabled:
-            return set()
-        
-        shared_vision = set()
-        for vision_data in self.vision_map.values():
-            if vision_data['tank'].tank_type != TankType.PLAYER:  # Enemy shared vision
-                shared_vision.update(vision_data['cells'])
+    def has_line_of_sight(self, start_x, start_y, end_x, end_y):
+        """Check line of sight between two pixel positions (cached per cell pair)"""
+        return self.is_cell_visible(
+            (int(start_x // self.grid_size), int(start_y // self.grid_size)),
+            (int(end_x // self.grid_size), int(end_y // self.grid_size))
+        )
+    
+    def can_tank_see_point(self, tank, x, y):
+        """Check if nothing blocks the line from a tank's center to a point"""
+        return self.has_line_of_sight(tank.x + tank.size // 2, tank.y + tank.size // 2, x, y)
+    
+    def get_los_stats(self):
+        """Get line of sight cache statistics"""
+        return self.los_cache.get_stats()
+    
+    def get_shared_vision(self, team='enemy'):
+        """Get shared vision of a team"""
+        if team not in self.shared_teams or team not in self.team_vision:
+            return self.empty_grid()
         
-        return shared_vision
+        return self.team_vision[team]
+    
+    def get_cell(self, x, y):
+        """Convert a pixel position to a vision grid cell, None if off the grid"""
+        cell_x = int(x // self.grid_size)
+        cell_y = int(y // self.grid_size)
+        if 0 <= cell_x < self.grid_cols and 0 <= cell_y < self.grid_rows:
+            return cell_x, cell_y
+        return None
     
     def is_in_vision(self, tank, target_x, target_y):
         """Check if target position is in tank vision"""
@@ -134,83 +491,254 @@ class VisionSystem:
         if tank_id not in self.vision_map:
             return False
         
-        target_cell = (int(target_x // 20), int(target_y // 20))
+        target_cell = self.get_cell(target_x, target_y)
+        if target_cell is None:
+            return False
+        cell_x, cell_y = target_cell
         
         # Check direct vision
-        if target_cell in self.vision_map[tank_id]['cells']:
+        if self.vision_map[tank_id]['grid'][cell_y, cell_x]:
             return True
         
-        # Check shared vision
-        if self.shared_vision_enabled and tank.tank_type != TankType.PLAYER:
-            shared_vision = self.get_shared_vision()
-            return target_cell in shared_vision
+        # Check shared vision of the tank's team
+        if tank.team in self.shared_teams:
+            return bool(self.team_vision[tank.team][cell_y, cell_x])
         
         return False
     
     def draw_vision(self, screen):
-        """Draw vision (for debugging)"""
-        for vision_data in self.vision_map.values():
-            tank = vision_data['tank']
-            cells = vision_data['cells']
-            
-            # Use different colors for different tank types
-            if tank.tank_type == TankType.PLAYER:
-                color = (0, 255, 0, 30)  # Semi-transparent green
+        """Draw vision (for debugging)
+
+        Each team's vision is drawn into a small surface with one pixel per
+        vision cell, scaled up to screen size and cached until vision changes,
+        so a frame costs one blit per team.
+        """
+        if self.overlay_version != self.vision_version:
+            self.update_vision_overlay()
+        
+        for surface in self.overlay_surfaces.values():
+            screen.blit(surface, (0, 0))
+    
+    def update_vision_overlay(self):
+        """Redraw cached overlay surfaces from team vision grids"""
+        for team in list(self.overlay_surfaces):
+            if team not in self.team_vision:
+                del self.overlay_surfaces[team]
+        
+        for team, team_vision in self.team_vision.items():
+            # Use different colors for player and enemy teams
+            if team == 'player':
+                color = (0, 255, 0)  # Semi-transparent green
             else:
-                color = (255, 0, 0, 30)  # Semi-transparent red
+                color = (255, 0, 0)  # Semi-transparent red
+            
+            # One pixel per cell; surfarray is indexed [x, y]
+            pixels = np.zeros((self.grid_cols, self.grid_rows, 3), dtype=np.uint8)
+            pixels[team_vision.T] = color
+            pygame.surfarray.blit_array(self.overlay_cells, pixels)
             
-            # Draw vision area
-            for cell_x, cell_y in cells:
-                rect = pygame.Rect(cell_x * 20, cell_y * 20, 20, 20)
-                s = pygame.Surface((20, 20))
-                s.set_alpha(30)
-                s.fill(color[:3])
-                screen.blit(s, rect)
+            surface = self.overlay_surfaces.get(team)
+            if surface is None:
+                surface = pygame.Surface((self.grid_cols * self.grid_size,
+                                          self.grid_rows * self.grid_size))
+                surface.set_colorkey(BLACK)
+                surface.set_alpha(30)
+                self.overlay_surfaces[team] = surface
+            pygame.transform.scale(self.overlay_cells, surface.get_size(), surface)
+        
+        self.overlay_version = self.vision_version
+
+class AIState:
+    """AI state of one enemy tank, owned by the tank (tank.ai_state)"""
+    
+    __slots__ = ('state', 'target', 'last_decision_time', 'decision_pending',
+                 'patrol_target', 'defend_target', 'attack_cooldown',
+                 'path', 'path_index', 'path_goal', 'path_epoch', 'blocked_frames')
+    
+    def __init__(self, patrol_target, last_decision_time):
+        self.state = 'patrol'  # patrol, attack, defend
+        self.target = None
+        self.last_decision_time = last_decision_time
+        self.decision_pending = False
+        self.patrol_target = patrol_target
+        self.defend_target = None
+        self.attack_cooldown = 0
+        self.path = None  # Waypoint tiles from the path cache
+        self.path_index = 0
+        self.path_goal = None
+        self.path_epoch = None
+        self.blocked_frames = 0
 
 class AdvancedAI:
     def __init__(self, game, vision_system):
         self.game = game
         self.vision_system = vision_system
-        self.ai_states = {}  # Store AI state for each tank
+        # Tick clock and RNG of the game, a Simulation injects its own
+        self.get_ticks = getattr(game, 'get_ticks', pygame.time.get_ticks)
+        self.rng = getattr(game, 'rng', random)
+        # Shared A* planner, paths are cached for all tanks
+        self.pathfinder = PathFinder(game.tile_map, config.get('ai_settings.path_cache_capacity', 512))
+        
+        # Shared flow fields towards common goals (player, base)
+        self.flow_fields = FlowFieldCache(game.tile_map)
+        
+        # Optional process pool for A* planning, None plans in-process
+        self.planner = None
+        if config.get('ai_settings.planning_mode', 'inline') == 'process':
+            self.planner = PlanningPool(game.tile_map, config.get('ai_settings.planning_workers', 0))
+            if not self.planner.available:
+                self.planner = None
+        
+        # Decision scheduling
+        self.decision_queue = deque()
+        self.decision_budget_ms = config.get('ai_settings.decision_budget_ms', 2.0)
+        self.tanks_seen = 0
+        self.stats = {
+            'decisions': 0,
+            'deferred': 0,
+            'total_decisions': 0,
+            'total_deferred': 0,
+            'frame_ms': 0.0,
+            'worst_frame_ms': 0.0
+        }
         
     def update_ai(self):
-        """Update behavior for all AI tanks"""
-        for tank in self.game.tanks:
-            if tank.tank_type != TankType.PLAYER and tank.is_alive:
-                self.update_tank_ai(tank)
-    
-    def update_tank_ai(self, tank):
-        """Update AI behavior for single tank"""
-        tank_id = id(tank)
+        """Update behavior for all AI tanks
+
+        Due decisions are queued and made within decision_budget_ms per
+        frame; decisions that do not fit are carried over to the next frame.
+        Movement and shooting still run for every tank every frame.
+        In process planning mode, paths planned since the last frame are
+        applied first and new path requests are sent to the pool last.
+        """
+        frame_start = time.perf_counter()
+        current_time = self.get_ticks()
+        
+        if self.planner:
+            self.apply_planned_paths()
+        
+        tanks = [tank for tank in self.game.tanks
+                 if tank.tank_type != TankType.PLAYER and tank.is_alive]
         
-        # Initialize AI state
-        if tank_id not in self.ai_states:
-            self.ai_states[tank_id] = {
-                'state': 'patrol',  # patrol, attack, defend
-                'target': None,
-                'last_decision_time': 0,
-                'patrol_target': self.get_random_position(),
-                'attack_cooldown': 0
-            }
+        # Queue tanks whose decision is due
+        for tank in tanks:
+            state = self.get_ai_state(tank, current_time)
+            
+            # Update cooldown
+            if state.attack_cooldown > 0:
+                state.attack_cooldown -= 1
+            
+            if (not state.decision_pending
+                    and current_time - state.last_decision_time > tank.ai_decision_interval):
+                state.decision_pending = True
+                self.decision_queue.append(tank)
+        
+        decisions = self.process_decision_queue(current_time, frame_start)
+        
+        # Execute behavior based on state
+        for tank in tanks:
+            self.execute_behavior(tank, tank.ai_state)
+        
+        if self.planner:
+            self.planner.flush(self.game.tanks)
         
-        current_time = pygame.time.get_ticks()
-        state = self.ai_states[tank_id]
+        # Update counters
+        frame_ms = (time.perf_counter() - frame_start) * 1000
+        self.stats['decisions'] = decisions
+        self.stats['deferred'] = len(self.decision_queue)
+        self.stats['total_decisions'] += decisions
+        self.stats['total_deferred'] += len(self.decision_queue)
+        self.stats['frame_ms'] = frame_ms
+        self.stats['worst_frame_ms'] = max(self.stats['worst_frame_ms'], frame_ms)
+    
+    def process_decision_queue(self, current_time, frame_start):
+        """Make queued decisions until the frame budget is spent
+
+        At least one decision is made per frame so the queue always drains.
+        Returns the number of decisions made.
+        """
+        decisions = 0
+        while self.decision_queue:
+            elapsed_ms = (time.perf_counter() - frame_start) * 1000
+            if decisions and self.decision_budget_ms and elapsed_ms >= self.decision_budget_ms:
+                break
+            
+            tank = self.decision_queue.popleft()
+            state = tank.ai_state
+            if state is None or not tank.is_alive:
+                continue
+            
+            state.decision_pending = False
+            self.make_ai_decision(tank, state)
+            state.last_decision_time = current_time
+            decisions += 1
+        
+        return decisions
+    
+    def get_ai_state(self, tank, current_time):
+        """Get AI state of a tank, creating it for tanks added without register_tanks"""
+        if tank.ai_state is None:
+            self.on_tank_spawned(tank, current_time)
+        return tank.ai_state
+    
+    def on_tank_spawned(self, tank, current_time):
+        """Attach a fresh AI state to a new tank
+
+        New tanks get a decision phase offset so tanks spawned together do
+        not all make their decisions on the same frame.
+        """
+        phase = (self.tanks_seen * PHASE_STEP) % 1.0
+        self.tanks_seen += 1
+        tank.ai_state = AIState(self.get_random_position(),
+                                current_time - phase * tank.ai_decision_interval)
+    
+    def on_tank_destroyed(self, tank):
+        """Release the AI state of a destroyed tank"""
+        tank.ai_state = None
+    
+    def reset(self):
+        """Forget scheduled work when a new level starts"""
+        self.decision_queue.clear()
+        self.tanks_seen = 0
+        if self.planner:
+            self.planner.cancel()
+    
+    def close(self):
+        """Stop the planning pool"""
+        if self.planner:
+            self.planner.close()
+            self.planner = None
+    
+    def get_ai_stats(self):
+        """Get decision scheduler counters"""
+        stats = dict(self.stats)
+        if self.planner:
+            stats['planner'] = self.planner.get_stats()
+        return stats
+    
+    def update_tank_ai(self, tank):
+        """Update AI behavior for single tank (without the frame budget)"""
+        current_time = self.get_ticks()
+        state = self.get_ai_state(tank, current_time)
         
         # Update cooldown
-        if state['attack_cooldown'] > 0:
-            state['attack_cooldown'] -= 1
+        if state.attack_cooldown > 0:
+            state.attack_cooldown -= 1
         
         # Make decision periodically
-        if current_time - state['last_decision_time'] > 1000:  # 1 second
+        if current_time - state.last_decision_time > tank.ai_decision_interval:
             self.make_ai_decision(tank, state)
-            state['last_decision_time'] = current_time
+            state.last_decision_time = current_time
         
-        # Execute behavior based on state
-        if state['state'] == 'patrol':
+        self.execute_behavior(tank, state)
+    
+    def execute_behavior(self, tank, state):
+        """Execute behavior based on state"""
+        if state.state == 'patrol':
             self.execute_patrol(tank, state)
-        elif state['state'] == 'attack':
+        elif state.state == 'attack':
             self.execute_attack(tank, state)
-        elif state['state'] == 'defend':
+        elif state.state == 'defend':
             self.execute_defend(tank, state)
     
     def make_ai_decision(self, tank, state):
@@ -220,16 +748,21 @@ class AdvancedAI:
         
         if player_tank and self.can_see_target(tank, player_tank):
             # Can see player, enter attack state
-            state['state'] = 'attack'
-            state['target'] = player_tank
+            state.state = 'attack'
+            state.target = player_tank
         elif tank.tank_type == TankType.ENEMY_COMMANDER:
             # Commander tank tends to defend base
-            state['state'] = 'defend'
+            state.state = 'defend'
         else:
             # Patrol state
-            state['state'] = 'patrol'
-            if not state['patrol_target'] or self.reached_position(tank, state['patrol_target']):
-                state['patrol_target'] = self.get_random_position()
+            state.state = 'patrol'
+            if not state.patrol_target or self.reached_position(tank, state.patrol_target):
+                state.patrol_target = self.get_random_position()
+    
+    def get_attacking_tanks(self):
+        """Get AI tanks currently in attack state"""
+        return [tank for tank in self.game.tanks
+                if tank.ai_state is not None and tank.ai_state.state == 'attack']
     
     def find_player_tank(self, tank):
         """Find player tank"""
@@ -247,43 +780,27 @@ class AdvancedAI:
     
     def execute_patrol(self, tank, state):
         """Execute patrol behavior"""
-        if not state['patrol_target']:
-            state['patrol_target'] = self.get_random_position()
-            state['stuck_counter'] = 0
-        
-        # Check if tank is stuck (not moving towards target)
-        old_distance = math.sqrt((tank.x - state['patrol_target'][0])**2 + (tank.y - state['patrol_target'][1])**2)
-        
-        # Move towards patrol target
-        self.move_towards(tank, state['patrol_target'][0], state['patrol_target'][1])
+        if not state.patrol_target:
+            state.patrol_target = self.get_random_position()
         
-        # Check if tank made progress
-        new_distance = math.sqrt((tank.x - state['patrol_target'][0])**2 + (tank.y - state['patrol_target'][1])**2)
+        # Follow waypoints towards patrol target
+        status = self.move_along_path(tank, state, state.patrol_target[0], state.patrol_target[1])
         
-        if new_distance >= old_distance:  # Tank didn't make progress
-            state['stuck_counter'] = state.get('stuck_counter', 0) + 1
-            if state['stuck_counter'] > 10:  # If stuck for too long, choose new target
-                state['patrol_target'] = self.get_random_position()
-                state['stuck_counter'] = 0
-        else:
-            state['stuck_counter'] = 0
-        
-        # If reached patrol target, choose new one
-        if new_distance < 20:
-            state['patrol_target'] = self.get_random_position()
-            state['stuck_counter'] = 0
+        # If reached or unreachable, choose new patrol target
+        if status != 'moving':
+            state.patrol_target = self.get_random_position()
         
         # Change direction randomly
-        if random.random() < tank.direction_change_chance:
-            tank.direction = random.choice(list(Direction))
+        if self.rng.random() < tank.direction_change_chance:
+            tank.direction = self.rng.choice(DIRECTIONS)
     
     def execute_attack(self, tank, state):
         """Execute attack behavior"""
-        if not state['target'] or not state['target'].is_alive:
-            state['state'] = 'patrol'
+        if not state.target or not state.target.is_alive:
+            state.state = 'patrol'
             return
         
-        target = state['target']
+        target = state.target
         
         # Calculate direction to target
         dx = target.x - tank.x
@@ -301,45 +818,250 @@ class AdvancedAI:
             else:
                 tank.direction = Direction.UP
         
-        # Try to move towards target
-        self.move_towards(tank, target.x, target.y)
+        # Try to move towards target along the shared flow field
+        if self.move_along_flow_field(tank, target.x, target.y) == 'no_path':
+            self.move_towards(tank, target.x, target.y)
         
-        # If in shooting range and no cooldown, shoot
+        # If in shooting range and no cooldown, shoot with the tank's
+        # attack chance; a missed roll holds fire for one cooldown too
         distance = math.sqrt(dx**2 + dy**2)
-        if distance < 200 and state['attack_cooldown'] == 0:
-            bullet = tank.shoot()
+        if distance < 200 and state.attack_cooldown == 0:
+            if self.rng.random() >= tank.attack_chance:
+                state.attack_cooldown = 30
+                return
+            bullet = tank.shoot(self.get_ticks())
             if bullet:
                 self.game.bullets.append(bullet)
-                state['attack_cooldown'] = 30  # 0.5 second cooldown
+                state.attack_cooldown = 30  # 30 steps, 0.5 seconds at 60 steps per second
     
     def execute_defend(self, tank, state):
         """Execute defense behavior"""
         if not self.game.base:
-            state['state'] = 'patrol'
+            state.state = 'patrol'
+            return
+        
+        # Approach the base along its shared flow field
+        tile_map = self.game.tile_map
+        base_tile = tile_map.tile_at(self.game.base.x + self.game.base.size // 2,
+                                     self.game.base.y + self.game.base.size // 2)
+        tank_tile = tile_map.tile_at(tank.x + tank.size // 2, tank.y + tank.size // 2)
+        base_distance = self.flow_fields.get_field(base_tile).get_distance(tank_tile)
+        if base_distance < 0:
+            # Walled off from the base, patrol until the walls change
+            state.defend_target = None
+            self.execute_patrol(tank, state)
+            self.check_threats(tank, state)
+            return
+        if base_distance > DEFEND_RANGE_TILES:
+            self.move_along_flow_field(tank, self.game.base.x, self.game.base.y)
+            state.defend_target = None
+            self.check_threats(tank, state)
             return
         
         # Patrol near base
+        if not state.defend_target:
+            state.defend_target = self.get_defend_position()
+        defend_x, defend_y = state.defend_target
+        
+        # Move towards defense position, pick another one once reached
+        status = self.move_along_path(tank, state, defend_x, defend_y)
+        if status == 'no_path':
+            self.move_towards(tank, defend_x, defend_y)
+        if status != 'moving':
+            state.defend_target = None
+        
+        self.check_threats(tank, state)
+    
+    def check_threats(self, tank, state):
+        """Switch to attack when the player is visible"""
+        player_tank = self.find_player_tank(tank)
+        if player_tank and self.can_see_target(tank, player_tank):
+            state.state = 'attack'
+            state.target = player_tank
+    
+    def get_defend_position(self):
+        """Get a random defense position around the base"""
         base_x = self.game.base.x + self.game.base.size // 2
         base_y = self.game.base.y + self.game.base.size // 2
         
         # Calculate defense position
         defend_distance = 100
-        angle = random.uniform(0, 2 * math.pi)
+        angle = self.rng.uniform(0, 2 * math.pi)
         defend_x = base_x + math.cos(angle) * defend_distance
         defend_y = base_y + math.sin(angle) * defend_distance
         
         # Ensure defense position is within map
         defend_x = max(TANK_SIZE, min(SCREEN_WIDTH - TANK_SIZE, defend_x))
         defend_y = max(TANK_SIZE, min(SCREEN_HEIGHT - TANK_SIZE, defend_y))
+        return (defend_x, defend_y)
+    
+    def move_along_flow_field(self, tank, target_x, target_y):
+        """Step towards a goal shared by many tanks using its flow field
+
+        Every tank heading to the same goal tile samples the same cached
+        field, so the per-tank cost is O(1) regardless of map size.
+        Returns 'moving', 'arrived' or 'no_path'.
+        """
+        tile_map = self.game.tile_map
+        start = tile_map.tile_at(tank.x + tank.size // 2, tank.y + tank.size // 2)
+        goal = tile_map.tile_at(target_x + TANK_SIZE // 2, target_y + TANK_SIZE // 2)
+        if start == goal:
+            return 'arrived'
         
-        # Move towards defense position
-        self.move_towards(tank, defend_x, defend_y)
+        next_tile = self.flow_fields.get_field(goal).next_tile(start)
+        if next_tile is None:
+            return 'no_path'
         
-        # Check for threats
-        player_tank = self.find_player_tank(tank)
-        if player_tank and self.can_see_target(tank, player_tank):
-            state['state'] = 'attack'
-            state['target'] = player_tank
+        # Go around other tanks greedily
+        if self.step_towards(tank, next_tile[0] * tile_map.tile_size,
+                             next_tile[1] * tile_map.tile_size) == 'blocked':
+            self.move_towards(tank, target_x, target_y)
+        return 'moving'
+    
+    def move_along_path(self, tank, state, target_x, target_y):
+        """Follow A* waypoints towards a target position
+
+        The path is taken from the shared path cache and only replanned when
+        the goal tile or the wall layout changes, or when another tank has
+        blocked the way for REPLAN_BLOCKED_FRAMES frames.
+        Returns 'moving', 'arrived' or 'no_path'.
+        """
+        tile_map = self.game.tile_map
+        start = tile_map.tile_at(tank.x + tank.size // 2, tank.y + tank.size // 2)
+        goal = tile_map.tile_at(target_x + TANK_SIZE // 2, target_y + TANK_SIZE // 2)
+        
+        # Plan when the goal or walls changed
+        if state.path is None or state.path_goal != goal or state.path_epoch != tile_map.epoch:
+            state.path = self.request_path(tank, start, goal)
+            state.path_index = 0
+            state.path_goal = goal
+            state.path_epoch = tile_map.epoch
+            state.blocked_frames = 0
+        
+        path = state.path
+        if path is PATH_PENDING:
+            return 'moving'  # Wait for the planning pool
+        if path is None:
+            return 'no_path'
+        if state.path_index >= len(path):
+            return 'arrived'
+        
+        # Move towards next waypoint
+        waypoint_x, waypoint_y = path[state.path_index]
+        result = self.step_towards(tank, waypoint_x * tile_map.tile_size, waypoint_y * tile_map.tile_size)
+        
+        if result == 'reached':
+            state.path_index += 1
+            state.blocked_frames = 0
+        elif result == 'blocked':
+            state.blocked_frames += 1
+            if state.blocked_frames > REPLAN_BLOCKED_FRAMES:
+                # Plan around tiles occupied by other tanks (not cached)
+                state.path = self.request_path(tank, start, goal, avoid_tanks=True)
+                state.path_index = 0
+                state.blocked_frames = 0
+                if state.path is None:
+                    return 'no_path'
+        else:
+            state.blocked_frames = 0
+        
+        return 'moving'
+    
+    def request_path(self, tank, start, goal, avoid_tanks=False):
+        """Get a path between two tiles
+
+        Without a planning pool the path is planned right away. With one,
+        cached paths are still returned at once, other requests are queued
+        for the pool and PATH_PENDING is returned; apply_planned_paths
+        delivers the path on a later frame. With avoid_tanks, tiles
+        occupied by other tanks are treated as blocked.
+        """
+        if self.planner:
+            if not avoid_tanks:
+                found, path = self.pathfinder.lookup(start, goal)
+                if found:
+                    return path
+            self.planner.submit(tank, start, goal, avoid_tanks)
+            return PATH_PENDING
+        
+        if avoid_tanks:
+            tile_map = self.game.tile_map
+            occupied = {tile_map.tile_at(other.x + other.size // 2, other.y + other.size // 2)
+                        for other in self.game.tanks if other is not tank and other.is_alive}
+            occupied.discard(start)
+            occupied.discard(goal)
+            return self.pathfinder.find_path(start, goal, occupied)
+        return self.pathfinder.get_path(start, goal)
+    
+    def apply_planned_paths(self):
+        """Hand paths finished by the planning pool to their tanks
+
+        Paths planned for an outdated wall layout are dropped; the tank
+        requests a new one on its next move. If the pool failed, waiting
+        tanks are replanned in-process from now on.
+        """
+        epoch = self.game.tile_map.epoch
+        completed, dropped = self.planner.collect()
+        for tank, start, goal, path_epoch, avoid_tanks, path in completed:
+            if path_epoch != epoch:
+                continue
+            if not avoid_tanks:
+                self.pathfinder.store(start, goal, path)
+            state = tank.ai_state
+            if (state is not None and state.path is PATH_PENDING
+                    and state.path_goal == goal and state.path_epoch == path_epoch):
+                state.path = path
+                state.path_index = 0
+                state.blocked_frames = 0
+        
+        for tank in dropped:
+            if tank.ai_state is not None and tank.ai_state.path is PATH_PENDING:
+                tank.ai_state.path = None
+        
+        if not self.planner.available:
+            self.close()
+    
+    def step_towards(self, tank, target_x, target_y):
+        """Move one step along an axis towards a waypoint
+
+        Snaps onto the waypoint when it is less than one step away, which
+        keeps tanks aligned with the 40px corridors between walls.
+        Returns 'reached', 'moving' or 'blocked'.
+        """
+        dx = target_x - tank.x
+        dy = target_y - tank.y
+        if abs(dx) <= tank.speed and abs(dy) <= tank.speed:
+            tank.set_position(target_x, target_y)
+            return 'reached'
+        
+        step_x = 1 if dx > 0 else -1 if dx < 0 else 0
+        step_y = 1 if dy > 0 else -1 if dy < 0 else 0
+        
+        # Move along the axis with the larger distance first
+        if abs(dx) >= abs(dy):
+            movements = [(step_x, 0), (0, step_y)]
+        else:
+            movements = [(0, step_y), (step_x, 0)]
+        
+        for move_dx, move_dy in movements:
+            if move_dx == 0 and move_dy == 0:
+                continue
+            
+            # Set tank direction
+            if move_dx > 0:
+                tank.direction = Direction.RIGHT
+            elif move_dx < 0:
+                tank.direction = Direction.LEFT
+            elif move_dy > 0:
+                tank.direction = Direction.DOWN
+            else:
+                tank.direction = Direction.UP
+            
+            if self.game.controller and not self.game.controller.check_tank_wall_collision(tank, move_dx, move_dy):
+                tank.move(move_dx, move_dy)
+                return 'moving'
+        
+        return 'blocked'
     
     def move_towards(self, tank, target_x, target_y):
         """Move towards target position with intelligent obstacle avoidance"""
@@ -406,8 +1128,8 @@ class AdvancedAI:
     
     def get_random_position(self):
         """Get random position"""
-        x = random.randint(TANK_SIZE, SCREEN_WIDTH - TANK_SIZE)
-        y = random.randint(TANK_SIZE, SCREEN_HEIGHT - TANK_SIZE)
+        x = self.rng.randint(TANK_SIZE, SCREEN_WIDTH - TANK_SIZE)
+        y = self.rng.randint(TANK_SIZE, SCREEN_HEIGHT - TANK_SIZE)
         return (x, y)
     
     def reached_position(self, tank, position):